@@ -0,0 +1,95 @@
+"""
+Alert dispatcher benchmark.
+Shows that AlertDispatcher.notify() stays in the microsecond range while
+a sink is blocked for seconds, and that bursts are coalesced.
+
+Usage:
+    python benchmarks/bench_alerts.py
+    python benchmarks/bench_alerts.py --alerts 100000 --sink-delay 2.0 --budget-us 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.notifications.voice_alerts import Alert, AlertDispatcher, AlertSink  # noqa: E402
+
+
+class SlowSink(AlertSink):
+    """Simulates a TTS engine: every emit blocks for `delay` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.received: List[Alert] = []
+
+    def emit(self, alert: Alert) -> None:
+        time.sleep(self.delay)
+        self.received.append(alert)
+
+
+def enqueue_latency(n_alerts: int, sink_delay: float, maxsize: int) -> List[int]:
+    """Returns per-call notify() durations in ns while the sink is stalled."""
+    sink = SlowSink(sink_delay)
+    dispatcher = AlertDispatcher([sink], maxsize=maxsize, coalesce_window=0.0).start()
+
+    # Get the worker stuck inside the slow sink before measuring.
+    dispatcher.notify('halt', 'prime', level='critical')
+    time.sleep(0.05)
+
+    durations = []
+    clock = time.perf_counter_ns
+    for i in range(n_alerts):
+        t0 = clock()
+        dispatcher.notify('fill', f'BUY 0.01 BTC/USDT #{i}')
+        durations.append(clock() - t0)
+
+    dropped = dispatcher.dropped + sum(dispatcher.sink_dropped.values())
+    print(f"queue full drops: {dropped} of {n_alerts} (maxsize {maxsize})")
+    # The worker is a daemon thread still blocked in the slow sink; it is
+    # left to die with the process rather than waited on.
+    return durations
+
+
+def burst_coalescing(n_fills: int) -> int:
+    """Sends n_fills within ~1s; returns how many alerts the sink received."""
+    sink = SlowSink(0.0)
+    dispatcher = AlertDispatcher([sink], coalesce_window=1.0).start()
+    for i in range(n_fills):
+        dispatcher.notify('fill', f'SELL 0.01 BTC/USDT #{i}')
+        time.sleep(0.5 / n_fills)
+    dispatcher.stop()
+    return len(sink.received)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark non-blocking alert enqueue.")
+    parser.add_argument('--alerts', type=int, default=100_000)
+    parser.add_argument('--sink-delay', type=float, default=2.0)
+    parser.add_argument('--maxsize', type=int, default=1_000)
+    parser.add_argument('--budget-us', type=float, default=50.0,
+                        help="Maximum allowed p99 notify() latency.")
+    args = parser.parse_args()
+
+    durations = sorted(enqueue_latency(args.alerts, args.sink_delay, args.maxsize))
+    p50 = durations[len(durations) // 2] / 1e3
+    p99 = durations[int(0.99 * (len(durations) - 1))] / 1e3
+    worst = durations[-1] / 1e3
+    print(f"notify() with a {args.sink_delay:.1f}s sink: "
+          f"p50 {p50:.2f} us  p99 {p99:.2f} us  max {worst:.1f} us")
+
+    delivered = burst_coalescing(50)
+    print(f"burst of 50 fills in 0.5s delivered as {delivered} alert(s)")
+
+    ok = p99 <= args.budget_us and delivered == 1
+    print('OK' if ok else 'FAIL')
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Indicator bank benchmark.
+Times ema_bank / sma_bank / rsi_bank / atr_bank against one call of the
+vectorized indicator per parameter, and fails if any bank column
+deviates from its single-parameter counterpart beyond float rounding,
+with windows given both sorted and in shuffled order.
+
+Usage:
+    python benchmarks/bench_indicator_bank.py
+    python benchmarks/bench_indicator_bank.py --bars 1000000 --params 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import generate_ohlcv  # noqa: E402
+from src.features import indicators  # noqa: E402
+
+# Largest deviation from the per-parameter result accepted, relative to the
+# indicator's scale (price for EMA/SMA/ATR, 100 for RSI).
+TOLERANCE = 1e-9
+
+
+def timed(fn: Callable[[], np.ndarray]) -> Tuple[np.ndarray, float]:
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def max_deviation(bank: np.ndarray, ref: np.ndarray, scale: float) -> float:
+    """Largest deviation relative to scale; inf if the NaN layouts differ."""
+    if bank.shape != ref.shape or not np.array_equal(np.isnan(bank), np.isnan(ref)):
+        return float('inf')
+    valid = ~np.isnan(ref)
+    return float(np.abs(bank[valid] - ref[valid]).max() / scale) if valid.any() else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark indicator banks.")
+    parser.add_argument('--bars', type=int, default=300_000)
+    parser.add_argument('--params', type=int, default=100, help="Windows per indicator.")
+    args = parser.parse_args()
+
+    df = generate_ohlcv(args.bars)
+    h, lo, c = df['high'], df['low'], df['close']
+    windows = list(range(2, 2 + args.params))
+    # Same windows out of order: bank columns must follow the request.
+    shuffled = [int(w) for w in np.random.default_rng(0).permutation(windows)]
+    order = [windows.index(w) for w in shuffled]
+    scale = float(c.abs().max())
+
+    cases = {
+        'ema': (lambda ws: indicators.ema_bank(c, ws),
+                lambda w: indicators.calculate_ema(c, w), scale),
+        'sma': (lambda ws: indicators.sma_bank(c, ws),
+                lambda w: c.rolling(w).mean(), scale),
+        'rsi': (lambda ws: indicators.rsi_bank(c, ws),
+                lambda w: indicators.calculate_rsi(c, w), 100.0),
+        'atr': (lambda ws: indicators.atr_bank(h, lo, c, ws),
+                lambda w: indicators.calculate_atr(h, lo, c, w), scale),
+    }
+
+    ok = True
+    print(f"{args.bars:,} bars x {len(windows)} windows")
+    print(f"{'indicator':<10}{'bank s':>9}{'separate s':>12}{'speedup':>9}{'max dev':>11}"
+          f"{'shuffled':>11}")
+    for name, (bank_fn, single_fn, ref_scale) in cases.items():
+        bank, t_bank = timed(lambda: bank_fn(windows))
+        ref, t_sep = timed(lambda: np.column_stack([single_fn(w).to_numpy() for w in windows]))
+        dev = max_deviation(bank, ref, ref_scale)
+        dev_shuffled = max_deviation(bank_fn(shuffled), ref[:, order], ref_scale)
+        good = max(dev, dev_shuffled) <= TOLERANCE
+        ok = ok and good
+        print(f"{name:<10}{t_bank:9.3f}{t_sep:12.3f}{t_sep / t_bank:8.1f}x{dev:11.1e}"
+              f"{dev_shuffled:11.1e}{'' if good else '  MISMATCH'}")
+    print('OK' if ok else 'FAIL')
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
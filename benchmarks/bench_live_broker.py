@@ -0,0 +1,111 @@
+"""
+Live broker benchmark.
+Drives LiveBroker against the local MockExchange to measure order
+throughput and tail latency under exchange latency and rate limits,
+connection reuse, and how many account requests get_balance() issues.
+
+Usage:
+    python benchmarks/bench_live_broker.py
+    python benchmarks/bench_live_broker.py --orders 2000 --latency 0.02 --jitter 0.01 \
+        --weight-limit 300 --weight-window 1.0 --pool-size 8
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.execution.live_broker import LiveBroker  # noqa: E402
+from benchmarks.mock_exchange import MockExchange  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * (len(sorted_values) - 1)))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LiveBroker against a mock exchange.")
+    parser.add_argument('--orders', type=int, default=1000)
+    parser.add_argument('--latency-orders', type=int, default=200,
+                        help="Orders sent one at a time for the latency figures.")
+    parser.add_argument('--latency', type=float, default=0.01, help="Mean exchange latency (s).")
+    parser.add_argument('--jitter', type=float, default=0.005)
+    parser.add_argument('--weight-limit', type=int, default=600)
+    parser.add_argument('--weight-window', type=float, default=1.0)
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--balance-calls', type=int, default=10_000)
+    parser.add_argument('--refresh-interval', type=float, default=0.25)
+    args = parser.parse_args()
+    logger.setLevel(logging.ERROR)
+
+    exchange = MockExchange(
+        balances={'USDT': 1e12, 'BTC': 1e6},
+        latency=args.latency,
+        jitter=args.jitter,
+        weight_limit=args.weight_limit,
+        weight_window=args.weight_window,
+    ).start()
+    broker = LiveBroker(
+        exchange.base_url, exchange.api_key, 'mock-secret', ['BTC/USDT'],
+        pool_size=args.pool_size,
+        weight_limit=args.weight_limit,
+        weight_window=args.weight_window,
+        refresh_interval=args.refresh_interval,
+    )
+
+    sides = ['buy' if i % 2 == 0 else 'sell' for i in range(args.orders)]
+
+    # Throughput: everything in flight at once through submit_order_async.
+    t0 = time.perf_counter()
+    futures = [broker.submit_order_async('BTC/USDT', 0.001, side) for side in sides]
+    failed = [f.result() for f in futures if f.result()['status'] != 'filled']
+    wall = time.perf_counter() - t0
+    if failed:
+        raise RuntimeError(f"{len(failed)} orders failed, first: {failed[0]}")
+
+    # Latency: one order at a time, so queueing does not dominate.
+    latencies: List[float] = []
+    for side in sides[:args.latency_orders]:
+        t1 = time.perf_counter()
+        broker.submit_order('BTC/USDT', 0.001, side)
+        latencies.append(time.perf_counter() - t1)
+    latencies.sort()
+
+    print(f"orders: {args.orders} async in {wall:.2f}s -> {args.orders / wall:,.1f} orders/s "
+          f"(weight limit {args.weight_limit}/{args.weight_window:g}s, "
+          f"latency {args.latency * 1e3:.0f}+/-{args.jitter * 1e3:.0f} ms)")
+    print(f"sequential order latency: p50 {percentile(latencies, 50) * 1e3:.1f} ms  "
+          f"p99 {percentile(latencies, 99) * 1e3:.1f} ms  max {latencies[-1] * 1e3:.1f} ms")
+    print(f"connections opened: client {broker._pool.opened}, server saw {exchange.stats['connections']}")
+    print(f"HTTP 429 responses: {exchange.stats['rejected_429']} "
+          f"(client retries {broker.stats['rate_limited']})")
+
+    refreshes_before = broker.stats['refreshes']
+    t0 = time.perf_counter()
+    for _ in range(args.balance_calls):
+        broker.get_balance()
+    elapsed = time.perf_counter() - t0
+    print(f"get_balance(): {args.balance_calls} calls in {elapsed * 1e3:.1f} ms issued "
+          f"{broker.stats['refreshes'] - refreshes_before} account request(s)")
+
+    cached = broker.get_positions()['BTC/USDT']
+    broker.refresh(force=True)
+    exact = abs(broker.get_positions()['BTC/USDT'] - cached) < 1e-9
+    print(f"cached position matches exchange after refresh: {exact}")
+
+    broker.close()
+    exchange.stop()
+    return 0 if exact else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
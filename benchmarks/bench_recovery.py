@@ -0,0 +1,150 @@
+"""
+Warm-restart benchmark.
+Kills a replay-driven live session mid-run, restarts it, and checks that
+the journal ends up identical to an uninterrupted session. Also times
+LiveLoop.restore() across session lengths to show recovery cost is
+bounded by the snapshot interval, not by how long the session has run.
+
+Usage:
+    python benchmarks/bench_recovery.py
+    python benchmarks/bench_recovery.py --lengths 1000 10000 50000 --snapshot-every 100
+"""
+
+import argparse
+import logging
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import generate_ohlcv  # noqa: E402
+from src.core.live_loop import LiveLoop  # noqa: E402
+from src.data.feed import ReplayFeed  # noqa: E402
+from src.execution.paper_broker import PaperBroker  # noqa: E402
+from src.risk.risk_manager import RiskManager  # noqa: E402
+from src.signals.rule_based import RuleBasedSignal  # noqa: E402
+from src.state.journal import TradeJournal  # noqa: E402
+from src.utils.config_loader import load_config  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+CONFIG_PATH = str(ROOT / 'config' / 'settings.yaml')
+
+
+def make_loop(config: Dict[str, Any], journal: TradeJournal, snapshot_every: int) -> LiveLoop:
+    return LiveLoop(
+        broker=PaperBroker(config['initial_capital'], config['trading_fee']),
+        risk_manager=RiskManager(config),
+        signal_generator=RuleBasedSignal(config),
+        symbol=f"{config['base_asset']}/{config['quote_asset']}",
+        trading_fee=config['trading_fee'],
+        journal=journal,
+        snapshot_every=snapshot_every,
+    )
+
+
+def journal_contents(db_path: str) -> Dict[str, List[tuple]]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            'equity': conn.execute(
+                "SELECT seq, timestamp, equity FROM equity_history ORDER BY seq").fetchall(),
+            'trades': conn.execute(
+                "SELECT seq, side, qty, price, fee, pnl, state FROM trades ORDER BY id").fetchall(),
+        }
+    finally:
+        conn.close()
+
+
+def max_seq(db_path: str) -> int:
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute("SELECT MAX(seq) FROM price_history").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+    return int(row[0] or 0)
+
+
+def kill_restart_check(n_bars: int, kill_at: int, snapshot_every: int, workdir: Path) -> bool:
+    """Runs uninterrupted vs kill -9 + restart sessions and compares journals."""
+    config = load_config(CONFIG_PATH)
+    data = generate_ohlcv(n_bars, freq='1h', seed=7)
+    csv_path = workdir / 'replay.csv'
+    data.to_csv(csv_path)
+
+    ref_db = str(workdir / 'reference.db')
+    journal = TradeJournal(ref_db)
+    make_loop(config, journal, snapshot_every).run(ReplayFeed(data))
+    journal.close()
+
+    db = str(workdir / 'killed.db')
+    cmd = [
+        sys.executable, str(ROOT / 'scripts' / 'run_live.py'),
+        '--config', CONFIG_PATH, '--replay', str(csv_path), '--journal', db,
+        '--snapshot-every', str(snapshot_every),
+    ]
+    proc = subprocess.Popen(
+        cmd + ['--replay-interval', '0.002'],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    while max_seq(db) < kill_at and proc.poll() is None:
+        time.sleep(0.01)
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    killed_at = max_seq(db)
+
+    subprocess.run(cmd, cwd=workdir, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    identical = journal_contents(db) == journal_contents(ref_db)
+    print(f"kill/restart: killed at bar {killed_at}/{n_bars}, "
+          f"journal {'identical to' if identical else 'DIFFERS from'} uninterrupted run")
+    return identical
+
+
+def restore_timing(lengths: List[int], snapshot_every: int, workdir: Path) -> None:
+    """Times restore() on journals of increasing session length."""
+    config = load_config(CONFIG_PATH)
+    print(f"{'session bars':>14}{'replayed':>10}{'restore ms':>12}")
+    for n in lengths:
+        # Stop a few bars past a snapshot so there is a tail to replay.
+        n_bars = n + snapshot_every // 2
+        db = str(workdir / f'session_{n}.db')
+        journal = TradeJournal(db)
+        make_loop(config, journal, snapshot_every).run(ReplayFeed(generate_ohlcv(n_bars, freq='1h')))
+        journal.close()
+
+        journal = TradeJournal(db)
+        info = make_loop(config, journal, snapshot_every).restore()
+        journal.close()
+        print(f"{n_bars:>14}{info['replayed_bars']:>10}{info['seconds'] * 1e3:>12.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark live-state warm restart.")
+    parser.add_argument('--bars', type=int, default=1500, help="Bars in the kill/restart session.")
+    parser.add_argument('--kill-at', type=int, default=730)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--snapshot-every', type=int, default=100)
+    args = parser.parse_args()
+    logger.setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        ok = kill_restart_check(args.bars, args.kill_at, args.snapshot_every, workdir)
+        restore_timing(args.lengths, args.snapshot_every, workdir)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
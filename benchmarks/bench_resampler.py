@@ -0,0 +1,121 @@
+"""
+Resampler benchmark.
+Compares per-bar cost of one shared BarResampler against signals that
+each re-resample their history on every bar, and checks that the
+streaming, vectorized and pandas paths agree without lookahead.
+
+Usage:
+    python benchmarks/bench_resampler.py
+    python benchmarks/bench_resampler.py --bars 200000 --signals 4 --naive-bars 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import generate_ohlcv  # noqa: E402
+from src.data.feed import OHLCV_COLUMNS  # noqa: E402
+from src.data.resampler import BarResampler, align_to_base, resample_ohlcv  # noqa: E402
+
+TIMEFRAMES = ['15m', '1h', '4h', '1d']
+PANDAS_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def naive_per_bar(df: pd.DataFrame, n_signals: int, lookback: int, n_bars: int) -> float:
+    """Seconds per bar when every signal resamples its trailing window itself."""
+    start = len(df) - n_bars
+    t0 = time.perf_counter()
+    for i in range(start, len(df)):
+        window = df.iloc[max(0, i + 1 - lookback):i + 1]
+        for _ in range(n_signals):
+            for tf in TIMEFRAMES:
+                window.resample(tf.replace('m', 'min')).agg(PANDAS_AGG)
+    return (time.perf_counter() - t0) / n_bars
+
+
+def shared_per_bar(df: pd.DataFrame, n_signals: int) -> float:
+    """Seconds per bar for one shared resampler read by every signal."""
+    resampler = BarResampler('1m', TIMEFRAMES)
+    bars = [dict(zip(OHLCV_COLUMNS, row)) for row in df[OHLCV_COLUMNS].to_numpy()]
+    seen = [[0] * len(TIMEFRAMES) for _ in range(n_signals)]
+    t0 = time.perf_counter()
+    for ts, bar in zip(df.index, bars):
+        resampler.update(ts, bar)
+        for counts in seen:
+            for k, tf in enumerate(TIMEFRAMES):
+                resampler.bars_since(tf, counts[k])
+                counts[k] = resampler.closed_count(tf)
+    return (time.perf_counter() - t0) / len(df)
+
+
+def check_equivalence(df: pd.DataFrame) -> List[str]:
+    """Returns a list of mismatches between the three paths (empty if none)."""
+    problems = []
+    cut = int(len(df) * 0.6)
+    resampler = BarResampler('1m', TIMEFRAMES, maxlen=len(df))
+    for ts, row in zip(df.index[:cut], df[OHLCV_COLUMNS].to_numpy()[:cut]):
+        resampler.update(ts, dict(zip(OHLCV_COLUMNS, row)))
+
+    for tf in TIMEFRAMES:
+        streamed = resampler.frame(tf)
+        if not streamed.equals(resample_ohlcv(df.iloc[:cut], tf).iloc[:len(streamed)]):
+            problems.append(f"{tf}: streaming != resample_ohlcv")
+        ref = df.resample(tf.replace('m', 'min')).agg(PANDAS_AGG).dropna()
+        if not np.allclose(resample_ohlcv(df, tf).to_numpy(), ref.to_numpy()):
+            problems.append(f"{tf}: resample_ohlcv != pandas resample")
+
+        # Lookahead: the aligned view up to `cut` must not change when
+        # more future bars are added, and must match the streaming view.
+        full = align_to_base(df, tf).iloc[:cut]
+        if not full.equals(align_to_base(df.iloc[:cut], tf)):
+            problems.append(f"{tf}: aligned view depends on future bars")
+        last = resampler.last(tf)
+        if last is not None and list(full.iloc[-1]) != list(last[1].values()):
+            problems.append(f"{tf}: aligned view != streaming last()")
+
+    rebuilt = BarResampler.from_frame(df.iloc[:cut], TIMEFRAMES, maxlen=len(df))
+    if rebuilt.get_state() != resampler.get_state():
+        problems.append("from_frame state != streaming state")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the shared multi-timeframe resampler.")
+    parser.add_argument('--bars', type=int, default=100_000)
+    parser.add_argument('--signals', type=int, default=3)
+    parser.add_argument('--lookback', type=int, default=5_000,
+                        help="Base bars each naive signal resamples per bar.")
+    parser.add_argument('--naive-bars', type=int, default=300,
+                        help="Bars timed for the naive approach (it is slow).")
+    args = parser.parse_args()
+
+    df = generate_ohlcv(args.bars)
+    # Drop a few bars so gap handling is exercised too.
+    rng = np.random.default_rng(0)
+    gappy = df.drop(df.index[rng.choice(len(df), len(df) // 100, replace=False)])
+
+    problems = check_equivalence(gappy)
+    for p in problems:
+        print(f"MISMATCH {p}")
+
+    shared = shared_per_bar(df, args.signals)
+    naive = naive_per_bar(df, args.signals, args.lookback, min(args.naive_bars, len(df)))
+    print(f"{args.signals} signals x {len(TIMEFRAMES)} timeframes ({', '.join(TIMEFRAMES)})")
+    print(f"  shared resampler : {shared * 1e6:10.1f} us/bar ({1 / shared:,.0f} bars/s)")
+    print(f"  per-signal pandas: {naive * 1e6:10.1f} us/bar "
+          f"({args.lookback}-bar window) -> {naive / shared:,.0f}x slower")
+    print('OK' if not problems else 'FAIL')
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Results store benchmark.
+Fills a ResultsStore with synthetic sweep runs and times metric/parameter
+queries and lazy curve loads.
+
+Usage:
+    python benchmarks/bench_results_store.py
+    python benchmarks/bench_results_store.py --runs 100000 --curves 200 --budget-ms 50
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.state.results_store import ResultsStore  # noqa: E402
+
+
+def fill(store: ResultsStore, n_runs: int, n_curves: int, curve_bars: int) -> float:
+    """Saves n_runs synthetic runs (the first n_curves with curves); returns seconds."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2020-01-01', periods=curve_bars, freq='1h', name='timestamp')
+    t0 = time.perf_counter()
+    for i in range(n_runs):
+        params = {
+            'signals': {
+                'ema_fast': int(rng.integers(5, 30)),
+                'ema_slow': int(rng.integers(30, 120)),
+                'rsi_window': int(rng.integers(7, 28)),
+            },
+            'atr_multiplier': float(rng.uniform(1.0, 4.0)),
+            'risk_per_trade_pct': float(rng.uniform(0.005, 0.03)),
+            'timeframe': '1h',
+        }
+        metrics = {
+            'total_return': float(rng.normal(0.05, 0.3)),
+            'sharpe_ratio': float(rng.normal(0.3, 1.0)),
+            'max_drawdown': float(rng.uniform(0.02, 0.6)),
+            'total_trades': int(rng.integers(0, 500)),
+            'win_rate': float(rng.uniform(0.2, 0.7)),
+        }
+        equity = trades = None
+        if i < n_curves:
+            equity = pd.Series(10_000 * np.exp(np.cumsum(rng.normal(0, 0.01, curve_bars))), index=index)
+            trades = [{'timestamp': index[j], 'side': 'buy' if j % 2 == 0 else 'sell',
+                       'price': 100.0, 'qty': 1.0, 'fee': 0.1, **({'pnl': 1.0} if j % 2 else {})}
+                      for j in range(0, curve_bars, 50)]
+        store.save_run(params, metrics, equity, trades, label='sweep', commit=False)
+    store.commit()
+    return time.perf_counter() - t0
+
+
+def time_ms(fn, repeats: int = 20) -> float:
+    fn()
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the backtest results store.")
+    parser.add_argument('--runs', type=int, default=100_000)
+    parser.add_argument('--curves', type=int, default=200,
+                        help="Runs saved with an equity curve and trade log.")
+    parser.add_argument('--curve-bars', type=int, default=20_000)
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help="Maximum allowed time for the top-N query.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = ResultsStore(root)
+        seconds = fill(store, args.runs, args.curves, args.curve_bars)
+        print(f"saved {args.runs:,} runs ({args.curves} with curves) in {seconds:.1f}s")
+
+        top = lambda: store.query(where=[('max_drawdown', '<', 0.15)], limit=10)  # noqa: E731
+        ranged = lambda: store.query(  # noqa: E731
+            where=[('max_drawdown', '<', 0.15)],
+            params=[('signals.ema_fast', '>=', 8), ('signals.ema_fast', '<=', 12),
+                    ('signals.rsi_window', '<', 14)],
+            limit=10,
+        )
+        t_top = time_ms(top)
+        t_ranged = time_ms(ranged)
+        print(f"top-10 Sharpe, max_drawdown < 0.15:              {t_top:7.2f} ms")
+        print(f"  + ema_fast in [8, 12], rsi_window < 14:         {t_ranged:7.2f} ms "
+              f"({len(ranged())} rows)")
+
+        t_curve = time_ms(lambda: store.load_equity(1), repeats=5)
+        t_trades = time_ms(lambda: store.load_trades(1), repeats=5)
+        print(f"lazy load of one {args.curve_bars:,}-bar curve: {t_curve:.2f} ms, trades: {t_trades:.2f} ms")
+        store.close()
+
+    ok = max(t_top, t_ranged) <= args.budget_ms
+    print('OK' if ok else 'FAIL')
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Checkpoint/resume benchmark.
+Runs a streaming backtest over a synthetic 1m history, checkpoints it,
+appends a day of bars and compares resuming from the checkpoint against
+a full rerun. Fails unless the resumed equity curve and trades are
+identical to the full rerun, and unless streaming matches the sliced
+engine on a short history.
+
+Usage:
+    python benchmarks/bench_resume.py
+    python benchmarks/bench_resume.py --bars 2000000 --append 1440
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.run_benchmarks import BENCH_CONFIG  # noqa: E402
+from benchmarks.synthetic import generate_ohlcv  # noqa: E402
+from src.backtest.engine import BacktestEngine  # noqa: E402
+from src.execution.paper_broker import PaperBroker  # noqa: E402
+from src.risk.risk_manager import RiskManager  # noqa: E402
+from src.signals.rule_based import RuleBasedSignal  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+
+def make_engine(data: pd.DataFrame, streaming: bool = True) -> BacktestEngine:
+    return BacktestEngine(
+        data=data,
+        broker=PaperBroker(10_000.0, 0.001),
+        risk_manager=RiskManager(BENCH_CONFIG),
+        signal_generator=RuleBasedSignal(BENCH_CONFIG),
+        streaming=streaming,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint/resume of BacktestEngine.")
+    parser.add_argument('--bars', type=int, default=500_000, help="Bars already checkpointed.")
+    parser.add_argument('--append', type=int, default=1_440, help="Bars appended (1440 = one day).")
+    parser.add_argument('--sliced-bars', type=int, default=3_000,
+                        help="History for the streaming vs sliced check (sliced is O(n^2)).")
+    args = parser.parse_args()
+    logger.setLevel(logging.ERROR)
+
+    problems = []
+    short = generate_ohlcv(args.sliced_bars)
+    sliced, streamed = make_engine(short, streaming=False), make_engine(short)
+    if not sliced.run().equals(streamed.run()) or sliced.trades != streamed.trades:
+        problems.append("streaming engine != sliced engine")
+
+    data = generate_ohlcv(args.bars + args.append)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / 'engine.npz')
+        base = make_engine(data.iloc[:args.bars])
+        base.run()
+        base.save_checkpoint(path)
+
+        t0 = time.perf_counter()
+        full = make_engine(data)
+        full_equity = full.run()
+        t_full = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        resumed = make_engine(data)
+        resumed.load_checkpoint(path)
+        resumed_equity = resumed.run()
+        t_resume = time.perf_counter() - t0
+
+        validated = make_engine(data)
+        validated.load_checkpoint(path)
+        try:
+            validated.run(validate=True)
+        except RuntimeError as e:
+            problems.append(str(e))
+
+    if not resumed_equity.equals(full_equity) or resumed.trades != full.trades:
+        problems.append("resumed run != full rerun")
+
+    print(f"{args.bars:,} checkpointed bars + {args.append:,} appended, {len(full.trades)} trades")
+    print(f"  full rerun : {t_full:8.3f} s")
+    print(f"  resume     : {t_resume:8.3f} s (incl. checkpoint load) -> {t_full / t_resume:,.0f}x faster")
+    for p in problems:
+        print(f"MISMATCH {p}")
+    print('OK' if not problems else 'FAIL')
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Startup-time benchmark.
+Measures cold import time of the run scripts in fresh interpreters and
+checks that heavy optional subsystems are not loaded at startup.
+
+Usage:
+    python benchmarks/bench_startup.py                 # default 1.0s budget
+    python benchmarks/bench_startup.py --budget 0.8 --runs 7 --top 15
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = ['scripts/run_backtest.py', 'scripts/run_live.py']
+
+# Modules that must only be imported when configured.
+HEAVY_MODULES = [
+    'lightgbm', 'optuna', 'sklearn', 'ccxt', 'PyQt5', 'pyqtgraph', 'matplotlib',
+]
+
+# Runs the script body without calling main(), then reports wall time
+# and which heavy modules ended up in sys.modules.
+PROBE = """
+import json, runpy, sys, time
+t0 = time.perf_counter()
+runpy.run_path({path!r}, run_name='startup_probe')
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+
+def probe(script: str) -> Dict[str, object]:
+    """Imports script in a fresh interpreter; returns total and import time."""
+    code = PROBE.format(path=str(ROOT / script), heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def top_imports(script: str, n: int) -> List[str]:
+    """Returns the n slowest cumulative imports reported by -X importtime."""
+    code = f"import runpy; runpy.run_path({str(ROOT / script)!r}, run_name='startup_probe')"
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cum_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cum_us), name.strip()))
+    rows.sort(reverse=True)
+    return [f"{cum / 1e3:8.1f} ms  {name}" for cum, name in rows[:n]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark run-script startup time.")
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help="Maximum median import time in seconds.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=0,
+                        help="Also list the N slowest imports per script.")
+    args = parser.parse_args()
+
+    failed = False
+    for script in ENTRY_POINTS:
+        samples = [probe(script) for _ in range(args.runs)]
+        median = statistics.median(s['seconds'] for s in samples)
+        heavy = sorted({m for s in samples for m in s['heavy']})
+        status = 'OK' if median <= args.budget and not heavy else 'FAIL'
+        failed |= status == 'FAIL'
+        print(f"{script:<28} median {median * 1e3:7.1f} ms  (budget {args.budget * 1e3:.0f} ms)  {status}")
+        if heavy:
+            print(f"  heavy modules imported at startup: {heavy}")
+        if args.top:
+            for line in top_imports(script, args.top):
+                print(f"  {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
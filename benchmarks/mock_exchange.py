@@ -0,0 +1,258 @@
+"""
+Mock exchange module.
+Local Binance-style REST server for offline LiveBroker testing.
+
+Implements the subset of the spot API that LiveBroker uses (ping,
+account, market/limit order) with HMAC signature checks, a fixed-window
+request-weight limit that answers 429 + Retry-After when exceeded,
+configurable per-request latency, and instant fills at a settable price.
+Commission can be charged in the quote asset, the base asset or a third
+asset (e.g. BNB), as on the real exchange.
+"""
+
+import hashlib
+import hmac
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from src.execution.live_broker import ENDPOINT_WEIGHTS
+
+
+class MockExchange:
+    """
+    In-process mock exchange running on a background thread.
+
+    Args:
+        api_key: Expected X-MBX-APIKEY.
+        api_secret: Secret used to verify request signatures.
+        balances: Initial free balances per asset.
+        price: Fill price for market orders (see set_price).
+        fee_rate: Commission rate.
+        commission_asset: Asset commission is charged in; None for the
+            quote asset. The base asset is charged qty * fee_rate, any
+            other asset notional * fee_rate / commission_price.
+        commission_price: Quote price of a third commission asset.
+        latency: Mean added latency per request, in seconds.
+        jitter: Uniform +/- jitter added to latency, in seconds.
+        weight_limit: Request weight allowed per window.
+        weight_window: Window length in seconds.
+        host: Bind address; port 0 picks a free port.
+    """
+    def __init__(
+        self,
+        api_key: str = 'mock-key',
+        api_secret: str = 'mock-secret',
+        balances: Optional[Dict[str, float]] = None,
+        price: float = 30_000.0,
+        fee_rate: float = 0.001,
+        commission_asset: Optional[str] = None,
+        commission_price: float = 1.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        weight_limit: int = 1200,
+        weight_window: float = 60.0,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ) -> None:
+        self.api_key = api_key
+        self._secret = api_secret.encode('utf-8')
+        self.balances: Dict[str, float] = dict(balances or {'USDT': 10_000.0, 'BTC': 0.0})
+        self.price = price
+        self.fee_rate = fee_rate
+        self.commission_asset = commission_asset
+        self.commission_price = commission_price
+        self.latency = latency
+        self.jitter = jitter
+        self.weight_limit = weight_limit
+        self.weight_window = weight_window
+
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._used_weight = 0
+        self._order_id = 0
+        self.stats: Dict[str, int] = {'connections': 0, 'requests': 0, 'orders': 0, 'rejected_429': 0}
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockExchange':
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='mock-exchange', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def set_price(self, price: float) -> None:
+        with self._lock:
+            self.price = price
+
+    # ------------------------------------------------------------------
+    # Exchange logic
+    # ------------------------------------------------------------------
+
+    def _charge_weight(self, weight: int) -> Tuple[bool, int, float]:
+        """Returns (allowed, used_weight, seconds_until_window_reset)."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.weight_window:
+                self._window_start = now
+                self._used_weight = 0
+            reset_in = self.weight_window - (now - self._window_start)
+            if self._used_weight + weight > self.weight_limit:
+                self.stats['rejected_429'] += 1
+                return False, self._used_weight, reset_in
+            self._used_weight += weight
+            return True, self._used_weight, reset_in
+
+    def _verify(self, params: Dict[str, str], raw: str, api_key: Optional[str]) -> Optional[str]:
+        if api_key != self.api_key:
+            return "Invalid API-key"
+        payload, _, signature = raw.rpartition('&signature=')
+        expected = hmac.new(self._secret, payload.encode('utf-8'), hashlib.sha256).hexdigest()
+        if not signature or not hmac.compare_digest(signature, expected):
+            return "Signature for this request is not valid."
+        if 'timestamp' not in params:
+            return "Mandatory parameter 'timestamp' was not sent."
+        return None
+
+    def _account(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'balances': [
+                    {'asset': a, 'free': f"{v:.8f}", 'locked': '0.00000000'}
+                    for a, v in self.balances.items()
+                ]
+            }
+
+    def _order(self, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        symbol = params.get('symbol', '')
+        base = next((a for a in self.balances if symbol.startswith(a)), None)
+        quote = symbol[len(base):] if base else None
+        if base is None or quote not in self.balances:
+            return 400, {'code': -1121, 'msg': 'Invalid symbol.'}
+
+        side = params.get('side')
+        qty = float(params.get('quantity', 0))
+        with self._lock:
+            price = float(params['price']) if params.get('type') == 'LIMIT' else self.price
+            notional = price * qty
+            fee_asset = self.commission_asset or quote
+            if fee_asset == quote:
+                fee = notional * self.fee_rate
+            elif fee_asset == base:
+                fee = qty * self.fee_rate
+            else:
+                fee = notional * self.fee_rate / self.commission_price
+            if side == 'BUY':
+                deltas = {quote: -notional, base: qty}
+            elif side == 'SELL':
+                deltas = {quote: notional, base: -qty}
+            else:
+                return 400, {'code': -1100, 'msg': f"Illegal side '{side}'."}
+            deltas[fee_asset] = deltas.get(fee_asset, 0.0) - fee
+            after = {a: self.balances.get(a, 0.0) + d for a, d in deltas.items()}
+            if any(v < 0 for v in after.values()):
+                return 400, {'code': -2010, 'msg': 'Account has insufficient balance for requested action.'}
+            self.balances.update(after)
+            self._order_id += 1
+            self.stats['orders'] += 1
+            order_id = self._order_id
+
+        return 200, {
+            'symbol': symbol,
+            'orderId': order_id,
+            'status': 'FILLED',
+            'side': side,
+            'type': params.get('type'),
+            'executedQty': f"{qty:.8f}",
+            'cummulativeQuoteQty': f"{notional:.8f}",
+            'fills': [{
+                'price': f"{price:.8f}", 'qty': f"{qty:.8f}",
+                'commission': f"{fee:.8f}", 'commissionAsset': fee_asset,
+            }],
+        }
+
+    def _handle(self, method: str, path: str, raw: str, api_key: Optional[str]) -> Tuple[int, Dict[str, str], Any]:
+        with self._lock:
+            self.stats['requests'] += 1
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        allowed, used, reset_in = self._charge_weight(ENDPOINT_WEIGHTS.get(path, 1))
+        headers = {'X-MBX-USED-WEIGHT-1M': str(used)}
+        if not allowed:
+            headers['Retry-After'] = f"{max(reset_in, 0.0):.3f}"
+            return 429, headers, {'code': -1003, 'msg': 'Too many requests.'}
+
+        params = dict(parse_qsl(raw))
+        if path == '/api/v3/ping' and method == 'GET':
+            return 200, headers, {}
+        if path == '/api/v3/account' and method == 'GET':
+            err = self._verify(params, raw, api_key)
+            return (401, headers, {'code': -1022, 'msg': err}) if err else (200, headers, self._account())
+        if path == '/api/v3/order' and method == 'POST':
+            err = self._verify(params, raw, api_key)
+            if err:
+                return 401, headers, {'code': -1022, 'msg': err}
+            status, body = self._order(params)
+            return status, headers, body
+        return 404, headers, {'code': -1000, 'msg': 'Unknown endpoint.'}
+
+    def _handler_class(self) -> type:
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, so client pooling is observable
+
+            def setup(self) -> None:
+                super().setup()
+                # Headers and body are written separately; avoid Nagle delays.
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with exchange._lock:
+                    exchange.stats['connections'] += 1
+
+            def _respond(self, method: str) -> None:
+                parts = urlsplit(self.path)
+                if method == 'POST':
+                    length = int(self.headers.get('Content-Length', 0))
+                    raw = self.rfile.read(length).decode('utf-8')
+                else:
+                    raw = parts.query
+                status, headers, body = exchange._handle(
+                    method, parts.path, raw, self.headers.get('X-MBX-APIKEY')
+                )
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                self._respond('GET')
+
+            def do_POST(self) -> None:
+                self._respond('POST')
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,363 @@
+"""
+Benchmark runner.
+Measures throughput, peak memory and latency of the hot paths on
+synthetic OHLCV data, writes a JSON baseline and flags regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --tolerance 0.25
+    python benchmarks/run_benchmarks.py --full            # includes 10M-bar cases
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import generate_ohlcv  # noqa: E402
+from src.backtest.engine import BacktestEngine  # noqa: E402
+from src.data.feed import OHLCV_COLUMNS  # noqa: E402
+from src.data.resampler import BarResampler, align_to_base  # noqa: E402
+from src.execution.paper_broker import PaperBroker  # noqa: E402
+from src.features import indicators  # noqa: E402
+from src.risk.risk_manager import RiskManager  # noqa: E402
+from src.signals.rule_based import RuleBasedSignal  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+from src.utils.metrics import calculate_metrics  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+FULL_SIZES = DEFAULT_SIZES + [10_000_000]
+# BacktestEngine re-slices and re-evaluates the signal on the full prefix
+# every bar, so it is benchmarked on much smaller histories.
+DEFAULT_ENGINE_SIZES = [1_000, 3_000]
+# Per-call latency cases run on the window the live loop keeps
+# (LiveLoop history_bars) and collect at least this many samples, so p99
+# is a real percentile rather than the slowest of a handful of calls.
+LATENCY_BARS = 500
+LATENCY_SAMPLES = 1_000
+INDICATORS = ('ema', 'rsi', 'macd', 'atr', 'adx', 'bollinger_pb')
+
+BENCH_CONFIG: Dict[str, Any] = {
+    'risk_per_trade_pct': 0.01,
+    'atr_multiplier': 2.0,
+    'max_drawdown': 0.15,
+    'max_daily_loss': 0.05,
+    'reward_risk_ratio': 1.5,
+    'signals': {
+        'ema_fast': 12,
+        'ema_slow': 26,
+        'rsi_window': 14,
+        'rsi_overbought': 70,
+        'rsi_oversold': 30,
+    },
+}
+
+# A case factory takes a bar count and returns (fn, units_per_call,
+# per_call_latency). fn() executes one measured call.
+CaseFactory = Callable[[int], Tuple[Callable[[], Any], int, bool]]
+
+
+def _indicator_case(name: str, per_call: bool = False) -> CaseFactory:
+    def factory(n: int) -> Tuple[Callable[[], Any], int, bool]:
+        df = generate_ohlcv(n)
+        h, lo, c = df['high'], df['low'], df['close']
+        calls = {
+            'ema': lambda: indicators.calculate_ema(c, 26),
+            'rsi': lambda: indicators.calculate_rsi(c, 14),
+            'macd': lambda: indicators.calculate_macd(c),
+            'atr': lambda: indicators.calculate_atr(h, lo, c, 14),
+            'adx': lambda: indicators.calculate_adx(h, lo, c, 14),
+            'bollinger_pb': lambda: indicators.calculate_bollinger_pb(c, 20),
+        }
+        return calls[name], n, per_call
+    return factory
+
+
+# Deliberately unsorted: bank columns must follow the requested order.
+BANK_WINDOWS = [int(w) for w in np.random.default_rng(0).permutation(np.arange(5, 25))]
+# Bars checked against the single-window indicators before timing a bank.
+BANK_CHECK_BARS = 5_000
+
+
+def _check_bank(name: str, bank: np.ndarray, single: Callable[[int], pd.Series]) -> None:
+    """Raises if any bank column differs from its single-window indicator."""
+    ref = np.column_stack([single(w).to_numpy() for w in BANK_WINDOWS])
+    if not np.allclose(bank, ref, rtol=1e-9, atol=1e-9, equal_nan=True):
+        raise RuntimeError(f"indicator_bank.{name} columns do not match windows {BANK_WINDOWS}")
+
+
+def _bank_case(name: str) -> CaseFactory:
+    def factory(n: int) -> Tuple[Callable[[], Any], int, bool]:
+        df = generate_ohlcv(n)
+        calls = {
+            'ema': (lambda d: indicators.ema_bank(d['close'], BANK_WINDOWS),
+                    lambda d, w: indicators.calculate_ema(d['close'], w)),
+            'rsi': (lambda d: indicators.rsi_bank(d['close'], BANK_WINDOWS),
+                    lambda d, w: indicators.calculate_rsi(d['close'], w)),
+            'atr': (lambda d: indicators.atr_bank(d['high'], d['low'], d['close'], BANK_WINDOWS),
+                    lambda d, w: indicators.calculate_atr(d['high'], d['low'], d['close'], w)),
+        }
+        bank, single = calls[name]
+        head = df.iloc[:BANK_CHECK_BARS]
+        _check_bank(name, bank(head), lambda w: single(head, w))
+        return (lambda: bank(df)), n, False
+    return factory
+
+
+def _signal_case(per_call: bool = False) -> CaseFactory:
+    def factory(n: int) -> Tuple[Callable[[], Any], int, bool]:
+        df = generate_ohlcv(n)
+        signal = RuleBasedSignal(BENCH_CONFIG)
+        return lambda: signal.generate_signal(df), n, per_call
+    return factory
+
+
+def _engine_case(n: int) -> Tuple[Callable[[], Any], int, bool]:
+    df = generate_ohlcv(n, freq='1h')
+
+    def run() -> pd.DataFrame:
+        engine = BacktestEngine(
+            data=df,
+            broker=PaperBroker(10_000.0, 0.001),
+            risk_manager=RiskManager(BENCH_CONFIG),
+            signal_generator=RuleBasedSignal(BENCH_CONFIG),
+        )
+        return engine.run()
+    return run, n, False
+
+
+RESAMPLE_TIMEFRAMES = ['5m', '1h', '4h', '1d']
+
+
+def _resampler_stream_case(n: int) -> Tuple[Callable[[], Any], int, bool]:
+    df = generate_ohlcv(n)
+    index = df.index
+    bars = [dict(zip(OHLCV_COLUMNS, row)) for row in df[OHLCV_COLUMNS].to_numpy()]
+
+    def run() -> None:
+        update = BarResampler('1m', RESAMPLE_TIMEFRAMES).update
+        for ts, bar in zip(index, bars):
+            update(ts, bar)
+    return run, n, False
+
+
+def _resampler_align_case(n: int) -> Tuple[Callable[[], Any], int, bool]:
+    df = generate_ohlcv(n)
+    return lambda: [align_to_base(df, tf) for tf in RESAMPLE_TIMEFRAMES], n, False
+
+
+def _broker_case(n: int) -> Tuple[Callable[[], Any], int, bool]:
+    prices = generate_ohlcv(n)['close'].to_numpy()
+
+    def run() -> None:
+        broker = PaperBroker(1e12, 0.001)
+        submit = broker.submit_order
+        for i, p in enumerate(prices):
+            submit('BTC/USDT', 0.01, 'buy' if i % 2 == 0 else 'sell', price=float(p))
+    return run, n, False
+
+
+def _metrics_case(n: int) -> Tuple[Callable[[], Any], int, bool]:
+    df = generate_ohlcv(n)
+    equity = df['close'] / df['close'].iloc[0] * 10_000.0
+    rng = np.random.default_rng(0)
+    n_trades = max(1, n // 100)
+    trades = pd.DataFrame({'pnl': rng.normal(0.0, 10.0, n_trades)})
+    return lambda: calculate_metrics(equity, trades, timeframe='1m'), n, False
+
+
+def build_cases(sizes: List[int], engine_sizes: List[int]) -> List[Tuple[str, int, CaseFactory]]:
+    """Returns the (name, bars, factory) cases to run."""
+    cases: List[Tuple[str, int, CaseFactory]] = []
+    for ind in INDICATORS:
+        cases += [(f'indicators.{ind}', n, _indicator_case(ind)) for n in sizes]
+    # Banks return bars x len(BANK_WINDOWS) floats; cap the history to
+    # keep that array in memory.
+    for ind in ('ema', 'rsi', 'atr'):
+        cases += [(f'indicator_bank.{ind}', n, _bank_case(ind)) for n in sizes if n <= 1_000_000]
+    # generate_signal works on the whole frame it is given; cap the
+    # history so a single call stays in the sub-second range.
+    cases += [('signal.rule_based', n, _signal_case()) for n in sizes if n <= 1_000_000]
+    cases += [('engine.run', n, _engine_case) for n in engine_sizes]
+    cases += [('broker.fills', n, _broker_case) for n in sizes if n <= 1_000_000]
+    cases += [('resampler.stream', n, _resampler_stream_case) for n in sizes if n <= 1_000_000]
+    cases += [('resampler.align', n, _resampler_align_case) for n in sizes]
+    cases += [('metrics', n, _metrics_case) for n in sizes]
+    for ind in INDICATORS:
+        cases.append((f'latency.indicators.{ind}', LATENCY_BARS, _indicator_case(ind, per_call=True)))
+    cases.append(('latency.signal.rule_based', LATENCY_BARS, _signal_case(per_call=True)))
+    return cases
+
+
+def measure(fn: Callable[[], Any], units: int, per_call: bool, repeats: int) -> Dict[str, float]:
+    """
+    Times fn() `repeats` times (best run drives throughput) and runs it
+    once more under tracemalloc for peak memory. Per-call cases also
+    report p50/p99 latency over all timed runs.
+    """
+    fn()  # warm-up: caches, lazy imports, allocator
+
+    durations = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - t0)
+    best = min(durations)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'seconds': best,
+        'bars_per_sec': units / best if best > 0 else float('inf'),
+        'peak_mem_mb': peak / 1e6,
+    }
+    if per_call:
+        ordered = sorted(durations)
+        result['p50_us'] = ordered[int(0.50 * (len(ordered) - 1))] * 1e6
+        result['p99_us'] = ordered[int(0.99 * (len(ordered) - 1))] * 1e6
+    return result
+
+
+def run_benchmarks(
+    sizes: List[int], engine_sizes: List[int], repeats: int, pattern: Optional[str] = None
+) -> Dict[str, Any]:
+    """Runs all selected cases and returns the JSON-serialisable report."""
+    results: Dict[str, Dict[str, float]] = {}
+    for name, n, factory in build_cases(sizes, engine_sizes):
+        if pattern and pattern not in name:
+            continue
+        key = f'{name}[{n}]'
+        fn, units, per_call = factory(n)
+        reps = max(repeats, LATENCY_SAMPLES) if per_call else repeats
+        results[key] = {'bars': n, **measure(fn, units, per_call, reps)}
+        r = results[key]
+        line = f"{key:<36}{r['bars_per_sec']:>16,.0f} bars/s{r['peak_mem_mb']:>10.1f} MB"
+        if per_call:
+            line += f"  p50 {r['p50_us']:,.0f} us  p99 {r['p99_us']:,.0f} us"
+        print(line)
+    return {
+        'meta': {
+            'pattern': pattern,
+            'sizes': sorted(set(sizes) | set(engine_sizes) | {LATENCY_BARS}),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def _selected(key: str, meta: Dict[str, Any]) -> bool:
+    """Whether a run with this meta's -k pattern and sizes includes key."""
+    name, _, bars = key.rpartition('[')
+    pattern, sizes = meta.get('pattern'), meta.get('sizes')
+    if pattern and pattern not in name:
+        return False
+    return sizes is None or int(bars.rstrip(']')) in sizes
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Returns human-readable regression messages.
+
+    A case regresses when throughput drops below (1 - tolerance) x baseline,
+    peak memory grows above (1 + tolerance) x baseline, or its p50/p99
+    latency grows above (1 + tolerance) x baseline. Memory below 1 MB is
+    ignored as noise. Cases added since the baseline, and baseline cases
+    the current run should have covered but did not, are reported too:
+    the baseline needs regenerating before they can be compared.
+    """
+    regressions: List[str] = []
+    cur_results = current['results']
+    base_results = baseline.get('results', {})
+    for key in sorted(set(cur_results) - set(base_results)):
+        regressions.append(f"{key}: new case, not in baseline")
+    for key, base in base_results.items():
+        cur = cur_results.get(key)
+        if cur is None:
+            if _selected(key, current.get('meta', {})):
+                regressions.append(f"{key}: in baseline but missing from this run")
+            continue
+        if cur['bars_per_sec'] < base['bars_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{key}: throughput {cur['bars_per_sec']:,.0f} < "
+                f"baseline {base['bars_per_sec']:,.0f} bars/s"
+            )
+        if base['peak_mem_mb'] >= 1.0 and cur['peak_mem_mb'] > base['peak_mem_mb'] * (1 + tolerance):
+            regressions.append(
+                f"{key}: peak memory {cur['peak_mem_mb']:.1f} MB > "
+                f"baseline {base['peak_mem_mb']:.1f} MB"
+            )
+        for pct in ('p50_us', 'p99_us'):
+            if pct not in base:
+                continue
+            if pct not in cur:
+                regressions.append(f"{key}: {pct[:3]} latency missing from this run")
+            elif cur[pct] > base[pct] * (1 + tolerance):
+                regressions.append(
+                    f"{key}: {pct[:3]} latency {cur[pct]:,.0f} us > baseline {base[pct]:,.0f} us"
+                )
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run performance benchmarks.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None,
+                        help="Bar counts for vectorised cases.")
+    parser.add_argument('--engine-sizes', type=int, nargs='+', default=DEFAULT_ENGINE_SIZES,
+                        help="Bar counts for BacktestEngine.run.")
+    parser.add_argument('--full', action='store_true', help="Include 10M-bar cases.")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('-k', dest='pattern', default=None,
+                        help="Only run cases whose name contains this substring.")
+    parser.add_argument('--output', default=None, help="Write results JSON here.")
+    parser.add_argument('--compare', default=None, help="Baseline JSON to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative slowdown / memory growth.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    logger.setLevel(logging.ERROR)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    report = run_benchmarks(sizes, args.engine_sizes, args.repeats, args.pattern)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for msg in regressions:
+                print(f"  - {msg}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,4 +2,106 @@
 Backtest runner.
 Executes historical backtest.
 """
-pass
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from src.backtest.engine import BacktestEngine  # noqa: E402
+from src.data.feed import load_ohlcv_csv  # noqa: E402
+from src.data.resampler import BarResampler  # noqa: E402
+from src.execution.paper_broker import PaperBroker  # noqa: E402
+from src.risk.risk_manager import RiskManager  # noqa: E402
+from src.signals.rule_based import RuleBasedSignal  # noqa: E402
+from src.utils.config_loader import load_config  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+from src.utils.metrics import calculate_metrics  # noqa: E402
+from src.utils.profiling import StageProfiler  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a historical backtest.")
+    parser.add_argument('--config', default=str(ROOT / 'config' / 'settings.yaml'))
+    parser.add_argument('--data', default=str(ROOT / 'historical_data.csv'))
+    parser.add_argument('--smoke', action='store_true',
+                        help="Quick end-to-end check on the bundled sample data.")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print a per-stage timing table after the run.")
+    parser.add_argument('--profile-json', default=None,
+                        help="Write the per-stage timing summary to this JSON file.")
+    parser.add_argument('--cprofile', default=None,
+                        help="Dump a cProfile/pstats file scoped to the run.")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Advance indicators bar by bar instead of re-slicing history.")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Engine checkpoint (.npz): resume from it if it exists, "
+                             "then overwrite it after the run. Implies --streaming.")
+    parser.add_argument('--validate-resume', action='store_true',
+                        help="After resuming, rerun the full history and fail unless identical.")
+    parser.add_argument('--store', default=None,
+                        help="Save params, metrics, equity and trades to this results store.")
+    parser.add_argument('--label', default=None, help="Label for the stored run.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = load_config(args.config)
+    data = load_ohlcv_csv(args.data)
+
+    profiling = bool(args.profile or args.profile_json or args.cprofile)
+    profiler = StageProfiler(enabled=profiling, cprofile_path=args.cprofile)
+
+    signal = RuleBasedSignal(config)
+    engine = BacktestEngine(
+        data=data,
+        broker=PaperBroker(config['initial_capital'], config['trading_fee']),
+        risk_manager=RiskManager(config),
+        signal_generator=signal,
+        trading_fee=config['trading_fee'],
+        profiler=profiler,
+        resampler=BarResampler(config['timeframe']) if signal.timeframes else None,
+        streaming=bool(args.streaming or args.checkpoint),
+    )
+    if args.checkpoint and Path(args.checkpoint).exists():
+        engine.load_checkpoint(args.checkpoint)
+    equity = engine.run(validate=args.validate_resume)
+    if args.checkpoint:
+        engine.save_checkpoint(args.checkpoint)
+
+    metrics = calculate_metrics(
+        equity['equity'], pd.DataFrame(engine.trades), timeframe=config['timeframe']
+    )
+    for key, value in metrics.items():
+        logger.info(f"{key}: {value}")
+
+    if args.store:
+        from src.state.results_store import ResultsStore
+
+        store = ResultsStore(args.store)
+        run_id = store.save_run(config, metrics, equity=equity, trades=engine.trades,
+                                label=args.label)
+        store.close()
+        logger.info(f"Run {run_id} saved to {args.store}")
+
+    if args.profile:
+        print(profiler.format_table())
+    if args.profile_json:
+        profiler.to_json(args.profile_json)
+        logger.info(f"Profile summary written to {args.profile_json}")
+    if args.cprofile:
+        logger.info(f"cProfile stats written to {args.cprofile}")
+
+    if args.smoke:
+        logger.info(f"Smoke backtest OK: {len(data)} bars, {len(engine.trades)} trades")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
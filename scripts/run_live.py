@@ -1,5 +1,148 @@
 """
 Live runner.
 Executes the live trading loop.
+
+Only the core loop is imported eagerly. Broker SDKs, exchange feeds and
+other heavy subsystems are imported inside the builders below, and only
+when the config (or CLI) selects them, to keep restart-to-trading time
+within the startup budget checked by benchmarks/bench_startup.py.
 """
-pass
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.live_loop import LiveLoop  # noqa: E402
+from src.data.resampler import BarResampler  # noqa: E402
+from src.execution.broker_base import BrokerBase  # noqa: E402
+from src.risk.risk_manager import RiskManager  # noqa: E402
+from src.signals.rule_based import RuleBasedSignal  # noqa: E402
+from src.state.journal import TradeJournal  # noqa: E402
+from src.utils.config_loader import load_config  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+from src.utils.profiling import StageProfiler  # noqa: E402
+
+
+def build_broker(config: Dict[str, Any]) -> BrokerBase:
+    """Constructs the broker selected by config['broker_mode']."""
+    mode = config['broker_mode']
+    if mode == 'paper':
+        from src.execution.paper_broker import PaperBroker
+        return PaperBroker(config['initial_capital'], config['trading_fee'])
+    if mode == 'live':
+        import os
+        from dotenv import load_dotenv
+        from src.execution.live_broker import LiveBroker
+
+        load_dotenv()
+        api_key = os.environ.get('BINANCE_API_KEY')
+        api_secret = os.environ.get('BINANCE_API_SECRET')
+        if not api_key or not api_secret:
+            raise KeyError("broker_mode: live requires BINANCE_API_KEY and BINANCE_API_SECRET")
+        live = config.get('live_broker', {})
+        return LiveBroker(
+            live.get('base_url', 'https://api.binance.com'),
+            api_key,
+            api_secret,
+            [f"{config['base_asset']}/{config['quote_asset']}"],
+            pool_size=live.get('pool_size', 4),
+            weight_limit=live.get('weight_limit', 1200),
+            refresh_interval=live.get('refresh_interval', 1.0),
+        )
+    raise ValueError(f"Unknown broker_mode '{mode}'. Options: paper, live")
+
+
+def build_alerts(args: argparse.Namespace, config: Dict[str, Any]) -> Optional[Any]:
+    """Alert dispatcher with console/file sinks, plus voice when voice_alerts is on."""
+    if args.no_alerts:
+        return None
+    from src.notifications.voice_alerts import AlertDispatcher, ConsoleSink, FileSink
+
+    sinks = [ConsoleSink()]
+    if args.alerts_file:
+        sinks.append(FileSink(args.alerts_file))
+    if config.get('voice_alerts'):
+        from src.notifications.voice_alerts import VoiceSink
+        try:
+            sinks.append(VoiceSink())
+        except ImportError:
+            logger.warning("voice_alerts is enabled but pyttsx3 is not installed; voice disabled.")
+    return AlertDispatcher(sinks).start()
+
+
+def build_feed(args: argparse.Namespace, config: Dict[str, Any]) -> Iterable[Tuple[Any, Dict[str, float]]]:
+    """Replay feed from CSV when --replay is given, otherwise an exchange feed."""
+    if args.replay:
+        from src.data.feed import ReplayFeed, load_ohlcv_csv
+        return ReplayFeed(load_ohlcv_csv(args.replay), interval=args.replay_interval)
+
+    from src.data.feed import CCXTFeed
+    symbol = f"{config['base_asset']}/{config['quote_asset']}"
+    return CCXTFeed(args.exchange, symbol, config['timeframe'])
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the live/paper trading loop.")
+    parser.add_argument('--config', default=str(ROOT / 'config' / 'settings.yaml'))
+    parser.add_argument('--replay', default=None,
+                        help="Replay bars from this OHLCV CSV instead of polling an exchange.")
+    parser.add_argument('--replay-interval', type=float, default=0.0,
+                        help="Seconds to wait between replayed bars.")
+    parser.add_argument('--exchange', default='binance', help="ccxt exchange id for live bars.")
+    parser.add_argument('--max-bars', type=int, default=None)
+    parser.add_argument('--journal', default='journal.db',
+                        help="SQLite journal; state is restored from it on startup.")
+    parser.add_argument('--snapshot-every', type=int, default=100,
+                        help="Bars between state snapshots (bounds restart replay).")
+    parser.add_argument('--alerts-file', default=None, help="Also append alerts to this file.")
+    parser.add_argument('--no-alerts', action='store_true', help="Disable the alert dispatcher.")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print a per-stage timing table on exit.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = load_config(args.config)
+
+    profiler = StageProfiler(enabled=args.profile)
+    journal = TradeJournal(args.journal)
+    alerts = build_alerts(args, config)
+    signal = RuleBasedSignal(config)
+    broker = build_broker(config)
+    loop = LiveLoop(
+        broker=broker,
+        risk_manager=RiskManager(config),
+        signal_generator=signal,
+        symbol=f"{config['base_asset']}/{config['quote_asset']}",
+        trading_fee=config['trading_fee'],
+        journal=journal,
+        snapshot_every=args.snapshot_every,
+        alerts=alerts,
+        profiler=profiler,
+        resampler=BarResampler(config['timeframe']) if signal.timeframes else None,
+    )
+    loop.restore()
+
+    try:
+        loop.run(build_feed(args, config), max_bars=args.max_bars)
+    except KeyboardInterrupt:
+        logger.info("Interrupted; shutting down.")
+    finally:
+        journal.close()
+        broker.close()
+        if alerts is not None:
+            alerts.stop()
+
+    if args.profile:
+        print(profiler.format_table())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Walk-forward optimization runner.
+Re-tunes the 'walk_forward.grid' parameters on a trailing window, trades
+each following period out of sample, and compares the chained result
+with a fixed-parameter run.
+
+Usage:
+    python scripts/run_walk_forward.py --data btc_1h.csv --workers 8
+    python scripts/run_walk_forward.py --train-period 90D --test-freq W-MON --store results
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.backtest.walk_forward import walk_forward  # noqa: E402
+from src.data.feed import load_ohlcv_csv  # noqa: E402
+from src.utils.config_loader import load_config  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a walk-forward optimization backtest.")
+    parser.add_argument('--config', default=str(ROOT / 'config' / 'settings.yaml'))
+    parser.add_argument('--data', default=str(ROOT / 'historical_data.csv'))
+    parser.add_argument('--train-period', default=None,
+                        help="In-sample length, e.g. 180D (default: walk_forward.train_period).")
+    parser.add_argument('--test-freq', default=None,
+                        help="Re-optimization frequency, e.g. MS (default: walk_forward.test_freq).")
+    parser.add_argument('--objective', default=None,
+                        help="Metric to maximize in sample (default: walk_forward.objective).")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Process pool size (default: CPU count).")
+    parser.add_argument('--store', default=None,
+                        help="Save in-sample runs and the chained result to this results store.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = load_config(args.config)
+    wf = config.get('walk_forward')
+    if not wf or not wf.get('grid'):
+        raise KeyError("Missing 'walk_forward.grid' in config; see config/settings.yaml.")
+    data = load_ohlcv_csv(args.data)
+
+    store = None
+    if args.store:
+        from src.state.results_store import ResultsStore
+        store = ResultsStore(args.store)
+
+    try:
+        result = walk_forward(
+            data, config, wf['grid'],
+            train_period=args.train_period or wf.get('train_period', '180D'),
+            test_freq=args.test_freq or wf.get('test_freq', 'MS'),
+            objective=args.objective or wf.get('objective', 'sharpe_ratio'),
+            max_workers=args.workers,
+            store=store,
+        )
+    finally:
+        if store is not None:
+            store.close()
+
+    print(result.format_table())
+    logger.info(
+        f"Walk-forward: {len(result.windows)} windows, {len(result.trades)} trades, "
+        f"return {result.metrics['total_return']:.2%} "
+        f"(fixed params {result.fixed_metrics['total_return']:.2%})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
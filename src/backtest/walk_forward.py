@@ -0,0 +1,422 @@
+"""
+Walk-forward optimization module.
+Re-tunes strategy parameters on a trailing in-sample window, trades the
+following out-of-sample period with the winner, and chains those periods
+into one continuous backtest.
+"""
+
+import copy
+import itertools
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from src.backtest.engine import BacktestEngine
+from src.data.feed import OHLCV_COLUMNS
+from src.data.resampler import BarResampler
+from src.execution.paper_broker import PaperBroker
+from src.risk.risk_manager import RiskManager
+from src.signals.rule_based import RuleBasedSignal
+from src.state.results_store import ResultsStore
+from src.utils.logger import logger
+from src.utils.metrics import calculate_metrics
+
+# Dotted config key ('signals.ema_fast') -> values to try.
+ParamGrid = Dict[str, Sequence[Any]]
+
+
+def apply_params(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of config with dotted keys from params set.
+
+    Raises:
+        KeyError: If a key does not name an existing config entry.
+    """
+    merged = copy.deepcopy(config)
+    for name, value in params.items():
+        *parents, leaf = name.split('.')
+        node = merged
+        for part in parents:
+            node = node[part]
+        if leaf not in node:
+            raise KeyError(f"Unknown config key '{name}'")
+        node[leaf] = value
+    return merged
+
+
+def drop_params(config: Dict[str, Any], names: Sequence[str]) -> Dict[str, Any]:
+    """Returns a copy of config with the dotted keys in names removed."""
+    pruned = copy.deepcopy(config)
+    for name in names:
+        *parents, leaf = name.split('.')
+        node = pruned
+        for part in parents:
+            node = node[part]
+        node.pop(leaf, None)
+    return pruned
+
+
+def expand_grid(grid: ParamGrid) -> List[Dict[str, Any]]:
+    """All combinations of the grid, in grid order (last key varies fastest)."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+@dataclass
+class WalkForwardWindow:
+    """Row ranges [start, stop) of one in-sample / out-of-sample pair."""
+    index: int
+    is_start: int
+    is_stop: int
+    oos_start: int
+    oos_stop: int
+    oos_begin: pd.Timestamp
+    oos_end: pd.Timestamp
+
+
+def make_windows(
+    index: pd.DatetimeIndex, train_period: str = '180D', test_freq: str = 'MS'
+) -> List[WalkForwardWindow]:
+    """
+    Splits a timestamp index into walk-forward windows.
+
+    Out-of-sample periods start at every `test_freq` boundary ('MS' =
+    month start, 'W-MON', '7D', ...) once `train_period` of history is
+    available, and run until the next boundary; each is preceded by the
+    trailing `train_period` as its in-sample window.
+
+    Raises:
+        ValueError: If the index is shorter than one training period.
+    """
+    if len(index) == 0:
+        raise ValueError("Cannot build walk-forward windows over empty data")
+    train = to_offset(train_period)
+    first = index[0] + train
+    boundaries = list(pd.date_range(first, index[-1], freq=test_freq))
+    if not boundaries:
+        raise ValueError(
+            f"Data spans {index[0]} .. {index[-1]}; need more than train_period "
+            f"'{train_period}' plus one '{test_freq}' boundary"
+        )
+    rows = index.searchsorted(boundaries)
+    stops = list(rows[1:]) + [len(index)]
+
+    windows = []
+    for boundary, oos_start, oos_stop in zip(boundaries, rows, stops):
+        if oos_stop <= oos_start:
+            continue
+        windows.append(WalkForwardWindow(
+            index=len(windows),
+            is_start=int(index.searchsorted(boundary - train)),
+            is_stop=int(oos_start),
+            oos_start=int(oos_start),
+            oos_stop=int(oos_stop),
+            oos_begin=index[oos_start],
+            oos_end=index[oos_stop - 1],
+        ))
+    return windows
+
+
+@dataclass
+class WindowResult:
+    """Chosen parameters and scores of one walk-forward window."""
+    window: WalkForwardWindow
+    params: Dict[str, Any]
+    is_score: float
+    candidates: int
+    oos_metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    Chained out-of-sample run plus the fixed-parameter reference.
+
+    Timings are wall seconds, except search_cpu_seconds (sum over all
+    in-sample backtests, i.e. what the search would cost on one core).
+    overhead is total_seconds / fixed_seconds.
+    """
+    windows: List[WindowResult]
+    equity: pd.DataFrame
+    trades: List[Dict[str, Any]]
+    metrics: Dict[str, Any]
+    fixed_metrics: Dict[str, Any]
+    search_seconds: float
+    search_cpu_seconds: float
+    oos_seconds: float
+    fixed_seconds: float
+    total_seconds: float
+    workers: int
+
+    @property
+    def overhead(self) -> float:
+        return self.total_seconds / self.fixed_seconds if self.fixed_seconds > 0 else math.inf
+
+    def format_table(self) -> str:
+        """Per-window parameters and scores, followed by the comparison."""
+        names = sorted({k for w in self.windows for k in w.params})
+        header = f"{'#':>3}  {'oos start':<20}" + ''.join(f"{n:>22}" for n in names)
+        lines = [header + f"{'is score':>10}{'oos return':>12}", '-' * (len(header) + 22)]
+        for w in self.windows:
+            lines.append(
+                f"{w.window.index:>3}  {str(w.window.oos_begin):<20}"
+                + ''.join(f"{str(w.params.get(n)):>22}" for n in names)
+                + f"{w.is_score:>10.3f}{w.oos_metrics.get('total_return', 0.0):>12.2%}"
+            )
+        lines += [
+            '',
+            f"{'':<24}{'walk-forward':>14}{'fixed params':>14}",
+        ]
+        for key in ('total_return', 'sharpe_ratio', 'max_drawdown', 'total_trades'):
+            a, b = self.metrics.get(key, 0), self.fixed_metrics.get(key, 0)
+            fmt = '{:>14d}' if key == 'total_trades' else '{:>14.4f}'
+            lines.append(f"{key:<24}" + fmt.format(a) + fmt.format(b))
+        lines += [
+            '',
+            f"search: {self.search_seconds:.2f} s wall, {self.search_cpu_seconds:.2f} s CPU "
+            f"on {self.workers} workers",
+            f"out-of-sample chain: {self.oos_seconds:.2f} s",
+            f"total {self.total_seconds:.2f} s vs fixed-parameter run "
+            f"{self.fixed_seconds:.2f} s -> {self.overhead:.1f}x overhead",
+        ]
+        return '\n'.join(lines)
+
+
+# Process-pool workers get the OHLCV frame once, via the initializer,
+# instead of one pickled slice per task.
+_WORKER_DATA: Optional[pd.DataFrame] = None
+
+
+def _init_worker(data: Optional[pd.DataFrame]) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _build_engine(
+    data: pd.DataFrame,
+    config: Dict[str, Any],
+    broker: Optional[PaperBroker] = None,
+    risk_manager: Optional[RiskManager] = None,
+    warmup_bars: int = 50,
+) -> BacktestEngine:
+    signal = RuleBasedSignal(config)
+    return BacktestEngine(
+        data=data,
+        broker=(broker if broker is not None
+                else PaperBroker(config['initial_capital'], config['trading_fee'])),
+        risk_manager=risk_manager if risk_manager is not None else RiskManager(config),
+        signal_generator=signal,
+        trading_fee=config['trading_fee'],
+        resampler=BarResampler(config['timeframe']) if signal.timeframes else None,
+        streaming=True,
+        warmup_bars=warmup_bars,
+    )
+
+
+def _metrics(equity: pd.DataFrame, trades: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Any]:
+    return calculate_metrics(equity['equity'], pd.DataFrame(trades), timeframe=config['timeframe'])
+
+
+def _evaluate(start: int, stop: int, config: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    """In-sample backtest of one candidate; returns (metrics, CPU seconds)."""
+    t0 = time.process_time()
+    engine = _build_engine(_WORKER_DATA.iloc[start:stop], config)
+    equity = engine.run()
+    return _metrics(equity, engine.trades, config), time.process_time() - t0
+
+
+def _score(metrics: Dict[str, Any], objective: str) -> float:
+    value = metrics.get(objective)
+    if value is None or not math.isfinite(float(value)):
+        return -math.inf
+    return float(value)
+
+
+def walk_forward(
+    data: pd.DataFrame,
+    config: Dict[str, Any],
+    grid: ParamGrid,
+    train_period: str = '180D',
+    test_freq: str = 'MS',
+    objective: str = 'sharpe_ratio',
+    max_workers: Optional[int] = None,
+    store: Optional[ResultsStore] = None,
+    label: str = 'walk_forward',
+) -> WalkForwardResult:
+    """
+    Walk-forward optimization of `grid` over `data`.
+
+    For every window, each grid candidate is backtested on the in-sample
+    rows from fresh capital and the one with the highest `objective`
+    metric wins (ties go to the earlier candidate). All (window,
+    candidate) backtests of all windows share one process pool. The
+    winners then trade their out-of-sample periods in order with one
+    PaperBroker; RiskManager state (peak, start of day, halt) and any open
+    position carry from one period to the next, so the chained equity
+    curve is one continuous account. Each period's indicators are warmed
+    up on its in-sample rows, i.e. on data the search had already seen.
+
+    A fixed-parameter run of `config` over the same out-of-sample span is
+    timed as the reference for the reported overhead.
+
+    Args:
+        data: OHLCV frame indexed by timestamp.
+        config: Base configuration; grid keys are dotted paths into it.
+        grid: Values to try per parameter, e.g.
+            {'signals.ema_fast': [8, 12], 'risk_per_trade_pct': [0.005, 0.01]}.
+        train_period: In-sample length as a pandas offset ('180D').
+        test_freq: Re-optimization frequency as a pandas offset ('MS').
+        objective: calculate_metrics key to maximize.
+        max_workers: Process pool size; 1 runs everything in-process.
+        store: Optional ResultsStore; every in-sample run and the chained
+            result are saved to it under `label`. The chained result is
+            saved without the grid keys, which it never held fixed; its
+            'walk_forward' params entry records the settings used and each
+            window's out-of-sample span and parameters.
+
+    Raises:
+        ValueError: If no grid candidate is a valid configuration.
+    """
+    t_total = time.perf_counter()
+    data = data[OHLCV_COLUMNS]
+    windows = make_windows(data.index, train_period, test_freq)
+
+    candidates, configs = [], []
+    for params in expand_grid(grid):
+        candidate_config = apply_params(config, params)
+        try:
+            RuleBasedSignal(candidate_config)
+        except ValueError as e:
+            logger.debug(f"Skipping grid candidate {params}: {e}")
+            continue
+        candidates.append(params)
+        configs.append(candidate_config)
+    if not candidates:
+        raise ValueError(f"No valid parameter combination in grid {grid}")
+
+    workers = max_workers or os.cpu_count() or 1
+    logger.info(
+        f"Walk-forward: {len(windows)} windows x {len(candidates)} candidates "
+        f"on {workers} workers"
+    )
+
+    # --- In-sample search: every (window, candidate) in one pool ---
+    t0 = time.perf_counter()
+    executor: Optional[Executor] = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data,))
+    else:
+        _init_worker(data)
+    try:
+        if executor is not None:
+            futures = {
+                (w.index, c): executor.submit(_evaluate, w.is_start, w.is_stop, configs[c])
+                for w in windows for c in range(len(candidates))
+            }
+            outcomes = {key: f.result() for key, f in futures.items()}
+        else:
+            outcomes = {
+                (w.index, c): _evaluate(w.is_start, w.is_stop, configs[c])
+                for w in windows for c in range(len(candidates))
+            }
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        else:
+            _init_worker(None)
+    search_seconds = time.perf_counter() - t0
+    search_cpu = sum(cpu for _, cpu in outcomes.values())
+
+    results: List[WindowResult] = []
+    for w in windows:
+        scores = [_score(outcomes[(w.index, c)][0], objective) for c in range(len(candidates))]
+        best = max(range(len(candidates)), key=lambda c: (scores[c], -c))
+        results.append(WindowResult(w, candidates[best], scores[best], len(candidates)))
+        if store is not None:
+            for c in range(len(candidates)):
+                store.save_run(
+                    configs[c], outcomes[(w.index, c)][0],
+                    label=f"{label}/is/{w.index}", commit=False,
+                )
+
+    # --- Out-of-sample chain ---
+    t0 = time.perf_counter()
+    broker = PaperBroker(config['initial_capital'], config['trading_fee'])
+    risk_state: Optional[Dict[str, Any]] = None
+    position: Optional[Dict[str, Any]] = None
+    segments: List[pd.DataFrame] = []
+    trades: List[Dict[str, Any]] = []
+    for res in results:
+        w = res.window
+        window_config = apply_params(config, res.params)
+        risk_manager = RiskManager(window_config)
+        if risk_state is not None:
+            risk_manager.set_state(risk_state)
+        engine = _build_engine(
+            data.iloc[w.is_start:w.oos_stop], window_config, broker, risk_manager,
+            warmup_bars=w.oos_start - w.is_start,
+        )
+        if position is not None:
+            engine.set_position_state(position)
+        equity = engine.run()
+        res.oos_metrics = _metrics(equity, engine.trades, window_config)
+        segments.append(equity)
+        trades.extend(engine.trades)
+        risk_state = risk_manager.get_state()
+        position = engine.get_position_state()
+    equity = pd.concat(segments)
+    metrics = _metrics(equity, trades, config)
+    oos_seconds = time.perf_counter() - t0
+
+    # --- Fixed-parameter reference over the same out-of-sample span ---
+    t0 = time.perf_counter()
+    first, last = windows[0], windows[-1]
+    fixed = _build_engine(
+        data.iloc[first.is_start:last.oos_stop], config,
+        warmup_bars=first.oos_start - first.is_start,
+    )
+    fixed_metrics = _metrics(fixed.run(), fixed.trades, config)
+    fixed_seconds = time.perf_counter() - t0
+
+    if store is not None:
+        chained_params = drop_params(config, list(grid))
+        chained_params.setdefault('walk_forward', {}).update({
+            'train_period': train_period,
+            'test_freq': test_freq,
+            'objective': objective,
+            'windows': [
+                {
+                    'oos_begin': str(res.window.oos_begin),
+                    'oos_end': str(res.window.oos_end),
+                    'params': res.params,
+                }
+                for res in results
+            ],
+        })
+        store.save_run(chained_params, metrics, equity=equity, trades=trades, label=label, commit=False)
+        store.commit()
+
+    result = WalkForwardResult(
+        windows=results,
+        equity=equity,
+        trades=trades,
+        metrics=metrics,
+        fixed_metrics=fixed_metrics,
+        search_seconds=search_seconds,
+        search_cpu_seconds=search_cpu,
+        oos_seconds=oos_seconds,
+        fixed_seconds=fixed_seconds,
+        total_seconds=time.perf_counter() - t_total,
+        workers=workers,
+    )
+    logger.info(
+        f"Walk-forward done in {result.total_seconds:.2f} s "
+        f"({result.overhead:.1f}x a fixed-parameter run)"
+    )
+    return result
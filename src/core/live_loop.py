@@ -2,4 +2,454 @@
 Live trading loop module.
 Main orchestrator for live and paper trading.
 """
-pass
+
+import datetime
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.data.resampler import BarResampler
+from src.execution.broker_base import BrokerBase
+from src.features.indicators import IncrementalATR
+from src.notifications.voice_alerts import AlertDispatcher
+from src.risk.risk_manager import RiskManager
+from src.signals.base import SignalBase, StreamingSignal
+from src.state.journal import TradeJournal
+from src.utils.logger import logger
+from src.utils.profiling import NULL_PROFILER, StageProfiler
+
+Bar = Dict[str, float]
+
+
+class LiveLoop:
+    """
+    Bar-driven trading loop for live and paper sessions.
+
+    Applies the same per-bar decision sequence as BacktestEngine — equity
+    update, halt/liquidate, signal, ATR-sized entry, net-of-fees exit — to
+    bars arriving one at a time from a feed. StreamingSignal generators
+    are advanced incrementally; other signals see the trailing
+    `history_bars` bars.
+
+    With a TradeJournal attached, every bar and fill is journaled and a
+    state snapshot is written every `snapshot_every` bars; restore()
+    rebuilds the loop from the latest snapshot plus the journal tail.
+
+    With an AlertDispatcher attached, fills, RiskManager halts and
+    drawdowns beyond `drawdown_warning` x max_drawdown are announced;
+    notify() only enqueues, so alerts never stall the loop.
+
+    A BarResampler, if given, is bound to the signal and fed every bar
+    before the signal runs, and is part of the snapshot state.
+    """
+    def __init__(
+        self,
+        broker: BrokerBase,
+        risk_manager: RiskManager,
+        signal_generator: SignalBase,
+        symbol: str = 'BTC/USDT',
+        trading_fee: float = 0.001,
+        history_bars: int = 500,
+        warmup_bars: int = 50,
+        atr_window: int = 14,
+        journal: Optional[TradeJournal] = None,
+        snapshot_every: int = 100,
+        alerts: Optional[AlertDispatcher] = None,
+        drawdown_warning: float = 0.5,
+        profiler: Optional[StageProfiler] = None,
+        resampler: Optional[BarResampler] = None,
+    ) -> None:
+        if history_bars < warmup_bars:
+            raise ValueError(
+                f"history_bars ({history_bars}) must be >= warmup_bars ({warmup_bars})"
+            )
+        if snapshot_every <= 0:
+            raise ValueError(f"snapshot_every must be positive, got {snapshot_every}")
+        if signal_generator.timeframes and resampler is None:
+            raise ValueError(
+                f"Signal reads timeframes {list(signal_generator.timeframes)}; "
+                "pass a BarResampler."
+            )
+        self.broker = broker
+        self.risk_manager = risk_manager
+        self.signal_generator = signal_generator
+        self.symbol = symbol
+        self.trading_fee = trading_fee
+        self.warmup_bars = warmup_bars
+        self.journal = journal
+        self.snapshot_every = snapshot_every
+        self.alerts = alerts
+        self.drawdown_warning = drawdown_warning
+        self._drawdown_warned = False
+        self.profiler = profiler if profiler is not None else NULL_PROFILER
+        self.resampler = resampler
+        if resampler is not None:
+            signal_generator.bind_resampler(resampler)
+
+        self._streaming = isinstance(signal_generator, StreamingSignal)
+        self._history: Deque[Tuple[Any, Bar]] = deque(maxlen=history_bars)
+        self._atr = IncrementalATR(atr_window)
+        self.seq: int = 0
+        self._last_ts: Optional[pd.Timestamp] = None
+        self._prev_date: Optional[datetime.date] = None
+        self.trades: List[Dict[str, Any]] = []
+
+        self._entry_price: Optional[float] = None
+        self._entry_qty: Optional[float] = None
+        self._entry_fee: float = 0.0
+
+    # ------------------------------------------------------------------
+    # Per-bar processing
+    # ------------------------------------------------------------------
+
+    def _frame(self) -> pd.DataFrame:
+        index = pd.DatetimeIndex([ts for ts, _ in self._history], name='timestamp')
+        return pd.DataFrame([bar for _, bar in self._history], index=index)
+
+    def _advance(self, timestamp: pd.Timestamp, bar: Bar) -> Tuple[bool, float, int]:
+        """
+        Advances all incremental state by one bar.
+        Returns (is_new_day, atr, streaming signal or 0).
+        """
+        current_date = timestamp.date()
+        is_new_day = self._prev_date is not None and current_date != self._prev_date
+        self._prev_date = current_date
+
+        atr = self._atr.update(float(bar['high']), float(bar['low']), float(bar['close']))
+        if self.resampler is not None:
+            self.resampler.update(timestamp, bar)
+        if self._streaming:
+            # Always advanced, even while halted, so indicator state never
+            # skips bars.
+            signal = self.signal_generator.update(bar)
+        else:
+            self._history.append((timestamp, bar))
+            signal = 0
+        return is_new_day, atr, signal
+
+    def on_bar(self, timestamp: Any, bar: Bar) -> int:
+        """
+        Processes one closed bar and returns the signal acted on
+        (0 while warming up or halted).
+        """
+        prof = self.profiler
+        prof.incr('bars')
+        timestamp = pd.Timestamp(timestamp)
+        current_price = float(bar['close'])
+        seq = self.seq + 1
+
+        with prof.stage('indicators'):
+            is_new_day, current_atr, signal = self._advance(timestamp, bar)
+
+        with prof.stage('update_equity'):
+            was_halted = self.risk_manager.halted
+            pos_qty = self.broker.get_positions().get(self.symbol, 0.0)
+            current_equity = self.broker.get_balance() + (pos_qty * current_price)
+            self.risk_manager.update_equity(current_equity, is_new_day=is_new_day)
+
+        if self.alerts is not None:
+            self._risk_alerts(was_halted, current_equity)
+
+        if self.risk_manager.halted:
+            signal = 0
+            if pos_qty > 0:
+                res = self._submit(seq, timestamp, 'sell', pos_qty, current_price)
+                if res.get('status') == 'filled':
+                    self._close_position(seq, timestamp, res, pos_qty)
+        elif seq <= self.warmup_bars:
+            signal = 0
+        else:
+            if not self._streaming:
+                with prof.stage('slice'):
+                    data = self._frame()
+                with prof.stage('generate_signal'):
+                    signal = self.signal_generator.generate_signal(data)
+            self._act(seq, timestamp, signal, pos_qty, current_price, current_atr)
+
+        self.seq = seq
+        self._last_ts = timestamp
+        if self.journal is not None:
+            with prof.stage('journal'):
+                # Written after any order so that the only write an order
+                # intent commits early is the intent itself.
+                self.journal.record_bar(seq, timestamp, bar, current_equity)
+                if seq % self.snapshot_every == 0:
+                    self.journal.save_snapshot(seq, timestamp, self.get_state())
+                self.journal.commit()
+        return signal
+
+    def _risk_alerts(self, was_halted: bool, equity: float) -> None:
+        rm = self.risk_manager
+        if rm.halted and not was_halted:
+            self.alerts.notify(
+                'halt', f"Trading halted at equity {equity:.2f}", level='critical'
+            )
+
+        drawdown = self._drawdown_crossed(equity)
+        if drawdown is not None:
+            self.alerts.notify(
+                'drawdown',
+                f"Drawdown {drawdown:.2%} (halt at {rm.max_drawdown:.2%})",
+                level='warning',
+            )
+
+    def _drawdown_crossed(self, equity: float) -> Optional[float]:
+        """
+        Updates the drawdown-warning latch. Returns the drawdown only on
+        the bar it first reaches the warning threshold (None otherwise);
+        the latch re-arms once the drawdown falls back below it.
+        """
+        rm = self.risk_manager
+        drawdown = (rm.peak_equity - equity) / rm.peak_equity if rm.peak_equity > 0 else 0.0
+        if drawdown < rm.max_drawdown * self.drawdown_warning:
+            self._drawdown_warned = False
+            return None
+        crossed = not self._drawdown_warned
+        self._drawdown_warned = True
+        return drawdown if crossed else None
+
+    def _act(
+        self, seq: int, timestamp: pd.Timestamp, signal: int,
+        pos_qty: float, current_price: float, current_atr: float,
+    ) -> None:
+        prof = self.profiler
+        if signal == 1 and pos_qty == 0:
+            with prof.stage('position_size'):
+                qty = self.risk_manager.calculate_position_size(
+                    self.broker.get_balance(), current_price, current_atr
+                )
+            if qty > 0:
+                res = self._submit(seq, timestamp, 'buy', qty, current_price)
+                if res.get('status') == 'filled':
+                    entry_fee = res['price'] * qty * self.trading_fee
+                    self._entry_price = res['price']
+                    self._entry_qty = qty
+                    self._entry_fee = entry_fee
+                    self._record_trade(seq, {
+                        'timestamp': timestamp,
+                        'side': 'buy',
+                        'price': res['price'],
+                        'qty': qty,
+                        'fee': entry_fee,
+                    })
+
+        elif signal == -1 and pos_qty > 0 and self._entry_price is not None:
+            res = self._submit(seq, timestamp, 'sell', pos_qty, current_price)
+            if res.get('status') == 'filled':
+                self._close_position(seq, timestamp, res, pos_qty)
+
+    def _submit(
+        self, seq: int, timestamp: pd.Timestamp, side: str, qty: float, price: float
+    ) -> Dict[str, Any]:
+        """Submits an order, journaling the intent (committed) before it is sent."""
+        order_id = None
+        if self.journal is not None:
+            order_id = self.journal.record_order(seq, timestamp, self.symbol, side, qty, price)
+        with self.profiler.stage('submit_order'):
+            res = self.broker.submit_order(self.symbol, qty, side, price=price)
+        if order_id is not None:
+            self.journal.resolve_order(order_id, res.get('status', 'unknown'))
+        return res
+
+    def _reconcile(self, order: Dict[str, Any]) -> None:
+        """
+        Settles an order intent left pending by a crash during submission,
+        using the broker's position as the record of whether it filled.
+        The intent's reference price stands in for the unknown fill price.
+        """
+        pos_qty = self.broker.get_positions().get(self.symbol, 0.0)
+        timestamp = pd.Timestamp(order['timestamp'])
+        price = order['price']
+        if order['side'] == 'buy' and pos_qty > 0 and self._entry_price is None:
+            self._entry_price = price
+            self._entry_qty = pos_qty
+            self._entry_fee = price * pos_qty * self.trading_fee
+            self._record_trade(order['seq'], {
+                'timestamp': timestamp,
+                'side': 'buy',
+                'price': price,
+                'qty': pos_qty,
+                'fee': self._entry_fee,
+            })
+            status = 'filled'
+        elif order['side'] == 'sell' and pos_qty == 0:
+            self._close_position(order['seq'], timestamp, {'price': price}, order['qty'])
+            status = 'filled'
+        else:
+            status = 'unfilled'
+        logger.warning(
+            f"Reconciled in-flight {order['side']} of {order['qty']} {order['symbol']} "
+            f"from bar {order['seq']}: {status} (position {pos_qty})"
+        )
+        self.journal.resolve_order(order['id'], f"reconciled:{status}")
+
+    def _close_position(
+        self, seq: int, timestamp: pd.Timestamp, res: Dict[str, Any], qty: float
+    ) -> None:
+        exit_fee = res['price'] * qty * self.trading_fee
+        trade: Dict[str, Any] = {
+            'timestamp': timestamp,
+            'side': 'sell',
+            'price': res['price'],
+            'qty': qty,
+            'fee': exit_fee,
+        }
+        if self._entry_price is not None:
+            gross_pnl = (res['price'] - self._entry_price) * qty
+            trade['pnl'] = gross_pnl - self._entry_fee - exit_fee
+        self._clear_entry()
+        self._record_trade(seq, trade)
+
+    def _record_trade(self, seq: int, trade: Dict[str, Any]) -> None:
+        self.trades.append(trade)
+        if self.alerts is not None:
+            self.alerts.notify(
+                'fill',
+                f"{trade['side'].upper()} {trade['qty']:.6f} {self.symbol} @ {trade['price']:.2f}",
+            )
+        if self.journal is not None:
+            self.journal.record_fill(seq, trade['timestamp'], trade, self.symbol, {
+                'broker': self.broker.get_state(),
+                'entry': self._entry_state(),
+            })
+
+    def _entry_state(self) -> Dict[str, Any]:
+        return {'price': self._entry_price, 'qty': self._entry_qty, 'fee': self._entry_fee}
+
+    def _clear_entry(self) -> None:
+        self._entry_price = None
+        self._entry_qty = None
+        self._entry_fee = 0.0
+
+    # ------------------------------------------------------------------
+    # Snapshot / restore
+    # ------------------------------------------------------------------
+
+    def get_state(self) -> Dict[str, Any]:
+        """Compact, JSON-serialisable state of the whole loop."""
+        state: Dict[str, Any] = {
+            'seq': self.seq,
+            'last_ts': None if self._last_ts is None else str(self._last_ts),
+            'prev_date': None if self._prev_date is None else self._prev_date.isoformat(),
+            'entry': self._entry_state(),
+            'broker': self.broker.get_state(),
+            'risk': self.risk_manager.get_state(),
+            'atr': self._atr.get_state(),
+            'drawdown_warned': self._drawdown_warned,
+        }
+        if self.resampler is not None:
+            state['resampler'] = self.resampler.get_state()
+        if self._streaming:
+            state['signal'] = self.signal_generator.get_state()
+        else:
+            state['history'] = [[str(ts), bar] for ts, bar in self._history]
+        return state
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restores state produced by get_state()."""
+        self.seq = int(state['seq'])
+        self._last_ts = None if state['last_ts'] is None else pd.Timestamp(state['last_ts'])
+        self._prev_date = (
+            None if state['prev_date'] is None
+            else datetime.date.fromisoformat(state['prev_date'])
+        )
+        entry = state['entry']
+        self._entry_price, self._entry_qty, self._entry_fee = (
+            entry['price'], entry['qty'], entry['fee']
+        )
+        self.broker.set_state(state['broker'])
+        self.risk_manager.set_state(state['risk'])
+        self._atr.set_state(state['atr'])
+        self._drawdown_warned = bool(state.get('drawdown_warned', False))
+        if self.resampler is not None:
+            self.resampler.set_state(state['resampler'])
+        if self._streaming:
+            self.signal_generator.set_state(state['signal'])
+        else:
+            self._history.clear()
+            self._history.extend((pd.Timestamp(ts), bar) for ts, bar in state['history'])
+
+    def restore(self) -> Dict[str, Any]:
+        """
+        Rebuilds state from the journal: loads the latest snapshot, then
+        replays journaled bars and fills after it. Orders are not
+        re-submitted; fills are applied from their recorded post-fill
+        state. Orders still pending (the process died while submitting
+        them) are reconciled against the broker's position, so a fill the
+        exchange made is adopted as the open entry rather than stranded.
+
+        Returns:
+            Dict with 'snapshot_seq', 'replayed_bars', 'replayed_fills',
+            'reconciled_orders' and 'seconds'.
+        """
+        if self.journal is None:
+            raise ValueError("restore() requires a journal")
+
+        t0 = time.perf_counter()
+        snapshot = self.journal.latest_snapshot()
+        base_seq = 0
+        if snapshot is not None:
+            self.set_state(snapshot['state'])
+            base_seq = snapshot['seq']
+
+        fills_by_seq: Dict[int, List[Dict[str, Any]]] = {}
+        fills = self.journal.fills_since(base_seq)
+        for fill in fills:
+            fills_by_seq.setdefault(fill['seq'], []).append(fill)
+
+        bars = self.journal.bars_since(base_seq)
+        for rec in bars:
+            timestamp = pd.Timestamp(rec['timestamp'])
+            is_new_day, _, _ = self._advance(timestamp, rec['bar'])
+            self.risk_manager.update_equity(rec['equity'], is_new_day=is_new_day)
+            # Replayed bars were already alerted on; only track the latch.
+            self._drawdown_crossed(rec['equity'])
+            for fill in fills_by_seq.get(rec['seq'], []):
+                self.broker.set_state(fill['state']['broker'])
+                entry = fill['state']['entry']
+                self._entry_price, self._entry_qty, self._entry_fee = (
+                    entry['price'], entry['qty'], entry['fee']
+                )
+                self.trades.append(fill['trade'])
+            self.seq = rec['seq']
+            self._last_ts = timestamp
+
+        pending = self.journal.pending_orders()
+        for order in pending:
+            self._reconcile(order)
+        self.journal.commit()
+
+        info = {
+            'snapshot_seq': base_seq if snapshot is not None else None,
+            'replayed_bars': len(bars),
+            'replayed_fills': len(fills),
+            'reconciled_orders': len(pending),
+            'seconds': time.perf_counter() - t0,
+        }
+        if snapshot is not None or bars:
+            logger.info(
+                f"Restored live state at seq {self.seq} "
+                f"(snapshot {info['snapshot_seq']}, replayed {len(bars)} bars, "
+                f"{len(fills)} fills) in {info['seconds'] * 1e3:.1f} ms"
+            )
+        return info
+
+    def run(self, feed: Iterable[Tuple[Any, Bar]], max_bars: Optional[int] = None) -> None:
+        """
+        Consumes (timestamp, bar) pairs from feed until exhausted or
+        max_bars new bars were processed. Bars at or before the last
+        processed timestamp (e.g. after a restore) are skipped.
+        """
+        logger.info(f"Live loop started for {self.symbol}")
+        processed = 0
+        with self.profiler.session():
+            for timestamp, bar in feed:
+                if self._last_ts is not None and pd.Timestamp(timestamp) <= self._last_ts:
+                    continue
+                self.on_bar(timestamp, bar)
+                processed += 1
+                if max_bars is not None and processed >= max_bars:
+                    break
+        logger.info("Live loop stopped.")
@@ -0,0 +1,359 @@
+"""
+Pipeline module.
+Runs a DAG of stages with content-addressed on-disk caching.
+
+Each stage's cache key is a SHA-256 over its name and version, the source
+of its function and of any code modules it declares, the config subtree
+it declares, the content hash of any input files and the keys of its
+upstream stages. Nothing in the key depends on where the checkout lives.
+Keys therefore chain through the DAG and are known before anything
+executes: a stage whose key is already on disk is skipped without loading
+its inputs, and a stage only reruns when something it actually depends on
+changed.
+
+Independent stages run in separate worker processes, since the stages are
+CPU-bound pandas/Python work that threads would serialize on the GIL.
+Stage functions, their inputs and their outputs must therefore be
+picklable (module-level functions, not lambdas or closures).
+
+A stage that raises is reported as failed and the stages downstream of it
+as skipped; independent branches still run.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.logger import logger
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline step.
+
+    Attributes:
+        name: Unique stage name; also the keyword its output is passed
+            under to downstream stages.
+        func: Called as func(config, **upstream_outputs); returns a
+            picklable output.
+        deps: Names of upstream stages.
+        config_keys: Dotted config paths this stage reads (e.g. 'signals',
+            'ml.horizon'). Only these enter the cache key.
+        input_files: Files whose contents enter the cache key.
+        code_modules: Modules or packages (e.g. 'src.ml.train',
+            'src.signals') the stage calls into. Their source enters the
+            cache key along with the source of func, so editing them
+            invalidates cached outputs.
+        version: Extra salt for changes the source does not show (e.g. an
+            upgraded third-party library).
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: List[str] = field(default_factory=list)
+    config_keys: List[str] = field(default_factory=list)
+    input_files: List[str] = field(default_factory=list)
+    code_modules: List[str] = field(default_factory=list)
+    version: str = '1'
+
+
+@dataclass
+class StageResult:
+    """
+    Outcome of one stage in a pipeline run.
+
+    status is 'hit' (served from cache), 'ran', 'failed' (error holds the
+    exception) or 'skipped' (an upstream stage failed).
+    """
+    name: str
+    key: str
+    cache_hit: bool
+    duration_s: float
+    status: str = 'ran'
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('hit', 'ran')
+
+
+def _config_subtree(config: Dict[str, Any], dotted: str) -> Any:
+    node: Any = config
+    for part in dotted.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            raise KeyError(f"Config path '{dotted}' not found")
+        node = node[part]
+    return node
+
+
+def _module_sources(module: str) -> List[Tuple[str, Path]]:
+    """
+    (label, file) for a module or every .py file of a package. Labels are
+    the module name plus the path inside the package, so they do not
+    depend on where the checkout lives.
+    """
+    spec = importlib.util.find_spec(module)
+    if spec is None:
+        raise KeyError(f"Code module '{module}' not found")
+    if spec.submodule_search_locations:
+        return sorted(
+            (f"{module}/{p.relative_to(loc).as_posix()}", p)
+            for loc in spec.submodule_search_locations
+            for p in Path(loc).rglob('*.py')
+        )
+    if spec.origin is None or not spec.origin.endswith('.py'):
+        raise KeyError(f"Code module '{module}' has no Python source")
+    return [(module, Path(spec.origin))]
+
+
+def _code_digest(func: Callable[..., Any], modules: Iterable[str]) -> str:
+    """
+    SHA-256 over the source of func itself and of the given
+    modules/packages. Functions whose source is unavailable (defined
+    interactively) contribute their bytecode instead.
+    """
+    h = hashlib.sha256()
+    try:
+        h.update(inspect.getsource(func).encode('utf-8'))
+    except (OSError, TypeError):
+        code = getattr(func, '__code__', None)
+        h.update(code.co_code if code is not None else type(func).__qualname__.encode('utf-8'))
+    sources = {label: path for module in modules for label, path in _module_sources(module)}
+    for label in sorted(sources):
+        h.update(label.encode('utf-8'))
+        h.update(sources[label].read_bytes())
+    return h.hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StageCache:
+    """Pickle-per-key store under cache_dir/<stage>/<key>.pkl."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.root = Path(cache_dir)
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.pkl"
+
+    def has(self, stage: str, key: str) -> bool:
+        return self.path(stage, key).exists()
+
+    def load(self, stage: str, key: str) -> Any:
+        with open(self.path(stage, key), 'rb') as f:
+            return pickle.load(f)
+
+    def store(self, stage: str, key: str, value: Any) -> None:
+        """Writes atomically so an interrupted run never leaves a torn entry."""
+        target = self.path(stage, key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+def _execute_stage(
+    func: Callable[..., Any], config: Dict[str, Any], inputs: Dict[str, Any]
+) -> Tuple[Any, float]:
+    """Runs one stage in a worker process; the parent stores the output."""
+    t0 = time.perf_counter()
+    output = func(config, **inputs)
+    return output, time.perf_counter() - t0
+
+
+class Pipeline:
+    """
+    Executes stages in dependency order, in parallel where the DAG allows.
+
+    Args:
+        stages: Stage definitions; dependencies must refer to names in
+            this list and form no cycles.
+        config: Full config dict (see load_config).
+        cache_dir: Root of the on-disk stage cache.
+        max_workers: Process pool size for independent stages.
+
+    Raises:
+        ValueError: On duplicate names, unknown dependencies or cycles.
+    """
+    def __init__(
+        self,
+        stages: List[Stage],
+        config: Dict[str, Any],
+        cache_dir: str = '.pipeline_cache',
+        max_workers: int = 4,
+    ) -> None:
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: '{stage.name}'")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            unknown = [d for d in stage.deps if d not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}")
+
+        self.config = config
+        self.cache = StageCache(cache_dir)
+        self.max_workers = max_workers
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            state[name] = 1
+            for dep in self.stages[name].deps:
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def compute_keys(self) -> Dict[str, str]:
+        """Returns the cache key of every stage without running anything."""
+        keys: Dict[str, str] = {}
+        for name in self.order:
+            stage = self.stages[name]
+            payload = {
+                'stage': name,
+                'version': stage.version,
+                'code': _code_digest(stage.func, stage.code_modules),
+                'config': {k: _config_subtree(self.config, k) for k in stage.config_keys},
+                'files': [_file_digest(p) for p in stage.input_files],
+                'deps': {d: keys[d] for d in stage.deps},
+            }
+            blob = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+            keys[name] = hashlib.sha256(blob).hexdigest()
+        return keys
+
+    def run(
+        self, targets: Optional[Iterable[str]] = None, force: Iterable[str] = ()
+    ) -> Dict[str, StageResult]:
+        """
+        Runs the pipeline (or the sub-DAG needed for targets).
+
+        Args:
+            targets: Stage names to produce; defaults to all stages.
+            force: Stage names to recompute even if cached.
+
+        Returns:
+            StageResult per needed stage, in topological order. Stages that
+            raised are 'failed' and their dependents 'skipped'; check
+            StageResult.ok rather than catching exceptions.
+        """
+        keys = self.compute_keys()
+        forced = set(force)
+        needed = self._closure(targets)
+
+        results: Dict[str, StageResult] = {}
+        outputs: Dict[str, Any] = {}
+        to_run: List[str] = []
+        for name in self.order:
+            if name not in needed:
+                continue
+            if name not in forced and self.cache.has(name, keys[name]):
+                results[name] = StageResult(name, keys[name], True, 0.0, status='hit')
+                logger.info(f"[pipeline] {name}: cache hit ({keys[name][:12]})")
+            else:
+                to_run.append(name)
+
+        pending = set(to_run)
+        running: Dict[Future, str] = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in [n for n in to_run if n in pending]:
+                    failed = [d for d in self.stages[name].deps if d in results and not results[d].ok]
+                    if failed:
+                        pending.discard(name)
+                        results[name] = StageResult(
+                            name, keys[name], False, 0.0, status='skipped',
+                            error=f"upstream stage failed: {', '.join(failed)}",
+                        )
+                        logger.warning(f"[pipeline] {name}: skipped ({results[name].error})")
+                ready = [
+                    n for n in to_run
+                    if n in pending and all(d in results for d in self.stages[n].deps)
+                ]
+                for name in ready:
+                    pending.discard(name)
+                    inputs = {d: self._output(d, keys[d], outputs) for d in self.stages[name].deps}
+                    logger.info(f"[pipeline] {name}: running ({keys[name][:12]})")
+                    running[pool.submit(_execute_stage, self.stages[name].func, self.config, inputs)] = name
+
+                if not running:
+                    if pending:
+                        raise RuntimeError(f"Pipeline stalled with pending stages: {sorted(pending)}")
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        output, duration = fut.result()
+                        self.cache.store(name, keys[name], output)
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                        results[name] = StageResult(
+                            name, keys[name], False, 0.0, status='failed', error=error
+                        )
+                        logger.error(f"[pipeline] {name}: failed ({error})")
+                        continue
+                    outputs[name] = output
+                    results[name] = StageResult(name, keys[name], False, duration)
+                    logger.info(f"[pipeline] {name}: done in {duration:.2f}s")
+
+        return {n: results[n] for n in self.order if n in results}
+
+    def load(self, name: str) -> Any:
+        """Loads the cached output of a stage for the current config."""
+        key = self.compute_keys()[name]
+        if not self.cache.has(name, key):
+            raise KeyError(f"No cached output for stage '{name}' ({key[:12]})")
+        return self.cache.load(name, key)
+
+    def _closure(self, targets: Optional[Iterable[str]]) -> set:
+        if targets is None:
+            return set(self.stages)
+        needed: set = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage: '{name}'")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return needed
+
+    def _output(self, name: str, key: str, outputs: Dict[str, Any]) -> Any:
+        if name not in outputs:
+            outputs[name] = self.cache.load(name, key)
+        return outputs[name]
@@ -0,0 +1,89 @@
+"""
+Pipeline stages module.
+Stage functions and the research DAG run by scripts/run_full_pipeline.py.
+
+Kept out of the CLI script so that editing the script does not invalidate
+cached stage outputs: each stage's key covers only its own function source
+and the modules it declares in code_modules. Heavy imports happen inside
+the stage functions.
+"""
+
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from src.core.pipeline import Stage
+
+RISK_KEYS = [
+    'initial_capital', 'trading_fee', 'risk_per_trade_pct', 'atr_multiplier',
+    'max_drawdown', 'max_daily_loss', 'reward_risk_ratio', 'timeframe',
+]
+
+
+def fetch_stage(config: Dict[str, Any]) -> pd.DataFrame:
+    from src.data.feed import load_ohlcv_csv
+    return load_ohlcv_csv(config['_pipeline']['data_path'])
+
+
+def features_stage(config: Dict[str, Any], fetch: pd.DataFrame) -> pd.DataFrame:
+    from src.ml.features import build_features
+    return build_features(fetch, config)
+
+
+def labels_stage(config: Dict[str, Any], fetch: pd.DataFrame) -> pd.Series:
+    from src.ml.labeling import build_labels
+    return build_labels(fetch, config)
+
+
+def train_stage(
+    config: Dict[str, Any], features: pd.DataFrame, labels: pd.Series
+) -> Dict[str, Any]:
+    from src.ml.train import train_model
+    return train_model(features, labels, config)
+
+
+def backtest_stage(config: Dict[str, Any], fetch: pd.DataFrame) -> Dict[str, Any]:
+    from src.backtest.engine import BacktestEngine
+    from src.data.resampler import BarResampler
+    from src.execution.paper_broker import PaperBroker
+    from src.risk.risk_manager import RiskManager
+    from src.signals.rule_based import RuleBasedSignal
+    from src.utils.metrics import calculate_metrics
+
+    signal = RuleBasedSignal(config)
+    engine = BacktestEngine(
+        data=fetch,
+        broker=PaperBroker(config['initial_capital'], config['trading_fee']),
+        risk_manager=RiskManager(config),
+        signal_generator=signal,
+        trading_fee=config['trading_fee'],
+        resampler=BarResampler(config['timeframe']) if signal.timeframes else None,
+    )
+    equity = engine.run()
+    trades = pd.DataFrame(engine.trades)
+    return {
+        'equity': equity,
+        'trades': trades,
+        'metrics': calculate_metrics(equity['equity'], trades, timeframe=config['timeframe']),
+    }
+
+
+def build_stages(data_path: str) -> List[Stage]:
+    """The research DAG over the OHLCV file at data_path."""
+    return [
+        Stage('fetch', fetch_stage,
+              config_keys=['base_asset', 'quote_asset', 'timeframe'],
+              input_files=[data_path], code_modules=['src.data.feed']),
+        Stage('features', features_stage, deps=['fetch'], config_keys=['signals'],
+              code_modules=['src.ml.features', 'src.features']),
+        Stage('labels', labels_stage, deps=['fetch'],
+              config_keys=['ml.horizon', 'atr_multiplier', 'reward_risk_ratio'],
+              code_modules=['src.ml.labeling', 'src.features']),
+        Stage('train', train_stage, deps=['features', 'labels'], config_keys=['ml'],
+              code_modules=['src.ml.train']),
+        Stage('backtest', backtest_stage, deps=['fetch'],
+              config_keys=['signals'] + RISK_KEYS,
+              code_modules=['src.backtest.engine', 'src.data', 'src.execution.paper_broker',
+                            'src.features', 'src.risk', 'src.signals', 'src.utils.metrics',
+                            'src.utils.profiling']),
+    ]
@@ -2,4 +2,105 @@
 Data feed module.
 Handles real-time and historical data ingestion.
 """
-pass
+
+import time
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def load_ohlcv_csv(path: str) -> pd.DataFrame:
+    """
+    Loads an OHLCV CSV into a DataFrame indexed by timestamp.
+
+    Column names are normalised to lower case; the first of
+    'timestamp' / 'date' / 'datetime' found becomes the index.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        KeyError: If the time column or an OHLCV column is missing.
+    """
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Data file not found: {path}")
+
+    df = pd.read_csv(csv_path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+
+    time_col = next(
+        (c for c in ('timestamp', 'date', 'datetime') if c in df.columns), None
+    )
+    if time_col is None:
+        raise KeyError(
+            f"No time column in {path}; expected one of timestamp/date/datetime"
+        )
+
+    missing = [c for c in OHLCV_COLUMNS if c not in df.columns]
+    if missing:
+        raise KeyError(f"Missing OHLCV columns in {path}: {missing}")
+
+    df[time_col] = pd.to_datetime(df[time_col])
+    df = df.set_index(time_col).sort_index()
+    df.index.name = 'timestamp'
+    return df[OHLCV_COLUMNS].astype(float)
+
+
+class ReplayFeed:
+    """
+    Replays an OHLCV DataFrame as a stream of (timestamp, bar) pairs.
+    Used for paper sessions and deterministic live-loop testing.
+    A positive `interval` sleeps that many seconds between bars.
+    """
+    def __init__(self, data: pd.DataFrame, start: int = 0, interval: float = 0.0) -> None:
+        self.data = data
+        self.start = start
+        self.interval = interval
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict[str, float]]]:
+        frame = self.data[OHLCV_COLUMNS].iloc[self.start:]
+        for row in frame.itertuples():
+            if self.interval > 0:
+                time.sleep(self.interval)
+            yield row.Index, {
+                'open': row.open, 'high': row.high, 'low': row.low,
+                'close': row.close, 'volume': row.volume,
+            }
+
+
+class CCXTFeed:
+    """
+    Polls an exchange through ccxt and yields each newly closed bar.
+
+    ccxt is imported on construction, so sessions that never use this
+    feed do not pay for loading the exchange SDK.
+    """
+    def __init__(
+        self,
+        exchange_id: str,
+        symbol: str,
+        timeframe: str,
+        poll_interval: float = 5.0,
+    ) -> None:
+        import ccxt
+
+        self.exchange = getattr(ccxt, exchange_id)({'enableRateLimit': True})
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.poll_interval = poll_interval
+        self._last_ts: Optional[int] = None
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict[str, float]]]:
+        while True:
+            # The final candle is still forming; only emit closed ones.
+            candles = self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=3)[:-1]
+            for ts, o, h, lo, c, v in candles:
+                if self._last_ts is not None and ts <= self._last_ts:
+                    continue
+                self._last_ts = ts
+                yield pd.Timestamp(ts, unit='ms'), {
+                    'open': float(o), 'high': float(h), 'low': float(lo),
+                    'close': float(c), 'volume': float(v),
+                }
+            time.sleep(self.poll_interval)
@@ -0,0 +1,427 @@
+"""
+Bar resampler module.
+Aggregates base bars into higher-timeframe bars, incrementally or in bulk.
+
+Buckets are aligned to the epoch (weekly buckets to Monday 00:00), and
+bars are labelled by their open time. A higher-timeframe bar counts as
+closed once the base bar in its last slot has arrived, or, if that slot
+is missing, once the first bar of a later bucket arrives. Only closed
+bars are ever exposed, so views built from the resampler cannot see
+into the future. The streaming and vectorized paths use the same
+bucketing and the same summation order, and give identical bars.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.feed import OHLCV_COLUMNS
+
+Bar = Dict[str, float]
+
+TIMEFRAME_SECONDS: Dict[str, int] = {
+    '1m':  60,
+    '3m':  3 * 60,
+    '5m':  5 * 60,
+    '15m': 15 * 60,
+    '30m': 30 * 60,
+    '1h':  3600,
+    '2h':  2 * 3600,
+    '4h':  4 * 3600,
+    '6h':  6 * 3600,
+    '12h': 12 * 3600,
+    '1d':  86400,
+    '1w':  7 * 86400,
+}
+
+_NS = 1_000_000_000
+# The epoch is a Thursday; weekly bars open on Monday like exchange klines.
+_WEEK_ORIGIN_NS = 4 * 86400 * _NS
+
+
+def timeframe_to_ns(timeframe: str) -> int:
+    """
+    Converts a timeframe string (e.g. '1m', '4h') to nanoseconds.
+
+    Raises:
+        ValueError: If timeframe is not recognized.
+    """
+    tf = timeframe.strip().lower()
+    if tf not in TIMEFRAME_SECONDS:
+        raise ValueError(
+            f"Unknown timeframe '{timeframe}'. "
+            f"Supported: {list(TIMEFRAME_SECONDS.keys())}"
+        )
+    return TIMEFRAME_SECONDS[tf] * _NS
+
+
+def _origin_ns(timeframe: str) -> int:
+    return _WEEK_ORIGIN_NS if timeframe.strip().lower() == '1w' else 0
+
+
+def _check_multiple(timeframe: str, base_timeframe: str) -> None:
+    if timeframe_to_ns(timeframe) % timeframe_to_ns(base_timeframe):
+        raise ValueError(
+            f"Timeframe '{timeframe}' is not a multiple of base timeframe '{base_timeframe}'"
+        )
+
+
+class _Aggregate:
+    """Running aggregation state for one timeframe."""
+
+    __slots__ = (
+        'tf_ns', 'origin', 'bucket', 'open', 'high', 'low', 'close', 'volume',
+        'last_closed', 'closed', 'count',
+    )
+
+    def __init__(self, timeframe: str, maxlen: int) -> None:
+        self.tf_ns = timeframe_to_ns(timeframe)
+        self.origin = _origin_ns(timeframe)
+        self.bucket: Optional[int] = None
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+        # Bucket id of the most recently closed (or discarded) bucket.
+        self.last_closed: Optional[int] = None
+        self.closed: Deque[Tuple[int, float, float, float, float, float]] = deque(maxlen=maxlen)
+        self.count = 0
+
+    def _emit(self) -> None:
+        start = self.bucket * self.tf_ns + self.origin
+        self.closed.append((start, self.open, self.high, self.low, self.close, self.volume))
+        self.count += 1
+        self.last_closed = self.bucket
+        self.bucket = None
+
+    def update(self, ts_ns: int, base_ns: int, o: float, h: float, low: float, c: float, v: float) -> bool:
+        """Adds one base bar; returns True if a bar closed."""
+        bucket = (ts_ns - self.origin) // self.tf_ns
+        closed = False
+        if self.bucket is not None and bucket != self.bucket:
+            if bucket < self.bucket:
+                raise ValueError("Bars must arrive in time order")
+            self._emit()
+            closed = True
+        if self.last_closed is not None and bucket <= self.last_closed:
+            if bucket < self.last_closed:
+                raise ValueError("Bars must arrive in time order")
+            # The rest of a bucket that was discarded or already closed.
+            return closed
+
+        if self.bucket is None:
+            self.bucket = bucket
+            self.open, self.high, self.low, self.close, self.volume = o, h, low, c, v
+        else:
+            if h > self.high:
+                self.high = h
+            if low < self.low:
+                self.low = low
+            self.close = c
+            self.volume += v
+
+        if ts_ns + base_ns >= (bucket + 1) * self.tf_ns + self.origin:
+            self._emit()
+            closed = True
+        return closed
+
+
+class BarResampler:
+    """
+    Maintains higher-timeframe bars from a stream of base bars.
+
+    update() costs O(1) per base bar and timeframe. One instance is meant
+    to be owned by the engine or live loop, fed each base bar once, and
+    shared by every signal through SignalBase.bind_resampler(); signals
+    read closed bars with last(), bars_since() or frame().
+
+    Args:
+        base_timeframe: Timeframe of the bars passed to update().
+        timeframes: Higher timeframes to maintain; more can be added with
+            require().
+        maxlen: Closed bars retained per timeframe.
+    """
+    def __init__(
+        self,
+        base_timeframe: str = '1m',
+        timeframes: Iterable[str] = (),
+        maxlen: int = 1000,
+    ) -> None:
+        if maxlen <= 0:
+            raise ValueError(f"maxlen must be positive, got {maxlen}")
+        self.base_timeframe = base_timeframe
+        self.base_ns = timeframe_to_ns(base_timeframe)
+        self.maxlen = maxlen
+        self._aggs: Dict[str, _Aggregate] = {}
+        self._tz: Optional[str] = None
+        self._last_ns: Optional[int] = None
+        self.require(timeframes)
+
+    @property
+    def timeframes(self) -> List[str]:
+        return list(self._aggs)
+
+    def require(self, timeframes: Iterable[str]) -> None:
+        """
+        Adds timeframes that are not maintained yet. A timeframe added
+        after bars have been seen starts with the next full bucket; the
+        bucket in progress is discarded, because it would be incomplete.
+        """
+        for tf in timeframes:
+            if tf in self._aggs:
+                continue
+            _check_multiple(tf, self.base_timeframe)
+            agg = _Aggregate(tf, self.maxlen)
+            if self._last_ns is not None:
+                agg.last_closed = (self._last_ns - agg.origin) // agg.tf_ns
+            self._aggs[tf] = agg
+
+    def update(self, timestamp: Any, bar: Bar) -> List[str]:
+        """
+        Consumes the next base bar, labelled by its open time.
+
+        Returns:
+            Timeframes that closed a bar on this update.
+        """
+        ts = pd.Timestamp(timestamp)
+        if self._last_ns is None:
+            self._tz = None if ts.tz is None else str(ts.tz)
+        ts_ns = ts.value
+        self._last_ns = ts_ns
+
+        o = float(bar['open'])
+        h = float(bar['high'])
+        low = float(bar['low'])
+        c = float(bar['close'])
+        v = float(bar['volume'])
+        base_ns = self.base_ns
+        return [
+            tf for tf, agg in self._aggs.items()
+            if agg.update(ts_ns, base_ns, o, h, low, c, v)
+        ]
+
+    # ------------------------------------------------------------------
+    # Views (closed bars only)
+    # ------------------------------------------------------------------
+
+    def _agg(self, timeframe: str) -> _Aggregate:
+        try:
+            return self._aggs[timeframe]
+        except KeyError:
+            raise KeyError(
+                f"Timeframe '{timeframe}' is not maintained; call require(['{timeframe}'])"
+            ) from None
+
+    def _timestamp(self, ts_ns: int) -> pd.Timestamp:
+        ts = pd.Timestamp(ts_ns)
+        return ts if self._tz is None else ts.tz_localize('UTC').tz_convert(self._tz)
+
+    def _bar(self, row: Tuple[int, float, float, float, float, float]) -> Tuple[pd.Timestamp, Bar]:
+        return self._timestamp(row[0]), dict(zip(OHLCV_COLUMNS, row[1:]))
+
+    def closed_count(self, timeframe: str) -> int:
+        """Number of bars closed so far (including ones no longer retained)."""
+        return self._agg(timeframe).count
+
+    def last(self, timeframe: str) -> Optional[Tuple[pd.Timestamp, Bar]]:
+        """Most recent closed bar, or None."""
+        closed = self._agg(timeframe).closed
+        return self._bar(closed[-1]) if closed else None
+
+    def bars_since(self, timeframe: str, count: int) -> List[Tuple[pd.Timestamp, Bar]]:
+        """
+        Closed bars after the first `count`, oldest first. Lets a consumer
+        that remembers closed_count() pick up only what is new. Bars that
+        have already fallen out of the retained window are not returned.
+        """
+        agg = self._agg(timeframe)
+        new = agg.count - count
+        if new <= 0:
+            return []
+        closed = agg.closed
+        new = min(new, len(closed))
+        return [self._bar(closed[i]) for i in range(len(closed) - new, len(closed))]
+
+    def frame(self, timeframe: str, n: Optional[int] = None) -> pd.DataFrame:
+        """Last n (default: all retained) closed bars as an OHLCV DataFrame."""
+        closed = list(self._agg(timeframe).closed)
+        if n is not None:
+            closed = closed[-n:] if n > 0 else []
+        index = pd.DatetimeIndex([self._timestamp(r[0]) for r in closed], name='timestamp')
+        return pd.DataFrame([r[1:] for r in closed], index=index, columns=OHLCV_COLUMNS)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def get_state(self) -> Dict[str, Any]:
+        """JSON-serialisable state, including retained closed bars."""
+        return {
+            'base_timeframe': self.base_timeframe,
+            'last_ns': self._last_ns,
+            'tz': self._tz,
+            'timeframes': {
+                tf: {
+                    'bucket': agg.bucket,
+                    'partial': (
+                        None if agg.bucket is None
+                        else [agg.open, agg.high, agg.low, agg.close, agg.volume]
+                    ),
+                    'last_closed': agg.last_closed,
+                    'count': agg.count,
+                    'closed': [list(r) for r in agg.closed],
+                }
+                for tf, agg in self._aggs.items()
+            },
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restores state produced by get_state()."""
+        if state['base_timeframe'] != self.base_timeframe:
+            raise ValueError(
+                f"State was built from '{state['base_timeframe']}' bars, "
+                f"not '{self.base_timeframe}'"
+            )
+        self._last_ns = state['last_ns']
+        self._tz = state['tz']
+        self._aggs = {}
+        for tf, s in state['timeframes'].items():
+            agg = _Aggregate(tf, self.maxlen)
+            agg.bucket = s['bucket']
+            if s['partial'] is not None:
+                agg.open, agg.high, agg.low, agg.close, agg.volume = s['partial']
+            agg.last_closed = s['last_closed']
+            agg.count = s['count']
+            agg.closed.extend(tuple(r) for r in s['closed'])
+            self._aggs[tf] = agg
+
+    @classmethod
+    def from_frame(
+        cls,
+        data: pd.DataFrame,
+        timeframes: Iterable[str],
+        base_timeframe: str = '1m',
+        maxlen: int = 1000,
+    ) -> 'BarResampler':
+        """
+        Builds the resampler state after all of `data` in one vectorized
+        pass; equivalent to calling update() on every row.
+        """
+        resampler = cls(base_timeframe, timeframes, maxlen)
+        if data.empty:
+            return resampler
+        ts_ns = _index_ns(data.index)
+        tz = getattr(data.index, 'tz', None)
+        resampler._tz = None if tz is None else str(tz)
+        resampler._last_ns = int(ts_ns[-1])
+
+        for tf, agg in resampler._aggs.items():
+            buckets = _aggregate(data, ts_ns, tf, base_timeframe)
+            closed = buckets['available'] >= 0
+            n_closed = int(closed.sum())
+            agg.count = n_closed
+            rows = zip(
+                buckets['start'][closed][-maxlen:].tolist(),
+                *(buckets[c][closed][-maxlen:].tolist() for c in OHLCV_COLUMNS),
+            )
+            agg.closed.extend(rows)
+            if n_closed:
+                agg.last_closed = int(buckets['bucket'][closed][-1])
+            if n_closed < len(buckets['bucket']):
+                # Only the final bucket can still be open.
+                agg.bucket = int(buckets['bucket'][-1])
+                agg.open, agg.high, agg.low, agg.close, agg.volume = (
+                    float(buckets[c][-1]) for c in OHLCV_COLUMNS
+                )
+        return resampler
+
+
+# ----------------------------------------------------------------------
+# Vectorized full-history pass
+# ----------------------------------------------------------------------
+
+def _index_ns(index: pd.Index) -> np.ndarray:
+    if not isinstance(index, pd.DatetimeIndex):
+        raise TypeError("Resampling requires a DatetimeIndex")
+    if not index.is_monotonic_increasing:
+        raise ValueError("Bars must be in time order")
+    return index.asi8
+
+
+def _segment_sum(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Left-to-right sum of each segment, in the same order as update()."""
+    acc = values[starts].copy()
+    for k in range(1, int(lengths.max())):
+        idx = np.flatnonzero(lengths > k)
+        acc[idx] += values[starts[idx] + k]
+    return acc
+
+
+def _aggregate(
+    data: pd.DataFrame, ts_ns: np.ndarray, timeframe: str, base_timeframe: str
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregates every bucket in `data`, open or closed. 'available' holds
+    the row position at which each bucket closes, or -1 if it is still
+    open at the end of the data.
+    """
+    _check_multiple(timeframe, base_timeframe)
+    tf_ns = timeframe_to_ns(timeframe)
+    origin = _origin_ns(timeframe)
+    base_ns = timeframe_to_ns(base_timeframe)
+
+    bucket = (ts_ns - origin) // tf_ns
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)]
+    ids = bucket[starts]
+
+    cols = {c: data[c].to_numpy(dtype=float) for c in OHLCV_COLUMNS}
+    complete = ts_ns[ends - 1] + base_ns >= (ids + 1) * tf_ns + origin
+    available = np.where(complete, ends - 1, ends)
+    available[available >= len(bucket)] = -1
+
+    return {
+        'bucket': ids,
+        'start': ids * tf_ns + origin,
+        'available': available,
+        'open': cols['open'][starts],
+        'high': np.maximum.reduceat(cols['high'], starts),
+        'low': np.minimum.reduceat(cols['low'], starts),
+        'close': cols['close'][ends - 1],
+        'volume': _segment_sum(cols['volume'], starts, ends - starts),
+    }
+
+
+def resample_ohlcv(data: pd.DataFrame, timeframe: str, base_timeframe: str = '1m') -> pd.DataFrame:
+    """
+    Aggregates base bars to `timeframe`, labelled by open time. The last
+    bar is included even if its bucket is not complete yet.
+    """
+    ts_ns = _index_ns(data.index)
+    if not len(ts_ns):
+        return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='timestamp'))
+    buckets = _aggregate(data, ts_ns, timeframe, base_timeframe)
+    index = pd.DatetimeIndex(buckets['start'], name='timestamp')
+    if data.index.tz is not None:
+        index = index.tz_localize('UTC').tz_convert(data.index.tz)
+    return pd.DataFrame({c: buckets[c] for c in OHLCV_COLUMNS}, index=index)
+
+
+def align_to_base(data: pd.DataFrame, timeframe: str, base_timeframe: str = '1m') -> pd.DataFrame:
+    """
+    Higher-timeframe bars aligned to the rows of `data` without lookahead:
+    each row holds the latest `timeframe` bar that was closed once that
+    row's bar had closed, i.e. what BarResampler.last() returns after
+    update() on that row. Columns are suffixed with the timeframe
+    (close_4h, ...); rows before the first closed bar are NaN.
+    """
+    ts_ns = _index_ns(data.index)
+    columns = [f"{c}_{timeframe}" for c in OHLCV_COLUMNS]
+    out = np.full((len(ts_ns), len(OHLCV_COLUMNS)), np.nan)
+    if len(ts_ns):
+        buckets = _aggregate(data, ts_ns, timeframe, base_timeframe)
+        closed = buckets['available'] >= 0
+        # Several buckets can close on the same row; the latest wins.
+        rows, keep = np.unique(buckets['available'][closed][::-1], return_index=True)
+        values = np.column_stack([buckets[c][closed][::-1][keep] for c in OHLCV_COLUMNS])
+        out[rows] = values
+    return pd.DataFrame(out, index=data.index, columns=columns).ffill()
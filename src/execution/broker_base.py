@@ -23,3 +23,19 @@ class BrokerBase(ABC):
     def get_positions(self) -> Dict[str, float]:
         """Returns current positions."""
         pass
+
+    def get_params(self) -> Dict[str, Any]:
+        """Returns the execution model (fees, slippage) fills depend on. Empty by default."""
+        return {}
+
+    def get_state(self) -> Dict[str, Any]:
+        """Returns broker-side state (cash, positions) as JSON-serialisable data."""
+        raise NotImplementedError(f"{type(self).__name__} does not support state snapshots")
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restores state produced by get_state()."""
+        raise NotImplementedError(f"{type(self).__name__} does not support state snapshots")
+
+    def close(self) -> None:
+        """Releases connections and worker threads. No-op by default."""
+        pass
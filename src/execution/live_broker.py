@@ -0,0 +1,457 @@
+"""
+Live broker module.
+Executes orders against a Binance-style REST API.
+
+Requests go through a small pool of keep-alive HTTP(S) connections and a
+token bucket that tracks the exchange's request-weight budget (and is
+re-synchronised from the X-MBX-USED-WEIGHT-1M response header). Orders
+can be submitted asynchronously. Balance and positions come from a local
+cache that is updated from fill reports (debiting each commission from
+the asset it was charged in) and refreshed from the exchange at most once
+per `refresh_interval`, with concurrent callers sharing a single
+in-flight refresh; a failed refresh keeps serving the cached snapshot and
+backs off. A request is only resent on a new connection
+when it provably never reached the exchange, so orders are never
+duplicated by a timeout.
+"""
+
+import hashlib
+import hmac
+import http.client
+import json
+import queue
+import select
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from src.execution.broker_base import BrokerBase
+from src.utils.logger import logger
+
+# Request weights (Binance spot API v3).
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+    '/api/v3/ping': 1,
+    '/api/v3/order': 1,
+    '/api/v3/account': 10,
+}
+
+# Methods that may be resent after the connection drops mid-response.
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD'})
+
+# Upper bound on the delay between failed account refreshes, in seconds.
+MAX_REFRESH_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        capacity: Maximum burst, in weight units.
+        refill_rate: Weight units restored per second.
+    """
+    def __init__(self, capacity: float, refill_rate: float) -> None:
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_rate)
+        self._last = now
+
+    def try_acquire(self, weight: float = 1.0) -> float:
+        """Takes `weight` tokens if available; otherwise returns seconds to wait."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= weight:
+                self._tokens -= weight
+                return 0.0
+            return (weight - self._tokens) / self.refill_rate
+
+    def acquire(self, weight: float = 1.0) -> float:
+        """Blocks until `weight` tokens are taken. Returns total time waited."""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(weight)
+            if delay == 0.0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def sync_remaining(self, remaining: float) -> None:
+        """Lowers the local balance to what the exchange says is left."""
+        with self._lock:
+            self._refill()
+            self._tokens = max(0.0, min(self._tokens, remaining))
+
+
+class _ConnectionPool:
+    """Bounded pool of persistent HTTP(S) connections to one host."""
+
+    def __init__(self, base_url: str, size: int, timeout: float) -> None:
+        parts = urlsplit(base_url)
+        self._cls = (
+            http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        )
+        self._host = parts.hostname
+        self._port = parts.port
+        self._timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._opened_lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._opened_lock:
+            self.opened += 1
+        return self._cls(self._host, self._port, timeout=self._timeout)
+
+    @staticmethod
+    def _dropped(conn: http.client.HTTPConnection) -> bool:
+        """True if an idle socket was closed by the server (readable at EOF)."""
+        if conn.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), True
+            if not self._dropped(conn):
+                return conn, False
+            conn.close()
+
+    @staticmethod
+    def _retryable(method: str, sent: bool, exc: BaseException) -> bool:
+        """
+        Whether a failed request on a reused connection may be resent.
+
+        A timeout never qualifies: the server may already be acting on the
+        request. Otherwise a failure while sending means the request never
+        left complete; a connection dropped before the response only
+        qualifies for idempotent methods.
+        """
+        if isinstance(exc, TimeoutError):
+            return False
+        if not sent:
+            return True
+        return method in IDEMPOTENT_METHODS and isinstance(
+            exc, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+        )
+
+    def request(
+        self, method: str, path: str, headers: Dict[str, str], body: Optional[str] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        with self._slots:
+            conn, fresh = self._checkout()
+
+            for attempt in (0, 1):
+                sent = False
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    sent = True
+                    resp = conn.getresponse()
+                    data = resp.read()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    conn.close()
+                    # A pooled keep-alive socket may have been closed by the
+                    # server; retry once on a new connection, but only when
+                    # resending cannot duplicate the request.
+                    if attempt == 1 or fresh or not self._retryable(method, sent, e):
+                        raise
+                    conn, fresh = self._connect(), True
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class LiveBroker(BrokerBase):
+    """
+    Rate-limit-aware broker for a Binance-compatible spot REST API.
+
+    Args:
+        base_url: API root, e.g. https://api.binance.com.
+        api_key: API key (sent as X-MBX-APIKEY).
+        api_secret: Secret for HMAC-SHA256 request signing.
+        symbols: Traded symbols in 'BASE/QUOTE' form; all must share a quote.
+        pool_size: Persistent connections and async order workers.
+        weight_limit: Request weight allowed per `weight_window` seconds.
+        weight_window: Length of the exchange's weight window.
+        refresh_interval: Max age in seconds of cached balance/positions.
+        max_retries: Retries after a 429/418 rate-limit response.
+        timeout: Socket timeout per request.
+    """
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        api_secret: str,
+        symbols: List[str],
+        pool_size: int = 4,
+        weight_limit: int = 1200,
+        weight_window: float = 60.0,
+        refresh_interval: float = 1.0,
+        max_retries: int = 3,
+        timeout: float = 10.0,
+    ) -> None:
+        quotes = {s.split('/')[1] for s in symbols}
+        if len(quotes) != 1:
+            raise ValueError(f"All symbols must share one quote asset, got {sorted(quotes)}")
+
+        self.api_key = api_key
+        self._secret = api_secret.encode('utf-8')
+        self.symbols = list(symbols)
+        self.quote_asset = quotes.pop()
+        self.refresh_interval = refresh_interval
+        self.max_retries = max_retries
+
+        self._pool = _ConnectionPool(base_url, pool_size, timeout)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='live-broker')
+        self.bucket = TokenBucket(weight_limit, weight_limit / weight_window)
+
+        self._cache_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._capital = 0.0
+        self._positions: Dict[str, float] = {s: 0.0 for s in self.symbols}
+        self._refreshed_at = float('-inf')
+        self._retry_at = float('-inf')
+        self._refresh_failures = 0
+
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            'requests': 0, 'rate_limited': 0, 'refreshes': 0, 'refresh_errors': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _exchange_symbol(symbol: str) -> str:
+        return symbol.replace('/', '')
+
+    def _request(
+        self, method: str, path: str, params: Optional[Dict[str, Any]] = None, signed: bool = False
+    ) -> Tuple[int, Any]:
+        weight = ENDPOINT_WEIGHTS.get(path, 1)
+        attempt = 0
+        while True:
+            self.bucket.acquire(weight)
+            query = dict(params or {})
+            headers = {'X-MBX-APIKEY': self.api_key}
+            if signed:
+                query['timestamp'] = int(time.time() * 1000)
+                payload = urlencode(query)
+                sig = hmac.new(self._secret, payload.encode('utf-8'), hashlib.sha256).hexdigest()
+                payload = f"{payload}&signature={sig}"
+            else:
+                payload = urlencode(query)
+
+            if method == 'GET':
+                target, body = (f"{path}?{payload}" if payload else path), None
+            else:
+                target, body = path, payload
+                headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+            status, resp_headers, data = self._pool.request(method, target, headers, body)
+            self._count('requests')
+
+            used = resp_headers.get('x-mbx-used-weight-1m')
+            if used is not None:
+                self.bucket.sync_remaining(self.bucket.capacity - float(used))
+
+            if status in (418, 429):
+                self._count('rate_limited')
+                self.bucket.sync_remaining(0.0)
+                if attempt < self.max_retries:
+                    retry_after = float(resp_headers.get('retry-after', 1.0))
+                    logger.warning(
+                        f"Rate limited on {path} (HTTP {status}); retrying in {retry_after}s"
+                    )
+                    time.sleep(retry_after)
+                    attempt += 1
+                    continue
+            return status, json.loads(data) if data else None
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    # ------------------------------------------------------------------
+    # Account cache
+    # ------------------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Refreshes balance and all positions with one account request.
+        Callers arriving while a refresh is in flight wait for it instead
+        of issuing their own.
+
+        On failure the cached snapshot is kept and further refreshes are
+        held off with exponential backoff (unless forced).
+
+        Returns:
+            True if the cache is fresh after the call.
+        """
+        started = time.monotonic()
+        with self._refresh_lock:
+            if not force and self._refreshed_at >= started - self.refresh_interval:
+                return True
+            if not force and started < self._retry_at:
+                return False
+            try:
+                status, body = self._request('GET', '/api/v3/account', signed=True)
+            except (http.client.HTTPException, OSError) as e:
+                self._refresh_failed(f"Account refresh transport error: {e}")
+                return False
+            if status != 200:
+                self._refresh_failed(f"Account refresh failed (HTTP {status}): {body}")
+                return False
+            balances = {b['asset']: float(b['free']) + float(b['locked']) for b in body['balances']}
+            free = {b['asset']: float(b['free']) for b in body['balances']}
+            with self._cache_lock:
+                self._capital = free.get(self.quote_asset, 0.0)
+                for sym in self.symbols:
+                    self._positions[sym] = balances.get(sym.split('/')[0], 0.0)
+                self._refreshed_at = time.monotonic()
+            self._refresh_failures = 0
+            self._retry_at = float('-inf')
+            self._count('refreshes')
+            return True
+
+    def _refresh_failed(self, message: str) -> None:
+        """Logs a failed refresh and schedules the next attempt. Holds _refresh_lock."""
+        self._refresh_failures += 1
+        delay = min(self.refresh_interval * 2 ** self._refresh_failures, MAX_REFRESH_BACKOFF)
+        self._retry_at = time.monotonic() + delay
+        self._count('refresh_errors')
+        logger.error(f"{message}; serving cached snapshot, next attempt in {delay:.1f}s")
+
+    def _ensure_fresh(self) -> None:
+        now = time.monotonic()
+        if now - self._refreshed_at > self.refresh_interval and now >= self._retry_at:
+            self.refresh()
+
+    def get_balance(self) -> float:
+        self._ensure_fresh()
+        return self._capital
+
+    def get_positions(self) -> Dict[str, float]:
+        self._ensure_fresh()
+        with self._cache_lock:
+            return dict(self._positions)
+
+    def get_state(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {'capital': self._capital, 'positions': dict(self._positions)}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Seeds the cache from a snapshot. The exchange stays the source of
+        truth: the next read triggers a refresh.
+        """
+        with self._cache_lock:
+            self._capital = float(state['capital'])
+            self._positions.update({k: float(v) for k, v in state['positions'].items()})
+            self._refreshed_at = float('-inf')
+            self._retry_at = float('-inf')
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def submit_order_async(
+        self, symbol: str, qty: float, side: str, order_type: str = 'market', price: Optional[float] = None
+    ) -> "Future[Dict[str, Any]]":
+        """Submits an order on the broker's worker pool; returns a Future."""
+        return self._executor.submit(self.submit_order, symbol, qty, side, order_type, price)
+
+    def submit_order(
+        self, symbol: str, qty: float, side: str, order_type: str = 'market', price: Optional[float] = None
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            'symbol': self._exchange_symbol(symbol),
+            'side': side.upper(),
+            'type': order_type.upper(),
+            'quantity': f"{qty:.8f}",
+            'newOrderRespType': 'FULL',
+        }
+        if order_type == 'limit':
+            if price is None:
+                return {"status": "error", "message": "Price required for limit orders"}
+            params['price'] = f"{price:.8f}"
+            params['timeInForce'] = 'GTC'
+
+        try:
+            status, body = self._request('POST', '/api/v3/order', params, signed=True)
+        except (http.client.HTTPException, OSError) as e:
+            logger.error(f"Order transport error for {side} {qty} {symbol}: {e}")
+            return {"status": "error", "message": str(e)}
+
+        if status != 200:
+            reason = body.get('msg', f'HTTP {status}') if isinstance(body, dict) else f'HTTP {status}'
+            logger.warning(f"Order rejected: {side.upper()} {qty} {symbol}: {reason}")
+            return {"status": "rejected", "reason": reason}
+
+        filled_qty = float(body.get('executedQty', 0.0))
+        if body.get('status') != 'FILLED' or filled_qty <= 0:
+            return {"status": body.get('status', 'unknown').lower(), "symbol": symbol, "side": side,
+                    "qty": filled_qty, "order_id": body.get('orderId')}
+
+        quote_qty = float(body['cummulativeQuoteQty'])
+        exec_price = quote_qty / filled_qty
+        fees: Dict[str, float] = {}
+        for f in body.get('fills', []):
+            asset = f.get('commissionAsset', self.quote_asset)
+            fees[asset] = fees.get(asset, 0.0) + float(f['commission'])
+        # Quote-equivalent fee; a third asset (e.g. BNB) has no price here
+        # and is only reported under 'fees'.
+        fee = fees.get(self.quote_asset, 0.0) + fees.get(symbol.split('/')[0], 0.0) * exec_price
+
+        # Keep the cache exact between refreshes: each commission comes out
+        # of the balance of the asset it was charged in.
+        sign = 1.0 if side == 'buy' else -1.0
+        with self._cache_lock:
+            self._capital -= sign * quote_qty + fees.get(self.quote_asset, 0.0)
+            self._positions[symbol] = self._positions.get(symbol, 0.0) + sign * filled_qty
+            for sym in self.symbols:
+                self._positions[sym] -= fees.get(sym.split('/')[0], 0.0)
+
+        logger.info(f"Live Executed: {side.upper()} {filled_qty} {symbol} @ {exec_price:.2f} (Fee: {fee:.2f})")
+        return {
+            "status": "filled",
+            "symbol": symbol,
+            "side": side,
+            "qty": filled_qty,
+            "price": exec_price,
+            "fee": fee,
+            "fees": fees,
+            "order_id": body.get('orderId'),
+        }
+
+    def close(self) -> None:
+        """Stops the order workers and closes pooled connections."""
+        self._executor.shutdown(wait=True)
+        self._pool.close()
@@ -24,6 +24,16 @@ class PaperBroker(BrokerBase):
     def get_positions(self) -> Dict[str, float]:
         return self.positions
 
+    def get_params(self) -> Dict[str, Any]:
+        return {'fee_rate': self.fee_rate, 'slippage_pct': self.slippage_pct}
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'capital': self.capital, 'positions': dict(self.positions)}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.capital = float(state['capital'])
+        self.positions = {k: float(v) for k, v in state['positions'].items()}
+
     def submit_order(self, symbol: str, qty: float, side: str, order_type: str = 'market', price: Optional[float] = None) -> Dict[str, Any]:
         if price is None:
             logger.error("PaperBroker requires a price for execution simulation.")
@@ -3,6 +3,10 @@ Technical indicators module.
 Implements vectorized, leakage-safe indicators.
 """
 
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
 import pandas as pd
 import numpy as np
 
@@ -67,3 +71,299 @@ def calculate_bollinger_pb(series: pd.Series, window: int = 20, num_std: float =
 def calculate_rolling_std(series: pd.Series, window: int) -> pd.Series:
     """Calculates rolling standard deviation."""
     return series.rolling(window=window).std()
+
+
+# ---------------------------------------------------------------------------
+# Incremental (streaming) indicators
+#
+# O(1)-per-bar counterparts of the vectorized functions above, for the live
+# loop. Each carries a small JSON-serialisable state (get_state/set_state)
+# so a restarted process can resume without re-warming over history. The
+# arithmetic mirrors pandas' ewm/rolling kernels so streaming values match
+# the vectorized ones on the same history.
+# ---------------------------------------------------------------------------
+
+class IncrementalEMA:
+    """Streaming equivalent of calculate_ema (ewm(span, adjust=False))."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._alpha = 1.0 / (1.0 + (window - 1) / 2.0)
+        self._old_wt = 1.0 - self._alpha
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        elif self.value != x:
+            self.value = (self._old_wt * self.value + self._alpha * x) / (
+                self._old_wt + self._alpha
+            )
+        return self.value
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'value': self.value}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.value = state['value']
+
+
+class IncrementalRollingMean:
+    """Streaming equivalent of series.rolling(window).mean() for NaN-free input."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: Deque[float] = deque(maxlen=window)
+
+    def update(self, x: float) -> float:
+        self._values.append(x)
+        if len(self._values) < self.window:
+            return float('nan')
+        return math.fsum(self._values) / self.window
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'values': list(self._values)}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._values = deque(state['values'], maxlen=self.window)
+
+
+class IncrementalRSI:
+    """Streaming equivalent of calculate_rsi."""
+
+    def __init__(self, window: int = 14) -> None:
+        self.window = window
+        self._prev: Optional[float] = None
+        self._gain = IncrementalRollingMean(window)
+        self._loss = IncrementalRollingMean(window)
+
+    def update(self, x: float) -> float:
+        prev, self._prev = self._prev, x
+        # calculate_rsi's where(...) turns the leading NaN diff into 0.
+        delta = 0.0 if prev is None else x - prev
+        gain = self._gain.update(delta if delta > 0 else 0.0)
+        loss = self._loss.update(-delta if delta < 0 else 0.0)
+        if math.isnan(gain) or math.isnan(loss) or loss == 0:
+            return float('nan')
+        return 100 - (100 / (1 + gain / loss))
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            'prev': self._prev,
+            'gain': self._gain.get_state(),
+            'loss': self._loss.get_state(),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._prev = state['prev']
+        self._gain.set_state(state['gain'])
+        self._loss.set_state(state['loss'])
+
+
+class IncrementalATR:
+    """Streaming equivalent of calculate_atr."""
+
+    def __init__(self, window: int = 14) -> None:
+        self.window = window
+        self._prev_close: Optional[float] = None
+        self._tr = IncrementalRollingMean(window)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return self._tr.update(tr)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {'prev_close': self._prev_close, 'tr': self._tr.get_state()}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._prev_close = state['prev_close']
+        self._tr.set_state(state['tr'])
+
+
+# ---------------------------------------------------------------------------
+# Indicator banks
+#
+# Many parameterizations of one indicator in a single pass, for parameter
+# sweeps. Each bank takes a list of windows and returns a (bars x windows)
+# float64 array whose column j matches the vectorized function called with
+# windows[j], to within float rounding (about 1e-12 relative) rather than
+# bit for bit. Intermediates are shared: one diff/gain/loss pass for all
+# RSI windows, one true-range pass for all ATR windows, one cumulative sum
+# per time chunk for all rolling means, and one batched recursion for all
+# EMA spans. Work is done in chunks along the time axis, so temporary
+# memory stays bounded by chunk_size x windows. Inputs must be NaN-free.
+# ---------------------------------------------------------------------------
+
+BANK_CHUNK = 8192
+# Bars per block of the batched EMA recursion, see ema_bank.
+EMA_BLOCK = 256
+
+
+def _bank_input(values: Any, name: str = 'values') -> np.ndarray:
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim != 1:
+        raise ValueError(f"{name} must be one-dimensional, got shape {arr.shape}")
+    if np.isnan(arr).any():
+        raise ValueError(f"{name} contains NaN; indicator banks need NaN-free input")
+    return arr
+
+
+def _bank_windows(windows: Sequence[float], integer: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Unique windows and the inverse index mapping them back to the request."""
+    arr = np.asarray(windows, dtype=np.int64 if integer else float)
+    if arr.ndim != 1 or arr.size == 0:
+        raise ValueError("windows must be a non-empty list")
+    if (arr < 1).any():
+        raise ValueError(f"windows must be >= 1, got {arr.tolist()}")
+    return np.unique(arr, return_inverse=True)
+
+
+def _bank_output(out: np.ndarray, inverse: np.ndarray) -> np.ndarray:
+    """Maps columns computed per unique (sorted) window back to the request order."""
+    if len(inverse) == out.shape[1] and np.array_equal(inverse, np.arange(len(inverse))):
+        return out
+    return out[:, inverse]
+
+
+def _rolling_mean_chunk(
+    values: np.ndarray, windows: np.ndarray, start: int, stop: int, out: np.ndarray
+) -> None:
+    """
+    Writes rolling(window).mean() of values for rows start..stop-1 into
+    out (shape (stop - start, len(windows))), NaN before a window fills.
+
+    The cumulative sum only spans this chunk plus the longest window, so
+    its magnitude (and the cancellation error of differencing it) stays
+    bounded by the chunk length. Windows holding only zeros are set to
+    exactly 0 from a nonzero count, as pandas would give.
+    """
+    lo = max(0, start - int(windows[-1]))
+    seg = values[lo:stop]
+    csum = np.concatenate(([0.0], np.cumsum(seg)))
+    nonzero = np.concatenate(([0], np.cumsum(seg != 0)))
+    a, b = start + 1 - lo, stop + 1 - lo
+    for j, w in enumerate(windows):
+        w = int(w)
+        first = min(max(0, w - 1 - start), stop - start)
+        col = out[:, j]
+        col[:first] = np.nan
+        mean = (csum[a + first:b] - csum[a + first - w:b - w]) / w
+        mean[nonzero[a + first:b] == nonzero[a + first - w:b - w]] = 0.0
+        col[first:] = mean
+
+
+def sma_bank(
+    values: Any, windows: Sequence[int], chunk_size: int = BANK_CHUNK
+) -> np.ndarray:
+    """
+    series.rolling(w).mean() for every w in windows.
+
+    Returns:
+        (len(values), len(windows)) array, NaN for the first w - 1 rows.
+    """
+    x = _bank_input(values)
+    uniq, inverse = _bank_windows(windows)
+    out = np.empty((len(x), len(uniq)))
+    for start in range(0, len(x), chunk_size):
+        stop = min(len(x), start + chunk_size)
+        _rolling_mean_chunk(x, uniq, start, stop, out[start:stop])
+    return _bank_output(out, inverse)
+
+
+def ema_bank(values: Any, spans: Sequence[float], block_size: int = EMA_BLOCK) -> np.ndarray:
+    """
+    calculate_ema (ewm(span, adjust=False).mean()) for every span.
+
+    Instead of stepping the recursion y[t] = d*y[t-1] + a*x[t] bar by bar,
+    each block of bars is solved for all spans at once in closed form,
+        y[t0 + i] = d^(i+1) * (y[t0] + sum_{s<=i} a * d^-(s+1) * x[t0 + s]),
+    which is one multiply, one cumulative sum and one multiply over a
+    (block x spans) array. The block length is capped so d^-block cannot
+    overflow for the shortest span.
+
+    Returns:
+        (len(values), len(spans)) array.
+    """
+    x = _bank_input(values)
+    uniq, inverse = _bank_windows(spans, integer=False)
+    n, k = len(x), len(uniq)
+    out = np.empty((n, k))
+    if n == 0:
+        return _bank_output(out, inverse)
+
+    alpha = 2.0 / (uniq + 1.0)
+    decay = 1.0 - alpha
+    # span == 1 is the identity; handled outside the recursion.
+    passthrough = decay == 0.0
+    safe = np.where(passthrough, 0.5, decay)
+    block = max(1, min(block_size, int(150 / -np.log10(safe.min()))))
+    steps = np.arange(1, block + 1, dtype=float)[:, None]
+    grow = alpha * safe ** -steps
+    shrink = safe ** steps
+
+    out[0] = x[0]
+    carry = out[0].copy()
+    for start in range(1, n, block):
+        stop = min(n, start + block)
+        m = stop - start
+        chunk = out[start:stop]
+        np.multiply(x[start:stop, None], grow[:m], out=chunk)
+        chunk[0] += carry
+        np.cumsum(chunk, axis=0, out=chunk)
+        chunk *= shrink[:m]
+        carry = chunk[-1].copy()
+    if passthrough.any():
+        out[:, passthrough] = x[:, None]
+    return _bank_output(out, inverse)
+
+
+def rsi_bank(
+    values: Any, windows: Sequence[int], chunk_size: int = BANK_CHUNK
+) -> np.ndarray:
+    """
+    calculate_rsi for every window, from one diff/gain/loss pass.
+
+    Returns:
+        (len(values), len(windows)) array; NaN until the window fills and
+        wherever the average loss is zero, as in calculate_rsi.
+    """
+    x = _bank_input(values)
+    uniq, inverse = _bank_windows(windows)
+    delta = np.diff(x, prepend=x[:1])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    out = np.empty((len(x), len(uniq)))
+    avg_loss = np.empty((min(chunk_size, len(x)), len(uniq)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(x), chunk_size):
+            stop = min(len(x), start + chunk_size)
+            avg_gain, avg_l = out[start:stop], avg_loss[:stop - start]
+            _rolling_mean_chunk(gain, uniq, start, stop, avg_gain)
+            _rolling_mean_chunk(loss, uniq, start, stop, avg_l)
+            avg_l[avg_l == 0] = np.nan
+            avg_gain /= avg_l
+            avg_gain += 1
+            np.divide(100, avg_gain, out=avg_gain)
+            np.subtract(100, avg_gain, out=avg_gain)
+    return _bank_output(out, inverse)
+
+
+def atr_bank(
+    high: Any, low: Any, close: Any, windows: Sequence[int], chunk_size: int = BANK_CHUNK
+) -> np.ndarray:
+    """
+    calculate_atr for every window, from one true-range pass.
+
+    Returns:
+        (len(close), len(windows)) array, NaN for the first w - 1 rows.
+    """
+    h, lo, c = _bank_input(high, 'high'), _bank_input(low, 'low'), _bank_input(close, 'close')
+    tr = h - lo
+    if len(c) > 1:
+        prev = c[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - prev), np.abs(lo[1:] - prev)))
+    return sma_bank(tr, windows, chunk_size)
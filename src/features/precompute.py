@@ -0,0 +1,352 @@
+"""
+Sharded precompute module.
+Computes indicators/features over long histories in parallel time shards.
+
+The history is split into contiguous shards. Each shard is computed on a
+process pool together with enough preceding warm-up bars for every
+indicator to converge to the serial result, and the shards are stitched
+back into one frame. Each shard also computes `overlap` bars past its end,
+which must equal the next shard's first bars exactly. Shard 0 has the
+full history, so by induction the stitched result is bit-identical to a
+serial run. A boundary that does not match is recomputed with double the
+warm-up, up to the full prefix.
+
+Functions passed in must be causal (row t depends on rows <= t only) and
+picklable (module-level, or functools.partial of one).
+"""
+
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.features.indicators import (
+    calculate_adx,
+    calculate_atr,
+    calculate_bollinger_pb,
+    calculate_ema,
+    calculate_macd,
+    calculate_rolling_std,
+    calculate_rsi,
+)
+from src.utils.logger import logger
+
+Frame = Union[pd.DataFrame, pd.Series]
+
+_EPS = float(np.finfo(float).eps)
+
+
+def ema_warmup(window: int, tol: float = _EPS) -> int:
+    """
+    Bars after which a start-up difference in calculate_ema has decayed
+    below `tol` (relative): ceil(log(tol) / log(1 - alpha)).
+    """
+    alpha = 2.0 / (window + 1.0)
+    if alpha >= 1.0:
+        return 1
+    return int(math.ceil(math.log(tol) / math.log(1.0 - alpha)))
+
+
+# Warm-up in bars for each indicator in src.features.indicators, as a
+# function of its parameters. Rolling windows need their window plus any
+# diff/shift in front; ADX stacks two rolling windows on a shifted true
+# range; MACD's signal EMA runs on the slow EMA's output.
+WARMUP_RULES: Dict[str, Callable[..., int]] = {
+    'ema': lambda window: ema_warmup(window),
+    'rsi': lambda window=14: window + 1,
+    'macd': lambda fast=12, slow=26, signal=9: ema_warmup(slow) + ema_warmup(signal),
+    'atr': lambda window=14: window + 1,
+    'adx': lambda window=14: 2 * window + 1,
+    'bollinger_pb': lambda window=20, num_std=2.0: window,
+    'rolling_std': lambda window: window,
+}
+
+# pandas' online rolling variance keeps rounding state from the start of
+# the series, so these never match a serial run bit for bit from a
+# truncated start; they are computed over the whole history in one task.
+HISTORY_DEPENDENT = frozenset({'bollinger_pb', 'rolling_std'})
+
+# Indicator function and the OHLCV columns it takes, in order.
+_INDICATORS: Dict[str, Tuple[Callable[..., Frame], Tuple[str, ...]]] = {
+    'ema': (calculate_ema, ('close',)),
+    'rsi': (calculate_rsi, ('close',)),
+    'macd': (calculate_macd, ('close',)),
+    'atr': (calculate_atr, ('high', 'low', 'close')),
+    'adx': (calculate_adx, ('high', 'low', 'close')),
+    'bollinger_pb': (calculate_bollinger_pb, ('close',)),
+    'rolling_std': (calculate_rolling_std, ('close',)),
+}
+
+
+def indicator_warmup(indicator: str, **params: Any) -> int:
+    """
+    Warm-up bars needed by one indicator.
+
+    Raises:
+        ValueError: If the indicator is not recognized.
+    """
+    if indicator not in WARMUP_RULES:
+        raise ValueError(
+            f"Unknown indicator '{indicator}'. Options: {list(WARMUP_RULES.keys())}"
+        )
+    return WARMUP_RULES[indicator](**params)
+
+
+@dataclass
+class IndicatorSpec:
+    """One output of compute_indicators: `name` = indicator(**params)."""
+    name: str
+    indicator: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def warmup(self) -> int:
+        return indicator_warmup(self.indicator, **self.params)
+
+    @property
+    def shardable(self) -> bool:
+        return self.indicator not in HISTORY_DEPENDENT
+
+
+def default_specs(config: Dict[str, Any]) -> List[IndicatorSpec]:
+    """The indicator set used by the signals, from the 'signals' config block."""
+    sig = config['signals']
+    fast, slow, rsi = int(sig['ema_fast']), int(sig['ema_slow']), int(sig['rsi_window'])
+    return [
+        IndicatorSpec('ema_fast', 'ema', {'window': fast}),
+        IndicatorSpec('ema_slow', 'ema', {'window': slow}),
+        IndicatorSpec('rsi', 'rsi', {'window': rsi}),
+        IndicatorSpec('macd', 'macd', {'fast': fast, 'slow': slow}),
+        IndicatorSpec('atr', 'atr', {'window': 14}),
+        IndicatorSpec('adx', 'adx', {'window': 14}),
+        IndicatorSpec('bb_pb', 'bollinger_pb', {'window': 20}),
+    ]
+
+
+def warmup_table(specs: List[IndicatorSpec]) -> Dict[str, int]:
+    """Warm-up bars per spec name."""
+    return {spec.name: spec.warmup() for spec in specs}
+
+
+def compute_indicators(data: pd.DataFrame, specs: List[IndicatorSpec]) -> pd.DataFrame:
+    """
+    Serial computation of `specs` on OHLCV data. Multi-column indicators
+    (MACD) produce '<name>_<column>' columns.
+    """
+    columns: Dict[str, pd.Series] = {}
+    for spec in specs:
+        func, inputs = _INDICATORS[spec.indicator]
+        out = func(*(data[c] for c in inputs), **spec.params)
+        if isinstance(out, pd.DataFrame):
+            for col in out.columns:
+                columns[f"{spec.name}_{col}"] = out[col]
+        else:
+            columns[spec.name] = out
+    return pd.DataFrame(columns, index=data.index)
+
+
+@dataclass
+class PrecomputeReport:
+    """What sharded precompute did for one function over one history."""
+    name: str
+    warmup: int
+    shards: int
+    shard_warmup: List[int]
+    boundary_retries: int
+    # Shards never matched at a boundary within the allowed warm-up
+    # doublings, so the result was computed over the whole history.
+    full_history: bool = False
+    serial_match: Optional[bool] = None
+
+
+class _Done:
+    """Already-computed stand-in for a Future when running in-process."""
+
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def result(self) -> Any:
+        return self._value
+
+
+def _run_shard(
+    func: Callable[[pd.DataFrame], Frame], chunk: pd.DataFrame, keep_from: int
+) -> Frame:
+    return func(chunk).iloc[keep_from:]
+
+
+class _ShardJob:
+    """Sharded evaluation of one function over one history."""
+
+    def __init__(
+        self,
+        name: str,
+        data: pd.DataFrame,
+        func: Callable[[pd.DataFrame], Frame],
+        warmup: int,
+        n_shards: int,
+        overlap: int,
+        max_doublings: int,
+    ) -> None:
+        self.name = name
+        self.data = data
+        self.func = func
+        self.warmup = warmup
+        self.overlap = overlap
+        self.max_doublings = max_doublings
+        n = len(data)
+        # Shards shorter than the warm-up would mostly recompute warm-up.
+        n_shards = max(1, min(n_shards, n // max(1, warmup)))
+        self.bounds: List[int] = np.linspace(0, n, n_shards + 1).astype(int).tolist()
+        self.warmups = [0] + [warmup] * (n_shards - 1)
+        self.futures: List[Any] = []
+
+    def _submit(self, executor: Optional[Executor], k: int) -> Any:
+        n, bounds = len(self.data), self.bounds
+        start = bounds[k]
+        lo = max(0, start - self.warmups[k])
+        hi = min(n, bounds[k + 1] + self.overlap, bounds[min(k + 2, len(bounds) - 1)])
+        args = (self.func, self.data.iloc[lo:hi], start - lo)
+        return executor.submit(_run_shard, *args) if executor else _Done(_run_shard(*args))
+
+    def submit(self, executor: Optional[Executor]) -> None:
+        self.futures = [self._submit(executor, k) for k in range(len(self.warmups))]
+
+    def finish(self, executor: Optional[Executor]) -> Tuple[Frame, PrecomputeReport]:
+        """Waits for the shards, checks every boundary and stitches."""
+        bounds, warmups = self.bounds, self.warmups
+        parts = [f.result() for f in self.futures]
+        report = PrecomputeReport(
+            name=self.name,
+            warmup=self.warmup,
+            shards=len(warmups),
+            shard_warmup=warmups,
+            boundary_retries=0,
+        )
+
+        for k in range(1, len(parts)):
+            doublings = 0
+            while True:
+                tail = parts[k - 1].iloc[bounds[k] - bounds[k - 1]:]
+                if tail.equals(parts[k].iloc[:len(tail)]):
+                    break
+                if warmups[k] >= bounds[k]:
+                    raise ValueError(
+                        f"{self.name}: shard {k} differs from the serial result even "
+                        "with the full prefix as warm-up; the function is not causal."
+                    )
+                if doublings >= self.max_doublings:
+                    logger.debug(
+                        f"{self.name}: no bit-exact convergence within {warmups[k]} bars; "
+                        "computing over the full history"
+                    )
+                    report.full_history = True
+                    whole = executor.submit(self.func, self.data) if executor else None
+                    return (whole.result() if whole else self.func(self.data)), report
+                warmups[k] = min(bounds[k], warmups[k] * 2)
+                doublings += 1
+                report.boundary_retries += 1
+                parts[k] = self._submit(executor, k).result()
+
+        cores = [part.iloc[:bounds[k + 1] - bounds[k]] for k, part in enumerate(parts)]
+        return pd.concat(cores), report
+
+
+def precompute_many(
+    jobs: Dict[str, Tuple[pd.DataFrame, Callable[[pd.DataFrame], Frame], int]],
+    n_shards: Optional[int] = None,
+    overlap: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    max_doublings: int = 2,
+    verify_serial: bool = False,
+) -> Dict[str, Tuple[Frame, PrecomputeReport]]:
+    """
+    Runs several sharded precomputes (e.g. symbols x indicators) on one
+    process pool. All shards are submitted up front, so jobs overlap.
+
+    Args:
+        jobs: name -> (history, func, warmup). func must be causal and
+            picklable; warmup is the bars of history it needs before its
+            output matches a serial run (see indicator_warmup).
+        n_shards: Shards per history; defaults to 2x workers.
+        overlap: Bars compared at each shard boundary; defaults to each
+            job's warmup.
+        max_workers: Process pool size; 1 runs everything in-process.
+        max_doublings: Warm-up doublings tried at a mismatching boundary
+            before the job falls back to one whole-history computation.
+        verify_serial: Also run each func on its full history and record
+            whether the stitched result is identical.
+
+    Returns:
+        Dict name -> (result, PrecomputeReport).
+    """
+    workers = max_workers or os.cpu_count() or 1
+    n_shards = n_shards or 2 * workers
+
+    shard_jobs = [
+        _ShardJob(
+            name, data, func, warmup, n_shards,
+            warmup if overlap is None else overlap, max_doublings,
+        )
+        for name, (data, func, warmup) in jobs.items()
+    ]
+    results: Dict[str, Tuple[Frame, PrecomputeReport]] = {}
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for job in shard_jobs:
+            job.submit(executor)
+        for job in shard_jobs:
+            result, report = job.finish(executor)
+            if verify_serial:
+                report.serial_match = bool(result.equals(job.func(job.data)))
+            results[job.name] = (result, report)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def precompute(
+    data: pd.DataFrame,
+    func: Callable[[pd.DataFrame], Frame],
+    warmup: int,
+    **kwargs: Any,
+) -> Tuple[Frame, PrecomputeReport]:
+    """Sharded precompute of one function over one history; see precompute_many."""
+    return precompute_many({'data': (data, func, warmup)}, **kwargs)['data']
+
+
+def precompute_indicators(
+    frames: Dict[str, pd.DataFrame],
+    specs: List[IndicatorSpec],
+    **kwargs: Any,
+) -> Dict[str, Tuple[pd.DataFrame, List[PrecomputeReport]]]:
+    """
+    compute_indicators for several histories (e.g. symbols), sharded per
+    indicator so one indicator that needs its full history does not hold
+    back the others. Only the input columns an indicator uses are sent to
+    the workers. Keyword arguments go to precompute_many.
+
+    Returns:
+        Dict history name -> (indicator frame, per-indicator reports).
+    """
+    jobs = {}
+    for key, data in frames.items():
+        for spec in specs:
+            inputs = list(_INDICATORS[spec.indicator][1])
+            func = partial(compute_indicators, specs=[spec])
+            # A warm-up as long as the data leaves a single shard.
+            warmup = spec.warmup() if spec.shardable else len(data)
+            jobs[f"{key}:{spec.name}"] = (data[inputs], func, warmup)
+    done = precompute_many(jobs, **kwargs)
+
+    out: Dict[str, Tuple[pd.DataFrame, List[PrecomputeReport]]] = {}
+    for key, data in frames.items():
+        names = [f"{key}:{spec.name}" for spec in specs]
+        frame = pd.concat([done[n][0] for n in names], axis=1)
+        out[key] = (frame, [done[n][1] for n in names])
+    return out
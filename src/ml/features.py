@@ -2,4 +2,51 @@
 ML features module.
 Generates lagged features without lookahead bias.
 """
-pass
+
+import pandas as pd
+from typing import Dict, Any
+from src.features.indicators import (
+    calculate_adx,
+    calculate_atr,
+    calculate_bollinger_pb,
+    calculate_ema,
+    calculate_macd,
+    calculate_rsi,
+    calculate_rolling_std,
+)
+
+
+def build_features(data: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Builds the model feature matrix from OHLCV bars.
+
+    Every column at bar t uses information up to bar t-1 only (all
+    features are shifted by one bar), so the row can be paired with a
+    label that starts at bar t.
+
+    Args:
+        data: OHLCV DataFrame indexed by timestamp.
+        config: Full config; reads the 'signals' block for windows.
+    """
+    sig = config['signals']
+    close, high, low = data['close'], data['high'], data['low']
+
+    fast = calculate_ema(close, int(sig['ema_fast']))
+    slow = calculate_ema(close, int(sig['ema_slow']))
+    macd = calculate_macd(close, int(sig['ema_fast']), int(sig['ema_slow']))
+    atr = calculate_atr(high, low, close, window=14)
+    returns = close.pct_change()
+
+    features = pd.DataFrame({
+        'ret_1': returns,
+        'ret_5': close.pct_change(5),
+        'ema_spread': (fast - slow) / close,
+        'rsi': calculate_rsi(close, int(sig['rsi_window'])),
+        'macd_hist': macd['hist'] / close,
+        'atr_pct': atr / close,
+        'adx': calculate_adx(high, low, close, window=14),
+        'bb_pb': calculate_bollinger_pb(close, window=20),
+        'vol_20': calculate_rolling_std(returns, 20),
+    }, index=data.index)
+
+    return features.shift(1)
@@ -2,4 +2,72 @@
 ML labeling module.
 Implements triple-barrier labeling.
 """
-pass
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any
+from src.features.indicators import calculate_atr
+
+
+def triple_barrier_labels(
+    data: pd.DataFrame,
+    horizon: int,
+    atr_multiplier: float,
+    reward_risk_ratio: float,
+    atr_window: int = 14,
+) -> pd.Series:
+    """
+    Labels each bar by which barrier a long entry at its close hits first.
+
+    Barriers mirror RiskManager.calculate_sl_tp: stop at
+    close - atr * atr_multiplier, target at stop distance * reward_risk_ratio
+    above close, vertical barrier after `horizon` bars.
+
+    Returns:
+        Series of 1 (take-profit first), -1 (stop-loss first), 0 (timed
+        out); NaN where ATR is undefined or the horizon runs past the data.
+    """
+    close = data['close'].to_numpy(dtype=float)
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    atr = calculate_atr(data['high'], data['low'], data['close'], window=atr_window).to_numpy()
+
+    n = len(close)
+    labels = np.full(n, np.nan)
+    m = n - horizon
+    if m <= 0:
+        return pd.Series(labels, index=data.index, name='label')
+
+    entry_atr = atr[:m]
+    valid = np.isfinite(entry_atr) & (entry_atr > 0)
+    stop_dist = entry_atr * atr_multiplier
+    stop = close[:m] - stop_dist
+    target = close[:m] + stop_dist * reward_risk_ratio
+
+    # Vectorized over entries, looping only over the (short) horizon: at
+    # offset k every still-open entry checks bar t + k, so the first
+    # barrier touched wins exactly as in a per-entry forward scan.
+    label = np.zeros(m)
+    pending = valid.copy()
+    for k in range(1, horizon + 1):
+        if not pending.any():
+            break
+        # Same-bar touch of both barriers is resolved pessimistically.
+        hit_sl = pending & (low[k:k + m] <= stop)
+        hit_tp = pending & ~hit_sl & (high[k:k + m] >= target)
+        label[hit_sl] = -1.0
+        label[hit_tp] = 1.0
+        pending &= ~(hit_sl | hit_tp)
+    labels[:m] = np.where(valid, label, np.nan)
+
+    return pd.Series(labels, index=data.index, name='label')
+
+
+def build_labels(data: pd.DataFrame, config: Dict[str, Any]) -> pd.Series:
+    """Triple-barrier labels driven by the ml.horizon and risk config keys."""
+    return triple_barrier_labels(
+        data,
+        horizon=int(config['ml']['horizon']),
+        atr_multiplier=float(config['atr_multiplier']),
+        reward_risk_ratio=float(config['reward_risk_ratio']),
+    )
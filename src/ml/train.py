@@ -2,4 +2,47 @@
 ML training module.
 Trains LightGBM models.
 """
-pass
+
+import pandas as pd
+from typing import Dict, Any
+from src.utils.logger import logger
+
+
+def train_model(
+    features: pd.DataFrame, labels: pd.Series, config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Fits a LightGBM classifier on rows where features and label are defined.
+
+    The last 20% of rows (in time order) is held out for a validation
+    accuracy figure; no shuffling.
+
+    Returns:
+        Dict with the fitted 'model', 'feature_names' and 'val_accuracy'.
+
+    Raises:
+        ImportError: If lightgbm is not installed.
+        ValueError: If there are too few labelled rows to train on.
+    """
+    # Imported here so that importing this module stays cheap.
+    import lightgbm as lgb
+
+    frame = features.join(labels.rename('label'), how='inner').dropna()
+    if len(frame) < 50:
+        raise ValueError(f"Not enough labelled rows to train: {len(frame)}")
+
+    split = int(len(frame) * 0.8)
+    x = frame.drop(columns=['label'])
+    y = frame['label'].astype(int)
+
+    model = lgb.LGBMClassifier(n_estimators=200, learning_rate=0.05, verbose=-1)
+    model.fit(x.iloc[:split], y.iloc[:split])
+
+    val_accuracy = float((model.predict(x.iloc[split:]) == y.iloc[split:]).mean())
+    logger.info(f"Trained LightGBM on {split} rows, validation accuracy {val_accuracy:.3f}")
+
+    return {
+        'model': model,
+        'feature_names': list(x.columns),
+        'val_accuracy': val_accuracy,
+    }
@@ -1,5 +1,307 @@
 """
 Voice alerts module.
 Optional TTS hook for live trading.
+
+Alerts are handed to an AlertDispatcher, which only appends them to a
+bounded in-memory queue; a background worker coalesces bursts and hands
+them to pluggable sinks (console, file, voice). Every sink has its own
+queue and delivery thread, so a slow sink (speech) delays or drops only
+its own alerts and never blocks the trading loop or the other sinks.
 """
-pass
+
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.utils.logger import logger
+
+LEVELS = ('info', 'warning', 'critical')
+
+
+@dataclass
+class Alert:
+    """A single notification. `count` > 1 marks a coalesced summary."""
+    kind: str
+    message: str
+    level: str = 'info'
+    timestamp: float = field(default_factory=time.time)
+    count: int = 1
+
+
+class AlertSink(ABC):
+    """Destination for delivered alerts. Called only from its own delivery thread."""
+
+    @abstractmethod
+    def emit(self, alert: Alert) -> None:
+        """Delivers one alert."""
+        pass
+
+    def close(self) -> None:
+        """Releases resources; called once when the dispatcher stops."""
+        pass
+
+
+class ConsoleSink(AlertSink):
+    """Prints alerts to stdout."""
+
+    def emit(self, alert: Alert) -> None:
+        stamp = time.strftime('%H:%M:%S', time.localtime(alert.timestamp))
+        print(f"[{stamp}] {alert.level.upper()} {alert.kind}: {alert.message}", file=sys.stdout)
+
+
+class FileSink(AlertSink):
+    """Appends alerts to a text file, one line each."""
+
+    def __init__(self, path: str) -> None:
+        self._fh = open(path, 'a', encoding='utf-8')
+
+    def emit(self, alert: Alert) -> None:
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(alert.timestamp))
+        self._fh.write(f"{stamp}\t{alert.level}\t{alert.kind}\t{alert.message}\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class VoiceSink(AlertSink):
+    """
+    Speaks alerts through pyttsx3 (imported on construction).
+
+    Args:
+        min_level: Alerts below this level are not spoken.
+
+    Raises:
+        ImportError: If pyttsx3 is not installed.
+    """
+    def __init__(self, min_level: str = 'warning') -> None:
+        import pyttsx3
+
+        self._engine = pyttsx3.init()
+        self._min_rank = LEVELS.index(min_level)
+
+    def emit(self, alert: Alert) -> None:
+        if LEVELS.index(alert.level) < self._min_rank:
+            return
+        self._engine.say(f"{alert.kind}. {alert.message}")
+        self._engine.runAndWait()
+
+
+def coalesce(alerts: List[Alert]) -> List[Alert]:
+    """
+    Collapses a batch: exact duplicates are dropped and multiple alerts of
+    the same (kind, level) become one summary carrying the total count and
+    the most recent message. Groups keep the order of first appearance.
+    """
+    groups: Dict[Tuple[str, str], List[Alert]] = {}
+    for alert in alerts:
+        groups.setdefault((alert.kind, alert.level), []).append(alert)
+
+    out: List[Alert] = []
+    for (kind, level), group in groups.items():
+        total = sum(a.count for a in group)
+        unique = list(dict.fromkeys(a.message for a in group))
+        if len(unique) == 1:
+            out.append(Alert(kind, unique[0], level, group[-1].timestamp, total))
+            continue
+        span = group[-1].timestamp - group[0].timestamp
+        out.append(Alert(
+            kind,
+            f"{total} {kind} alerts in {span:.1f}s; latest: {group[-1].message}",
+            level,
+            group[-1].timestamp,
+            total,
+        ))
+    return out
+
+
+class _SinkWorker:
+    """Delivers alerts to one sink, in order, on a dedicated thread."""
+
+    def __init__(self, sink: AlertSink, maxsize: int) -> None:
+        self.sink = sink
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._queue: Deque[Alert] = deque()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name=f'alert-sink-{type(sink).__name__}', daemon=True
+        )
+
+    @property
+    def name(self) -> str:
+        return type(self.sink).__name__
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, alert: Alert) -> None:
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            return
+        self._queue.append(alert)
+        self._wakeup.set()
+
+    def request_stop(self) -> None:
+        """Asks the thread to exit once its queue is drained."""
+        self._stopping = True
+        self._wakeup.set()
+
+    def join(self, timeout: float) -> bool:
+        """True if the thread exited within timeout."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                alert = self._queue.popleft()
+                try:
+                    self.sink.emit(alert)
+                except Exception as e:
+                    logger.error(f"Alert sink {self.name} failed: {e}")
+            if self._stopping and not self._queue:
+                return
+
+
+class AlertDispatcher:
+    """
+    Non-blocking alert queue with a coalescing background worker.
+
+    notify() appends to a bounded deque and signals the worker. When the
+    queue is full the alert is dropped and counted; the caller never
+    waits. The worker holds each batch open for `coalesce_window` seconds
+    (critical alerts flush immediately) and then hands coalesce(batch) to
+    every sink's own bounded queue. Each sink is drained by its own
+    thread, so a slow sink only delays (or, once its queue is full, drops)
+    its own alerts. Sink exceptions are logged and do not stop delivery.
+
+    Args:
+        sinks: Delivery targets.
+        maxsize: Capacity of the intake queue and of each sink's queue.
+        coalesce_window: Seconds to accumulate a burst before delivery.
+    """
+    def __init__(
+        self,
+        sinks: List[AlertSink],
+        maxsize: int = 1000,
+        coalesce_window: float = 1.0,
+    ) -> None:
+        self.sinks = sinks
+        self.maxsize = maxsize
+        self.coalesce_window = coalesce_window
+        self.dropped: int = 0
+        self.delivered: int = 0
+
+        self._queue: Deque[Alert] = deque()
+        self._wakeup = threading.Event()
+        self._urgent = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._workers = [_SinkWorker(sink, maxsize) for sink in sinks]
+
+    def start(self) -> 'AlertDispatcher':
+        if self._thread is None:
+            for worker in self._workers:
+                worker.start()
+            self._thread = threading.Thread(
+                target=self._worker, name='alert-dispatcher', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    @property
+    def sink_dropped(self) -> Dict[str, int]:
+        """Alerts dropped per sink because that sink's queue was full."""
+        return {w.name: w.dropped for w in self._workers}
+
+    def notify(self, kind: str, message: str, level: str = 'info') -> bool:
+        """
+        Enqueues an alert. Returns False if it was dropped because the
+        queue is full.
+        """
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            return False
+        self._queue.append(Alert(kind, message, level))
+        if level == 'critical':
+            self._urgent = True
+        self._wakeup.set()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Flushes pending alerts, stops the workers and closes sinks. A sink
+        whose thread is still inside emit() after `timeout` seconds is left
+        open (closing it under a running emit() is unsafe); calling stop()
+        again retries it.
+        """
+        deadline = time.monotonic() + timeout
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    f"Alert dispatcher still coalescing after {timeout}s; leaving sinks open"
+                )
+                return
+            self._thread = None
+
+        dropped = self.dropped + sum(w.dropped for w in self._workers)
+        for worker in self._workers:
+            worker.request_stop()
+        running = []
+        for worker in self._workers:
+            if not worker.join(max(0.0, deadline - time.monotonic())):
+                logger.warning(f"Alert sink {worker.name} still delivering; leaving it open")
+                running.append(worker)
+                continue
+            try:
+                worker.sink.close()
+            except Exception as e:
+                logger.error(f"Error closing alert sink {worker.name}: {e}")
+        self._workers = running
+        if dropped:
+            logger.warning(f"Alert dispatcher dropped {dropped} alerts (queue full)")
+
+    def _drain(self) -> List[Alert]:
+        batch: List[Alert] = []
+        while self._queue:
+            batch.append(self._queue.popleft())
+        return batch
+
+    def _worker(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._queue:
+                if self._stopping:
+                    return
+                continue
+
+            deadline = time.monotonic() + self.coalesce_window
+            while not (self._stopping or self._urgent):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.wait(remaining)
+                self._wakeup.clear()
+
+            self._urgent = False
+            for alert in coalesce(self._drain()):
+                for worker in self._workers:
+                    worker.put(alert)
+                self.delivered += 1
+
+            if self._stopping and not self._queue:
+                return
+            if self._queue:
+                self._wakeup.set()
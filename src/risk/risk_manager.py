@@ -48,6 +48,30 @@ class RiskManager:
         self.start_of_day_equity: float = 0.0
         self.halted: bool = False
 
+    def get_params(self) -> Dict[str, Any]:
+        """Returns the configured limits, keyed as in settings.yaml."""
+        return {
+            'risk_per_trade_pct': self.risk_per_trade,
+            'atr_multiplier': self.atr_multiplier,
+            'max_drawdown': self.max_drawdown,
+            'max_daily_loss': self.max_daily_loss,
+            'reward_risk_ratio': self.reward_risk_ratio,
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        """Returns peak/start-of-day equity and the halt flag."""
+        return {
+            'peak_equity': self.peak_equity,
+            'start_of_day_equity': self.start_of_day_equity,
+            'halted': self.halted,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restores state produced by get_state()."""
+        self.peak_equity = float(state['peak_equity'])
+        self.start_of_day_equity = float(state['start_of_day_equity'])
+        self.halted = bool(state['halted'])
+
     def update_equity(self, current_equity: float, is_new_day: bool = False) -> None:
         """
         Updates internal equity state and checks drawdown halts.
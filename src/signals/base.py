@@ -4,11 +4,34 @@ Defines the interface for all trading signals.
 """
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 import pandas as pd
 
+if TYPE_CHECKING:
+    # Annotation only: signals do not depend on the data layer at runtime.
+    from src.data.resampler import BarResampler
+
 class SignalBase(ABC):
-    """Abstract base class for all trading signal generators."""
-    
+    """
+    Abstract base class for all trading signal generators.
+
+    Signals that need higher-timeframe context list those timeframes in
+    `timeframes` and read closed bars from a shared BarResampler bound by
+    the engine or live loop, instead of resampling history themselves.
+    """
+
+    timeframes: Tuple[str, ...] = ()
+    resampler: Optional['BarResampler'] = None
+
+    def bind_resampler(self, resampler: 'BarResampler') -> None:
+        """
+        Attaches the shared resampler and registers this signal's
+        timeframes on it. The owner feeds each base bar to the resampler
+        before asking the signal for a decision on that bar.
+        """
+        resampler.require(self.timeframes)
+        self.resampler = resampler
+
     @abstractmethod
     def generate_signal(self, data: pd.DataFrame) -> int:
         """
@@ -21,3 +44,46 @@ class SignalBase(ABC):
             int: 1 for Buy, -1 for Sell, 0 for Hold.
         """
         pass
+
+
+class StreamingSignal(SignalBase):
+    """
+    Signal that can also be evaluated one bar at a time.
+
+    update() must return the same value generate_signal() would return
+    on the full history seen so far, and its internal state must round-trip
+    through get_state()/set_state() as plain JSON types.
+    """
+
+    @abstractmethod
+    def update(self, bar: Dict[str, float]) -> int:
+        """
+        Consumes the next closed bar and returns the signal at that bar.
+
+        Args:
+            bar (Dict[str, float]): open/high/low/close/volume of the bar.
+
+        Returns:
+            int: 1 for Buy, -1 for Sell, 0 for Hold.
+        """
+        pass
+
+    @abstractmethod
+    def get_state(self) -> Dict[str, Any]:
+        """Returns the incremental state as JSON-serialisable data."""
+        pass
+
+    @abstractmethod
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restores state produced by get_state()."""
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Clears incremental state, as if no bars had been seen."""
+        pass
+
+    @abstractmethod
+    def get_params(self) -> Dict[str, Any]:
+        """Returns the settings that shape the signal (not its state) as JSON-serialisable data."""
+        pass
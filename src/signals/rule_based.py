@@ -4,21 +4,40 @@ Generates signals based on technical indicators.
 """
 
 import pandas as pd
-from typing import Dict, Any
-from src.signals.base import SignalBase
-from src.features.indicators import calculate_ema, calculate_rsi
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from src.signals.base import StreamingSignal
+from src.features.indicators import (
+    IncrementalEMA,
+    IncrementalRSI,
+    calculate_ema,
+    calculate_rsi,
+)
 
+if TYPE_CHECKING:
+    from src.data.resampler import BarResampler
 
-class RuleBasedSignal(SignalBase):
+
+class RuleBasedSignal(StreamingSignal):
     """
     Generates signals based on Trend (EMA cross) and Momentum (RSI) filter.
 
+    Supports both whole-history evaluation (generate_signal) and O(1)
+    streaming evaluation (update); both give the same signal sequence.
+
     Config keys (under 'signals' block in settings.yaml):
         ema_fast: int — fast EMA window (e.g. 12)
         ema_slow: int — slow EMA window (e.g. 26)
         rsi_window: int — RSI lookback (e.g. 14)
         rsi_overbought: float — RSI threshold for overbought (e.g. 70)
         rsi_oversold: float — RSI threshold for oversold (e.g. 30)
+        trend_timeframe: str, optional — higher timeframe (e.g. '4h') whose
+            close must be above its ema_slow EMA for a Buy. Read from the
+            bound BarResampler; Sell signals are not filtered. update()
+            and generate_signal() both feed each newly closed
+            higher-timeframe bar to the same incremental EMA, so the
+            trend (unlike the rest of generate_signal) follows the bars
+            the resampler has seen rather than `data`, and both paths
+            agree however many bars the resampler retains.
     """
     def __init__(self, config: Dict[str, Any]) -> None:
         signal_config = config.get('signals')
@@ -48,12 +67,75 @@ class RuleBasedSignal(SignalBase):
                 f"ema_fast ({self.fast_window}) must be < ema_slow ({self.slow_window})"
             )
 
+        self.min_bars: int = max(self.slow_window, self.rsi_window) + 1
+
+        self.trend_timeframe: Optional[str] = signal_config.get('trend_timeframe')
+        if self.trend_timeframe:
+            self.timeframes = (self.trend_timeframe,)
+        self.reset()
+
+    def _decide(self, current_fast: float, current_slow: float, current_rsi: float) -> int:
+        # Bullish trend + RSI not overbought
+        if current_fast > current_slow and current_rsi < self.rsi_overbought:
+            return 1
+        # Bearish trend + RSI not oversold
+        elif current_fast < current_slow and current_rsi > self.rsi_oversold:
+            return -1
+
+        return 0
+
+    def _trend_resampler(self) -> 'BarResampler':
+        if self.resampler is None:
+            raise RuntimeError(
+                f"trend_timeframe '{self.trend_timeframe}' requires a BarResampler; "
+                "pass one to the engine or live loop."
+            )
+        return self.resampler
+
+    def _advance_trend(self) -> None:
+        """
+        Feeds every higher-timeframe bar closed since the last call to the
+        trend EMA. Called on every update() and generate_signal(); calling
+        it again for the same bar is a no-op.
+
+        Raises:
+            RuntimeError: If bars closed since the last call have already
+                been evicted from the resampler, so the EMA would skip them.
+        """
+        resampler = self._trend_resampler()
+        tf = self.trend_timeframe
+        closed = resampler.closed_count(tf)
+        bars = resampler.bars_since(tf, self._trend_seen)
+        if closed - self._trend_seen > len(bars):
+            raise RuntimeError(
+                f"{closed - self._trend_seen - len(bars)} '{tf}' bars were evicted from the "
+                f"resampler before the trend EMA saw them; raise BarResampler maxlen "
+                f"(now {resampler.maxlen})."
+            )
+        for _, bar in bars:
+            self._trend_close = bar['close']
+            self._trend_ema.update(bar['close'])
+            self._trend_bars += 1
+        self._trend_seen = closed
+
+    def _trend_up(self) -> bool:
+        if self._trend_bars < self.slow_window:
+            return False
+        return self._trend_close > self._trend_ema.value
+
+    def _filtered(self, signal: int) -> int:
+        # Sells are not filtered.
+        if signal == 1 and self.trend_timeframe and not self._trend_up():
+            return 0
+        return signal
+
     def generate_signal(self, data: pd.DataFrame) -> int:
         """
         Returns 1 (Buy), -1 (Sell), or 0 (Hold).
         """
-        min_bars = max(self.slow_window, self.rsi_window) + 1
-        if len(data) < min_bars:
+        if self.trend_timeframe:
+            self._advance_trend()
+        if len(data) < self.min_bars:
             return 0
 
         fast_ema = calculate_ema(data['close'], self.fast_window)
@@ -64,11 +146,69 @@ class RuleBasedSignal(SignalBase):
         current_slow = float(slow_ema.iloc[-1])
         current_rsi = float(rsi.iloc[-1])
 
-        # Bullish trend + RSI not overbought
-        if current_fast > current_slow and current_rsi < self.rsi_overbought:
-            return 1
-        # Bearish trend + RSI not oversold
-        elif current_fast < current_slow and current_rsi > self.rsi_oversold:
-            return -1
+        return self._filtered(self._decide(current_fast, current_slow, current_rsi))
 
-        return 0
+    def update(self, bar: Dict[str, float]) -> int:
+        """
+        Streaming counterpart of generate_signal: consumes one bar and
+        returns the signal for the history seen so far.
+        """
+        close = float(bar['close'])
+        current_fast = self._fast.update(close)
+        current_slow = self._slow.update(close)
+        current_rsi = self._rsi.update(close)
+        self._bars_seen += 1
+        if self.trend_timeframe:
+            self._advance_trend()
+
+        if self._bars_seen < self.min_bars:
+            return 0
+        return self._filtered(self._decide(current_fast, current_slow, current_rsi))
+
+    def get_state(self) -> Dict[str, Any]:
+        state = {
+            'bars_seen': self._bars_seen,
+            'fast': self._fast.get_state(),
+            'slow': self._slow.get_state(),
+            'rsi': self._rsi.get_state(),
+        }
+        if self.trend_timeframe:
+            state['trend'] = {
+                'seen': self._trend_seen,
+                'bars': self._trend_bars,
+                'close': self._trend_close,
+                'ema': self._trend_ema.get_state(),
+            }
+        return state
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._bars_seen = int(state['bars_seen'])
+        self._fast.set_state(state['fast'])
+        self._slow.set_state(state['slow'])
+        self._rsi.set_state(state['rsi'])
+        if 'trend' in state:
+            trend = state['trend']
+            self._trend_seen = int(trend['seen'])
+            self._trend_bars = int(trend['bars'])
+            self._trend_close = trend['close']
+            self._trend_ema.set_state(trend['ema'])
+
+    def get_params(self) -> Dict[str, Any]:
+        return {
+            'ema_fast': self.fast_window,
+            'ema_slow': self.slow_window,
+            'rsi_window': self.rsi_window,
+            'rsi_overbought': self.rsi_overbought,
+            'rsi_oversold': self.rsi_oversold,
+            'trend_timeframe': self.trend_timeframe,
+        }
+
+    def reset(self) -> None:
+        self._fast = IncrementalEMA(self.fast_window)
+        self._slow = IncrementalEMA(self.slow_window)
+        self._rsi = IncrementalRSI(self.rsi_window)
+        self._bars_seen = 0
+        self._trend_ema = IncrementalEMA(self.slow_window)
+        self._trend_seen = 0
+        self._trend_bars = 0
+        self._trend_close: Optional[float] = None
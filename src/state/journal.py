@@ -1,5 +1,189 @@
 """
 Trade journal module.
 Records trades, equity, and state to SQLite DB.
+
+Every processed bar is written with the equity the RiskManager saw on it,
+every fill with the broker state right after it, and every few bars a
+compact snapshot of the full loop state. Each order is journaled (and
+committed) as an intent before it is sent, so an order in flight when the
+process dies can be reconciled against the broker on restart. On restart the latest snapshot
+is loaded and only the bars/fills after it are replayed, so recovery cost
+is bounded by the snapshot interval rather than the session length.
 """
-pass
+
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from src.utils.logger import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_history (
+    seq INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL
+);
+CREATE TABLE IF NOT EXISTS equity_history (
+    seq INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    equity REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seq INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    symbol TEXT, side TEXT, qty REAL, price REAL, fee REAL, pnl REAL,
+    state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trades_seq ON trades(seq);
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seq INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    symbol TEXT, side TEXT, qty REAL, price REAL,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    seq INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+
+class TradeJournal:
+    """
+    SQLite-backed journal of bars, equity, fills and state snapshots.
+
+    Writes for one bar are grouped into a single transaction by the caller
+    via commit(), so a crash never leaves a bar journaled without its fills.
+    The dashboard reads price_history/equity_history from the same file.
+
+    Args:
+        db_path: SQLite database file.
+        keep_snapshots: Number of most recent snapshots to retain.
+    """
+    def __init__(self, db_path: str = "journal.db", keep_snapshots: int = 2) -> None:
+        self.db_path = db_path
+        self.keep_snapshots = keep_snapshots
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def record_bar(self, seq: int, timestamp: Any, bar: Dict[str, float], equity: float) -> None:
+        ts = str(timestamp)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO price_history VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (seq, ts, bar['open'], bar['high'], bar['low'], bar['close'], bar['volume']),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO equity_history VALUES (?, ?, ?)", (seq, ts, equity)
+        )
+
+    def record_fill(
+        self, seq: int, timestamp: Any, trade: Dict[str, Any], symbol: str, state: Dict[str, Any]
+    ) -> None:
+        """Records a fill together with the post-fill loop state needed to replay it."""
+        self.conn.execute(
+            "INSERT INTO trades (seq, timestamp, symbol, side, qty, price, fee, pnl, state) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                seq, str(timestamp), symbol, trade['side'], trade['qty'],
+                trade['price'], trade['fee'], trade.get('pnl'), json.dumps(state),
+            ),
+        )
+
+    def record_order(
+        self, seq: int, timestamp: Any, symbol: str, side: str, qty: float, price: float
+    ) -> int:
+        """
+        Journals an order intent and commits at once, so it survives a crash
+        while the order is being submitted. Call only with no other writes
+        pending: they would be committed with it. Returns the order id.
+        """
+        cur = self.conn.execute(
+            "INSERT INTO orders (seq, timestamp, symbol, side, qty, price) VALUES (?, ?, ?, ?, ?, ?)",
+            (seq, str(timestamp), symbol, side, qty, price),
+        )
+        self.conn.commit()
+        return int(cur.lastrowid)
+
+    def resolve_order(self, order_id: int, status: str) -> None:
+        """Marks an order intent as settled; committed with the bar."""
+        self.conn.execute("UPDATE orders SET status = ? WHERE id = ?", (status, order_id))
+
+    def pending_orders(self) -> List[Dict[str, Any]]:
+        """Order intents never resolved (the process died during submission), oldest first."""
+        rows = self.conn.execute(
+            "SELECT id, seq, timestamp, symbol, side, qty, price FROM orders "
+            "WHERE status = 'pending' ORDER BY id"
+        ).fetchall()
+        return [
+            {'id': r[0], 'seq': r[1], 'timestamp': r[2], 'symbol': r[3],
+             'side': r[4], 'qty': r[5], 'price': r[6]}
+            for r in rows
+        ]
+
+    def save_snapshot(self, seq: int, timestamp: Any, state: Dict[str, Any]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+            (seq, str(timestamp), json.dumps(state)),
+        )
+        self.conn.execute(
+            "DELETE FROM snapshots WHERE seq NOT IN "
+            "(SELECT seq FROM snapshots ORDER BY seq DESC LIMIT ?)",
+            (self.keep_snapshots,),
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def latest_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Returns {'seq', 'timestamp', 'state'} of the newest snapshot, or None."""
+        row = self.conn.execute(
+            "SELECT seq, timestamp, state FROM snapshots ORDER BY seq DESC LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        return {'seq': row[0], 'timestamp': row[1], 'state': json.loads(row[2])}
+
+    def bars_since(self, seq: int) -> List[Dict[str, Any]]:
+        """Journaled bars with sequence number > seq, oldest first."""
+        rows = self.conn.execute(
+            "SELECT p.seq, p.timestamp, p.open, p.high, p.low, p.close, p.volume, e.equity "
+            "FROM price_history p JOIN equity_history e ON e.seq = p.seq "
+            "WHERE p.seq > ? ORDER BY p.seq",
+            (seq,),
+        ).fetchall()
+        return [
+            {
+                'seq': r[0], 'timestamp': r[1],
+                'bar': {'open': r[2], 'high': r[3], 'low': r[4], 'close': r[5], 'volume': r[6]},
+                'equity': r[7],
+            }
+            for r in rows
+        ]
+
+    def fills_since(self, seq: int) -> List[Dict[str, Any]]:
+        """Journaled fills on bars with sequence number > seq, in order."""
+        rows = self.conn.execute(
+            "SELECT seq, timestamp, side, qty, price, fee, pnl, state "
+            "FROM trades WHERE seq > ? ORDER BY id",
+            (seq,),
+        ).fetchall()
+        fills = []
+        for r in rows:
+            trade = {'timestamp': r[1], 'side': r[2], 'price': r[4], 'qty': r[3], 'fee': r[5]}
+            if r[6] is not None:
+                trade['pnl'] = r[6]
+            fills.append({'seq': r[0], 'trade': trade, 'state': json.loads(r[7])})
+        return fills
+
+    def close(self) -> None:
+        try:
+            self.conn.commit()
+            self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing journal {self.db_path}: {e}")
@@ -0,0 +1,375 @@
+"""
+Results store module.
+Persists backtest runs for later comparison.
+
+Metrics and parameters go to an indexed SQLite database; equity curves
+and trade logs go to one compressed .npz file per run, referenced by run
+ID. Queries (e.g. top-N Sharpe with max_drawdown < 0.15 and ema_fast in
+a range) only touch the indexed tables, and a run's curve or trades are
+decompressed only when asked for. Every metric column is indexed, so any
+of them can be sorted or filtered on without a full scan. Timestamps are
+stored as UTC with the original timezone alongside, and come back in
+that timezone.
+
+Parameters are flattened to dotted names ('signals.ema_fast') and also
+stored one row per (run, name), clustered on that key. A query walks the
+index of the metric it sorts by and probes each candidate's parameters
+directly, so a top-N query stops as soon as N runs pass, instead of
+parsing JSON or materialising every run in a parameter range.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import logger
+
+METRIC_COLUMNS = [
+    'total_return',
+    'annualized_return',
+    'sharpe_ratio',
+    'max_drawdown',
+    'total_trades',
+    'win_rate',
+    'avg_win',
+    'avg_loss',
+]
+
+_OPERATORS = {'<', '<=', '>', '>=', '=', '!='}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    n_bars INTEGER,
+    total_return REAL,
+    annualized_return REAL,
+    sharpe_ratio REAL,
+    max_drawdown REAL,
+    total_trades INTEGER,
+    win_rate REAL,
+    avg_win REAL,
+    avg_loss REAL,
+    params TEXT NOT NULL,
+    artifact TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_label ON runs(label);
+CREATE TABLE IF NOT EXISTS run_params (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    text TEXT,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+-- Superseded by the per-metric idx_runs_<metric> indexes below.
+DROP INDEX IF EXISTS idx_runs_sharpe;
+DROP INDEX IF EXISTS idx_runs_return;
+DROP INDEX IF EXISTS idx_runs_drawdown;
+""" + ''.join(
+    f"CREATE INDEX IF NOT EXISTS idx_runs_{m} ON runs({m});\n" for m in METRIC_COLUMNS
+)
+
+Condition = Tuple[str, str, Any]
+
+_SIDES = {'buy': 1, 'sell': -1}
+
+
+def flatten_params(params: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Flattens nested dicts to dotted keys: {'signals': {'ema_fast': 12}} -> {'signals.ema_fast': 12}."""
+    flat: Dict[str, Any] = {}
+    for key, value in params.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_params(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _check_condition(cond: Condition) -> None:
+    if len(cond) != 3 or cond[1] not in _OPERATORS:
+        raise ValueError(
+            f"Invalid condition {cond!r}; expected (name, op, value) with op in {sorted(_OPERATORS)}"
+        )
+
+
+class ResultsStore:
+    """
+    Local store of backtest runs.
+
+    Args:
+        root: Directory holding runs.db and the per-run curve files.
+    """
+    def __init__(self, root: str = "results") -> None:
+        self.root = Path(root)
+        self.curves_dir = self.root / 'curves'
+        self.curves_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.root / 'runs.db'))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def save_run(
+        self,
+        params: Dict[str, Any],
+        metrics: Dict[str, Any],
+        equity: Optional[Union[pd.Series, pd.DataFrame]] = None,
+        trades: Optional[Union[pd.DataFrame, List[Dict[str, Any]]]] = None,
+        label: Optional[str] = None,
+        commit: bool = True,
+    ) -> int:
+        """
+        Stores one run and returns its run ID.
+
+        Args:
+            params: Parameters of the run (e.g. the config); nested dicts
+                are flattened to dotted names.
+            metrics: Output of calculate_metrics.
+            equity: Equity curve (Series, or the engine's DataFrame with
+                an 'equity' column) indexed by timestamp.
+            trades: BacktestEngine.trades or a DataFrame of them.
+            label: Free-form tag, e.g. the sweep name.
+            commit: Commit immediately; pass False when saving many runs
+                and call commit() once at the end.
+        """
+        if isinstance(equity, pd.DataFrame):
+            equity = equity['equity']
+        flat = flatten_params(params)
+        cur = self.conn.execute(
+            f"INSERT INTO runs (created_at, label, n_bars, {', '.join(METRIC_COLUMNS)}, params) "
+            f"VALUES (?, ?, ?, {', '.join('?' * len(METRIC_COLUMNS))}, ?)",
+            (
+                datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                label,
+                None if equity is None else len(equity),
+                *(_as_float(metrics.get(m)) for m in METRIC_COLUMNS),
+                json.dumps(params, default=str),
+            ),
+        )
+        run_id = cur.lastrowid
+        self.conn.executemany(
+            "INSERT INTO run_params (run_id, name, value, text) VALUES (?, ?, ?, ?)",
+            [(run_id, name, *_param_value(value)) for name, value in flat.items()],
+        )
+
+        if equity is not None or trades is not None:
+            artifact = f"{run_id}.npz"
+            _write_artifact(self.curves_dir / artifact, equity, trades)
+            self.conn.execute("UPDATE runs SET artifact = ? WHERE run_id = ?", (artifact, run_id))
+
+        if commit:
+            self.conn.commit()
+        return run_id
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def delete_run(self, run_id: int) -> None:
+        row = self.conn.execute("SELECT artifact FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown run_id {run_id}")
+        self.conn.execute("DELETE FROM run_params WHERE run_id = ?", (run_id,))
+        self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        self.conn.commit()
+        if row[0]:
+            (self.curves_dir / row[0]).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        where: Iterable[Condition] = (),
+        params: Iterable[Condition] = (),
+        label: Optional[str] = None,
+        order_by: str = 'sharpe_ratio',
+        descending: bool = True,
+        limit: Optional[int] = 10,
+    ) -> pd.DataFrame:
+        """
+        Finds runs by metrics and parameters without loading any curves.
+
+        Args:
+            where: Metric conditions, e.g. [('max_drawdown', '<', 0.15)].
+            params: Parameter conditions on flattened names, e.g.
+                [('signals.ema_fast', '>=', 8), ('signals.ema_fast', '<=', 16)].
+                String values compare against text parameters.
+            label: Only runs saved with this label.
+            order_by: Metric column to sort by.
+            descending: Sort order.
+            limit: Maximum rows (None for all).
+
+        Returns:
+            DataFrame indexed by run_id with label, n_bars, the metric
+            columns and a 'params' column of dicts.
+        """
+        if order_by not in METRIC_COLUMNS:
+            raise ValueError(f"order_by must be one of {METRIC_COLUMNS}, got '{order_by}'")
+
+        clauses: List[str] = []
+        args: List[Any] = []
+        for cond in where:
+            _check_condition(cond)
+            name, op, value = cond
+            if name not in METRIC_COLUMNS:
+                raise ValueError(f"Unknown metric '{name}'. Options: {METRIC_COLUMNS}")
+            clauses.append(f"{name} {op} ?")
+            args.append(value)
+        # Conditions on the same parameter share one primary-key probe.
+        by_name: Dict[str, List[Condition]] = {}
+        for cond in params:
+            _check_condition(cond)
+            by_name.setdefault(cond[0], []).append(cond)
+        for name, conds in by_name.items():
+            tests = [f"p.{'text' if isinstance(v, str) else 'value'} {op} ?" for _, op, v in conds]
+            clauses.append(
+                "EXISTS (SELECT 1 FROM run_params p WHERE p.run_id = runs.run_id "
+                f"AND p.name = ? AND {' AND '.join(tests)})"
+            )
+            args += [name] + [v for _, _, v in conds]
+        if label is not None:
+            clauses.append("label = ?")
+            args.append(label)
+
+        sql = f"SELECT run_id, label, n_bars, {', '.join(METRIC_COLUMNS)}, params FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        rows = self.conn.execute(sql, args).fetchall()
+        columns = ['run_id', 'label', 'n_bars'] + METRIC_COLUMNS + ['params']
+        df = pd.DataFrame(rows, columns=columns).set_index('run_id')
+        df['params'] = [json.loads(p) for p in df['params']]
+        return df
+
+    def count(self, label: Optional[str] = None) -> int:
+        if label is None:
+            return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM runs WHERE label = ?", (label,)).fetchone()[0]
+
+    def get_params(self, run_id: int) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT params FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown run_id {run_id}")
+        return json.loads(row[0])
+
+    # ------------------------------------------------------------------
+    # Lazy curve/trade loading
+    # ------------------------------------------------------------------
+
+    def _artifact(self, run_id: int) -> Path:
+        row = self.conn.execute("SELECT artifact FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown run_id {run_id}")
+        if row[0] is None:
+            raise FileNotFoundError(f"Run {run_id} was saved without equity/trades")
+        return self.curves_dir / row[0]
+
+    def load_equity(self, run_id: int) -> pd.Series:
+        """Equity curve of one run (only that array is decompressed)."""
+        with np.load(self._artifact(run_id)) as npz:
+            index = _localize(npz['equity_ts'], npz, 'equity_tz').rename('timestamp')
+            return pd.Series(npz['equity'], index=index, name='equity')
+
+    def load_trades(self, run_id: int) -> pd.DataFrame:
+        """Trade log of one run; 'pnl' is NaN on entries."""
+        with np.load(self._artifact(run_id)) as npz:
+            sides = np.where(npz['trade_side'] > 0, 'buy', 'sell')
+            return pd.DataFrame({
+                'timestamp': _localize(npz['trade_ts'], npz, 'trade_tz'),
+                'side': sides,
+                'price': npz['trade_price'],
+                'qty': npz['trade_qty'],
+                'fee': npz['trade_fee'],
+                'pnl': npz['trade_pnl'],
+            })
+
+    def close(self) -> None:
+        try:
+            self.conn.commit()
+            self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing results store {self.root}: {e}")
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _param_value(value: Any) -> Tuple[Optional[float], Optional[str]]:
+    """(numeric value, text value) columns for one parameter."""
+    if isinstance(value, (bool, int, float, np.integer, np.floating)):
+        return float(value), None
+    if value is None:
+        return None, None
+    return None, value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def _timestamps_ns(values: Iterable[Any]) -> Tuple[np.ndarray, str]:
+    """
+    Timestamps as int64 ns plus their timezone name ('' if naive);
+    tz-aware values are stored as naive UTC.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(values))
+    if index.tz is None:
+        return index.asi8, ''
+    return index.tz_convert('UTC').tz_localize(None).asi8, str(index.tz)
+
+
+def _localize(ts_ns: np.ndarray, npz: Any, tz_key: str) -> pd.DatetimeIndex:
+    """Inverse of _timestamps_ns; artifacts written before tz was stored load naive."""
+    index = pd.DatetimeIndex(ts_ns)
+    tz = str(npz[tz_key]) if tz_key in npz.files else ''
+    return index.tz_localize('UTC').tz_convert(tz) if tz else index
+
+
+def _write_artifact(
+    path: Path,
+    equity: Optional[pd.Series],
+    trades: Optional[Union[pd.DataFrame, List[Dict[str, Any]]]],
+) -> None:
+    """Writes the run's arrays atomically (temp file + rename)."""
+    if equity is None:
+        equity = pd.Series([], index=pd.DatetimeIndex([]), dtype=float)
+    trades_df = pd.DataFrame(trades if trades is not None else [])
+    if trades_df.empty:
+        trades_df = pd.DataFrame(columns=['timestamp', 'side', 'price', 'qty', 'fee', 'pnl'])
+    if 'pnl' not in trades_df.columns:
+        trades_df['pnl'] = np.nan
+
+    equity_ts, equity_tz = _timestamps_ns(equity.index)
+    trade_ts, trade_tz = _timestamps_ns(trades_df['timestamp'])
+    arrays = {
+        'equity_ts': equity_ts,
+        'equity_tz': np.array(equity_tz),
+        'equity': equity.to_numpy(dtype=float),
+        'trade_ts': trade_ts,
+        'trade_tz': np.array(trade_tz),
+        'trade_side': trades_df['side'].map(_SIDES).to_numpy(dtype=np.int8),
+        'trade_price': trades_df['price'].to_numpy(dtype=float),
+        'trade_qty': trades_df['qty'].to_numpy(dtype=float),
+        'trade_fee': trades_df['fee'].to_numpy(dtype=float),
+        'trade_pnl': trades_df['pnl'].to_numpy(dtype=float),
+    }
+    tmp = path.with_suffix('.tmp.npz')
+    np.savez_compressed(tmp, **arrays)
+    os.replace(tmp, path)
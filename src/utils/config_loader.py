@@ -2,11 +2,19 @@
 Configuration loader module.
 Validates required keys from settings.yaml.
 Fail-fast: missing any required key raises immediately on startup.
+Validated configs are cached per file and reused until its mtime changes.
 """
 
+import copy
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+# libyaml-backed loader when available; several times faster to parse.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Resolved path -> ((mtime_ns, size), validated config)
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
 REQUIRED_KEYS = [
     "environment",
@@ -42,6 +50,9 @@ def load_config(config_path: str = "config/settings.yaml") -> Dict[str, Any]:
     """
     Loads and validates the configuration from a YAML file.
 
+    The validated result is cached keyed on the file's mtime and size;
+    callers always receive their own deep copy, so mutating it is safe.
+
     Args:
         config_path: Path to the configuration file.
 
@@ -53,12 +64,27 @@ def load_config(config_path: str = "config/settings.yaml") -> Dict[str, Any]:
         KeyError: If a required key is missing.
     """
     path = Path(config_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+
+    cache_key = str(path.resolve())
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return copy.deepcopy(cached[1])
 
     with open(path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YAML_LOADER)
 
+    _validate(config)
+    _CONFIG_CACHE[cache_key] = (stamp, config)
+    return copy.deepcopy(config)
+
+
+def _validate(config: Dict[str, Any]) -> None:
+    """Raises KeyError if any required key or block is missing."""
     # --- Top-level keys ---
     missing_top = [k for k in REQUIRED_KEYS if k not in config]
     if missing_top:
@@ -81,5 +107,3 @@ def load_config(config_path: str = "config/settings.yaml") -> Dict[str, Any]:
         raise KeyError(
             f"Missing required config keys in 'signals' block: {missing_sig}"
         )
-
-    return config
@@ -0,0 +1,206 @@
+"""
+Stage profiling module.
+Opt-in, low-overhead timers and counters for named pipeline stages.
+
+Timings use the monotonic perf_counter_ns clock. When a profiler is
+disabled, stage() hands back a shared no-op context manager so the hot
+loop pays only for one attribute lookup and a method call per stage.
+"""
+
+import cProfile
+import json
+import random
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class _NullStage:
+    """No-op context manager returned by a disabled profiler."""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageTimer:
+    """
+    Re-usable timer for a single named stage.
+
+    Keeps count/total/max exactly and a bounded sample of durations
+    (reservoir sampling beyond max_samples) for percentile estimates.
+    """
+    __slots__ = ('name', 'count', 'total_ns', 'max_ns', 'samples', '_max_samples', '_rng', '_t0')
+
+    def __init__(self, name: str, max_samples: int, rng: random.Random) -> None:
+        self.name = name
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.samples = array('q')
+        self._max_samples = max_samples
+        self._rng = rng
+        self._t0 = 0
+
+    def __enter__(self) -> None:
+        self._t0 = time.perf_counter_ns()
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter_ns() - self._t0
+        self.count += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        if len(self.samples) < self._max_samples:
+            self.samples.append(elapsed)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < self._max_samples:
+                self.samples[j] = elapsed
+
+    def percentile(self, q: float) -> float:
+        """Returns the q-th percentile (0-100) of sampled durations in ns."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+        return float(ordered[idx])
+
+
+class StageProfiler:
+    """
+    Collects per-stage wall-clock timings and named counters.
+
+    Usage:
+        profiler = StageProfiler()
+        with profiler.session():
+            for bar in bars:
+                with profiler.stage('generate_signal'):
+                    ...
+                profiler.incr('bars')
+        print(profiler.format_table())
+
+    Args:
+        enabled: When False every call is a no-op.
+        cprofile_path: If set, session() also runs cProfile and dumps a
+            pstats file to this path when the session ends.
+        max_samples: Per-stage cap on retained samples for p99 estimates.
+    """
+    def __init__(
+        self,
+        enabled: bool = True,
+        cprofile_path: Optional[str] = None,
+        max_samples: int = 100_000,
+    ) -> None:
+        self.enabled = enabled
+        self.cprofile_path = cprofile_path
+        self.max_samples = max_samples
+        self._stages: Dict[str, _StageTimer] = {}
+        self.counters: Dict[str, int] = {}
+        self.wall_ns: int = 0
+        self._rng = random.Random(0)
+
+    def stage(self, name: str) -> Any:
+        """Returns a context manager timing one execution of the named stage."""
+        if not self.enabled:
+            return _NULL_STAGE
+        timer = self._stages.get(name)
+        if timer is None:
+            timer = _StageTimer(name, self.max_samples, self._rng)
+            self._stages[name] = timer
+        return timer
+
+    def incr(self, name: str, n: int = 1) -> None:
+        """Increments a named counter."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """
+        Scopes a profiled run: accumulates wall time for throughput figures
+        and, if configured, wraps the run in cProfile.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        prof = cProfile.Profile() if self.cprofile_path else None
+        t0 = time.perf_counter_ns()
+        if prof is not None:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof is not None:
+                prof.disable()
+            self.wall_ns += time.perf_counter_ns() - t0
+            if prof is not None:
+                prof.dump_stats(self.cprofile_path)
+
+    def reset(self) -> None:
+        """Clears all collected timings and counters."""
+        self._stages.clear()
+        self.counters.clear()
+        self.wall_ns = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns collected statistics.
+
+        Stage times are reported in milliseconds (total) and microseconds
+        (mean, p99, max). 'bars_per_sec' is derived from the 'bars'
+        counter and session wall time when both are available.
+        """
+        stages: Dict[str, Dict[str, float]] = {}
+        for name, t in self._stages.items():
+            stages[name] = {
+                'count': t.count,
+                'total_ms': t.total_ns / 1e6,
+                'mean_us': (t.total_ns / t.count / 1e3) if t.count else 0.0,
+                'p99_us': t.percentile(99) / 1e3,
+                'max_us': t.max_ns / 1e3,
+            }
+
+        wall_s = self.wall_ns / 1e9
+        bars = self.counters.get('bars', 0)
+        return {
+            'wall_s': wall_s,
+            'bars_per_sec': (bars / wall_s) if wall_s > 0 and bars else 0.0,
+            'counters': dict(self.counters),
+            'stages': stages,
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Serialises summary() to JSON, optionally writing it to path."""
+        payload = json.dumps(self.summary(), indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+        return payload
+
+    def format_table(self) -> str:
+        """Renders summary() as a fixed-width text table."""
+        s = self.summary()
+        header = f"{'stage':<20}{'count':>10}{'total_ms':>12}{'mean_us':>12}{'p99_us':>12}{'max_us':>12}"
+        lines = [header, '-' * len(header)]
+        ordered = sorted(s['stages'].items(), key=lambda kv: kv[1]['total_ms'], reverse=True)
+        for name, st in ordered:
+            lines.append(
+                f"{name:<20}{st['count']:>10}{st['total_ms']:>12.2f}"
+                f"{st['mean_us']:>12.2f}{st['p99_us']:>12.2f}{st['max_us']:>12.2f}"
+            )
+        lines.append('-' * len(header))
+        lines.append(f"wall: {s['wall_s']:.3f}s  bars/sec: {s['bars_per_sec']:.1f}")
+        return '\n'.join(lines)
+
+
+# Shared disabled instance used as the default by instrumented components.
+NULL_PROFILER = StageProfiler(enabled=False)
@@ -0,0 +1,28 @@
+"""
+Pytest configuration.
+Puts the repository root on sys.path so tests can import src and
+benchmarks, as the scripts do.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils.config_loader import load_config  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+CONFIG_PATH = str(ROOT / 'config' / 'settings.yaml')
+
+logger.setLevel(logging.ERROR)
+
+
+@pytest.fixture
+def config():
+    """Fresh copy of config/settings.yaml."""
+    return load_config(CONFIG_PATH)
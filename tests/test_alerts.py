@@ -0,0 +1,91 @@
+"""
+Alert dispatcher tests.
+notify() must never wait on a slow sink, bursts of fills must coalesce,
+and a slow sink must not hold up delivery to the others.
+"""
+
+import threading
+import time
+from typing import List
+
+from src.notifications.voice_alerts import Alert, AlertDispatcher, AlertSink
+
+SLOW_EMIT = 0.5
+
+
+class RecordingSink(AlertSink):
+    """Records alerts; each emit() blocks for `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.received: List[Alert] = []
+        self.first_emit = threading.Event()
+        self.closed = False
+
+    def emit(self, alert: Alert) -> None:
+        assert not self.closed, "emit() after close()"
+        self.first_emit.set()
+        time.sleep(self.delay)
+        self.received.append(alert)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_notify_does_not_block_on_slow_sink():
+    slow = RecordingSink(delay=SLOW_EMIT)
+    dispatcher = AlertDispatcher([slow], coalesce_window=0.0).start()
+    dispatcher.notify('halt', 'prime', level='critical')
+    assert slow.first_emit.wait(1.0)
+
+    worst = 0.0
+    for i in range(1000):
+        t0 = time.perf_counter()
+        assert dispatcher.notify('fill', f'BUY 0.01 BTC/USDT #{i}')
+        worst = max(worst, time.perf_counter() - t0)
+    # The sink is blocked for SLOW_EMIT seconds; notify() must not be.
+    assert worst < SLOW_EMIT / 10
+    dispatcher.stop()
+    assert slow.closed
+
+
+def test_burst_of_fills_coalesces_into_one_alert():
+    sink = RecordingSink()
+    dispatcher = AlertDispatcher([sink], coalesce_window=0.5).start()
+    for i in range(50):
+        dispatcher.notify('fill', f'SELL 0.01 BTC/USDT #{i}')
+    dispatcher.stop()
+
+    assert len(sink.received) == 1
+    alert = sink.received[0]
+    assert alert.kind == 'fill' and alert.count == 50
+    assert alert.message.endswith('#49')
+
+
+def test_slow_sink_does_not_delay_other_sinks():
+    slow, fast = RecordingSink(delay=SLOW_EMIT), RecordingSink()
+    dispatcher = AlertDispatcher([slow, fast], coalesce_window=0.0).start()
+    t0 = time.monotonic()
+    dispatcher.notify('halt', 'first', level='critical')
+    dispatcher.notify('drawdown', 'second', level='critical')
+    while len(fast.received) < 2 and time.monotonic() - t0 < 2.0:
+        time.sleep(0.005)
+    assert [a.message for a in fast.received] == ['first', 'second']
+    assert time.monotonic() - t0 < SLOW_EMIT
+    assert len(slow.received) < 2
+
+    dispatcher.stop()
+    assert [a.message for a in slow.received] == ['first', 'second']
+
+
+def test_stop_leaves_sink_open_while_it_is_still_emitting():
+    slow, fast = RecordingSink(delay=SLOW_EMIT), RecordingSink()
+    dispatcher = AlertDispatcher([slow, fast], coalesce_window=0.0).start()
+    dispatcher.notify('halt', 'stuck', level='critical')
+    assert slow.first_emit.wait(1.0)
+
+    dispatcher.stop(timeout=0.05)
+    assert fast.closed and not slow.closed
+
+    dispatcher.stop(timeout=2.0)
+    assert slow.closed and len(slow.received) == 1
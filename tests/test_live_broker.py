@@ -0,0 +1,41 @@
+"""
+LiveBroker tests.
+Checks that the fill-updated balance/position cache tracks the exchange
+whichever asset commission is charged in.
+"""
+
+import pytest
+
+from benchmarks.mock_exchange import MockExchange
+from src.execution.live_broker import LiveBroker
+
+
+@pytest.mark.parametrize('commission_asset', [None, 'BTC', 'BNB'])
+def test_fill_cache_matches_exchange(commission_asset):
+    exchange = MockExchange(
+        balances={'USDT': 100_000.0, 'BTC': 0.0, 'BNB': 10.0},
+        price=30_000.0,
+        commission_asset=commission_asset,
+        commission_price=300.0,
+    ).start()
+    broker = LiveBroker(
+        exchange.base_url, exchange.api_key, 'mock-secret', ['BTC/USDT'],
+        refresh_interval=3600.0,
+    )
+    try:
+        assert broker.refresh()
+        buy = broker.submit_order('BTC/USDT', 1.0, 'buy')
+        exchange.set_price(31_000.0)
+        held = broker.get_state()['positions']['BTC/USDT']
+        sell = broker.submit_order('BTC/USDT', held / 2, 'sell')
+        assert buy['status'] == sell['status'] == 'filled'
+        assert set(buy['fees']) == {commission_asset or 'USDT'}
+
+        # get_state reads the cache without triggering a refresh.
+        cached = broker.get_state()
+        assert cached['capital'] == pytest.approx(exchange.balances['USDT'], rel=1e-12)
+        assert cached['positions']['BTC/USDT'] == pytest.approx(exchange.balances['BTC'], rel=1e-12)
+        assert broker.stats['refreshes'] == 1
+    finally:
+        broker.close()
+        exchange.stop()
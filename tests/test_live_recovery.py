@@ -0,0 +1,200 @@
+"""
+Live recovery tests.
+A replay-driven live session that is killed and restarted must end with
+the same journal and state as a session that ran uninterrupted.
+"""
+
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import generate_ohlcv
+from src.core.live_loop import LiveLoop
+from src.data.feed import ReplayFeed, load_ohlcv_csv
+from src.execution.paper_broker import PaperBroker
+from src.risk.risk_manager import RiskManager
+from src.signals.rule_based import RuleBasedSignal
+from src.state.journal import TradeJournal
+from tests.conftest import CONFIG_PATH, ROOT
+
+N_BARS = 800
+SNAPSHOT_EVERY = 50
+
+
+def make_loop(config: Dict[str, Any], journal: TradeJournal) -> LiveLoop:
+    return LiveLoop(
+        broker=PaperBroker(config['initial_capital'], config['trading_fee']),
+        risk_manager=RiskManager(config),
+        signal_generator=RuleBasedSignal(config),
+        symbol=f"{config['base_asset']}/{config['quote_asset']}",
+        trading_fee=config['trading_fee'],
+        journal=journal,
+        snapshot_every=SNAPSHOT_EVERY,
+    )
+
+
+def journal_contents(db_path: str) -> Dict[str, List[tuple]]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            'bars': conn.execute("SELECT * FROM price_history ORDER BY seq").fetchall(),
+            'equity': conn.execute("SELECT * FROM equity_history ORDER BY seq").fetchall(),
+            'trades': conn.execute(
+                "SELECT seq, timestamp, side, qty, price, fee, pnl, state FROM trades ORDER BY id"
+            ).fetchall(),
+        }
+    finally:
+        conn.close()
+
+
+def max_seq(db_path: str) -> int:
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute("SELECT MAX(seq) FROM price_history").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+    return int(row[0] or 0)
+
+
+def restored_state(config: Dict[str, Any], db_path: str) -> Dict[str, Any]:
+    journal = TradeJournal(db_path)
+    try:
+        loop = make_loop(config, journal)
+        loop.restore()
+        return loop.get_state()
+    finally:
+        journal.close()
+
+
+def reference_run(config: Dict[str, Any], data, db_path: str) -> Dict[str, Any]:
+    journal = TradeJournal(db_path)
+    try:
+        loop = make_loop(config, journal)
+        loop.run(ReplayFeed(data))
+        return loop.get_state()
+    finally:
+        journal.close()
+
+
+def test_kill_and_restart_matches_uninterrupted_run(config, tmp_path: Path):
+    csv_path = tmp_path / 'replay.csv'
+    generate_ohlcv(N_BARS, freq='1h', seed=7).to_csv(csv_path)
+    # The restarted sessions replay the CSV, so the reference does too.
+    data = load_ohlcv_csv(str(csv_path))
+    ref_db = str(tmp_path / 'reference.db')
+    reference = reference_run(config, data, ref_db)
+    assert journal_contents(ref_db)['trades'], "scenario should trade"
+
+    db = str(tmp_path / 'killed.db')
+    cmd = [
+        sys.executable, str(ROOT / 'scripts' / 'run_live.py'),
+        '--config', CONFIG_PATH, '--replay', str(csv_path), '--journal', db,
+        '--snapshot-every', str(SNAPSHOT_EVERY), '--no-alerts',
+    ]
+    proc = subprocess.Popen(
+        cmd + ['--replay-interval', '0.005'],
+        cwd=tmp_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while max_seq(db) < N_BARS // 2 and proc.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    killed_at = max_seq(db)
+    assert 0 < killed_at < N_BARS, f"session was not killed mid-run (at bar {killed_at})"
+
+    subprocess.run(cmd, cwd=tmp_path, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    assert journal_contents(db) == journal_contents(ref_db)
+    assert restored_state(config, db) == reference
+
+
+def test_restore_at_every_point_matches_uninterrupted_run(config, tmp_path: Path):
+    data = generate_ohlcv(300, freq='1h', seed=7)
+    ref_db = str(tmp_path / 'reference.db')
+    reference = reference_run(config, data, ref_db)
+
+    # Stop at bars before, on and after snapshots, restore and finish.
+    for stop in (1, SNAPSHOT_EVERY - 1, SNAPSHOT_EVERY, 2 * SNAPSHOT_EVERY + 7, 299):
+        db = str(tmp_path / f'stopped_{stop}.db')
+        journal = TradeJournal(db)
+        make_loop(config, journal).run(ReplayFeed(data), max_bars=stop)
+        journal.close()
+
+        journal = TradeJournal(db)
+        loop = make_loop(config, journal)
+        info = loop.restore()
+        assert info['replayed_bars'] == stop % SNAPSHOT_EVERY
+        loop.run(ReplayFeed(data))
+        journal.close()
+
+        assert journal_contents(db) == journal_contents(ref_db), f"stopped at bar {stop}"
+        assert loop.get_state() == reference, f"stopped at bar {stop}"
+
+
+class _Crash(Exception):
+    pass
+
+
+class ExchangeBroker(PaperBroker):
+    """
+    Paper broker standing in for an exchange: it keeps its own state across
+    a restart (set_state is ignored) and can die right after a fill, before
+    the loop journals it.
+    """
+    crash_on_fill = True
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        pass
+
+    def submit_order(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        res = super().submit_order(*args, **kwargs)
+        if self.crash_on_fill and res.get('status') == 'filled':
+            self.crash_on_fill = False
+            raise _Crash()
+        return res
+
+
+def test_order_in_flight_at_crash_is_reconciled(config, tmp_path: Path):
+    data = generate_ohlcv(N_BARS, freq='1h', seed=7)
+    exchange = ExchangeBroker(config['initial_capital'], config['trading_fee'])
+    symbol = f"{config['base_asset']}/{config['quote_asset']}"
+    db = str(tmp_path / 'crashed.db')
+
+    def loop_for(journal: TradeJournal) -> LiveLoop:
+        loop = make_loop(config, journal)
+        loop.broker = exchange
+        return loop
+
+    journal = TradeJournal(db)
+    try:
+        loop_for(journal).run(ReplayFeed(data))
+    except _Crash:
+        pass
+    # Die without committing the bar the order was sent on.
+    journal.conn.close()
+    held = exchange.get_positions()[symbol]
+    assert held > 0, "scenario should buy"
+
+    journal = TradeJournal(db)
+    loop = loop_for(journal)
+    info = loop.restore()
+    assert info['reconciled_orders'] == 1
+    assert journal.pending_orders() == []
+    assert loop._entry_qty == held and loop._entry_price is not None
+    assert [t['side'] for t in loop.trades] == ['buy']
+
+    # The replayed bar must not buy again, and the position can be sold.
+    loop.run(ReplayFeed(data))
+    journal.close()
+    sides = [t['side'] for t in loop.trades]
+    assert sides[:2] == ['buy', 'sell']
+    assert sides.count('buy') - sides.count('sell') == (1 if exchange.get_positions()[symbol] else 0)
@@ -0,0 +1,42 @@
+"""
+Results store tests.
+Checks that every metric can be sorted on through an index and that
+timestamps keep their timezone through save and load.
+"""
+
+import pandas as pd
+import pytest
+
+from src.state.results_store import METRIC_COLUMNS, ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ResultsStore(str(tmp_path / 'results'))
+    yield s
+    s.close()
+
+
+@pytest.mark.parametrize('metric', METRIC_COLUMNS)
+def test_every_metric_sort_uses_an_index(store, metric):
+    plan = store.conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT run_id FROM runs ORDER BY {metric} DESC LIMIT 10"
+    ).fetchall()
+    assert any(f'idx_runs_{metric}' in row[-1] for row in plan), plan
+
+
+@pytest.mark.parametrize('tz', [None, 'UTC', 'America/New_York'])
+def test_timestamps_round_trip_with_timezone(store, tz):
+    index = pd.date_range('2021-03-13', periods=48, freq='1h', tz=tz, name='timestamp')
+    equity = pd.Series(range(48), index=index, dtype=float, name='equity')
+    trades = [
+        {'timestamp': index[3], 'side': 'buy', 'price': 100.0, 'qty': 1.0, 'fee': 0.1},
+        {'timestamp': index[30], 'side': 'sell', 'price': 110.0, 'qty': 1.0, 'fee': 0.11, 'pnl': 9.79},
+    ]
+    run_id = store.save_run({'signals': {'ema_fast': 12}}, {'sharpe_ratio': 1.0},
+                            equity=equity, trades=trades)
+
+    pd.testing.assert_series_equal(store.load_equity(run_id), equity, check_freq=False)
+    loaded = store.load_trades(run_id)
+    assert list(loaded['timestamp']) == [index[3], index[30]]
+    assert str(loaded['timestamp'].dt.tz) == str(index.tz)
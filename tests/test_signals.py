@@ -0,0 +1,74 @@
+"""
+Signal tests.
+Checks that the sliced (generate_signal) and streaming (update) paths of
+RuleBasedSignal agree, including the higher-timeframe trend filter once
+the resampler has evicted old bars.
+"""
+
+import copy
+import subprocess
+import sys
+
+import pandas as pd
+
+from benchmarks.run_benchmarks import BENCH_CONFIG
+from benchmarks.synthetic import generate_ohlcv
+from src.backtest.engine import BacktestEngine
+from src.data.resampler import BarResampler
+from src.execution.paper_broker import PaperBroker
+from src.risk.risk_manager import RiskManager
+from src.signals.rule_based import RuleBasedSignal
+from tests.conftest import ROOT
+
+TREND_CONFIG = copy.deepcopy(BENCH_CONFIG)
+TREND_CONFIG['signals']['trend_timeframe'] = '5m'
+TREND_CONFIG['max_drawdown'] = 1.0
+TREND_CONFIG['max_daily_loss'] = 1.0
+
+
+def run_engine(data: pd.DataFrame, streaming: bool, maxlen: int):
+    signal = RuleBasedSignal(TREND_CONFIG)
+    engine = BacktestEngine(
+        data=data,
+        broker=PaperBroker(10_000.0, 0.001),
+        risk_manager=RiskManager(TREND_CONFIG),
+        signal_generator=signal,
+        resampler=BarResampler('1m', maxlen=maxlen),
+        streaming=streaming,
+    )
+    return engine.run(), engine.trades
+
+
+def test_sliced_and_streaming_agree_after_eviction():
+    data = generate_ohlcv(3_000)
+    # 600 closed 5m bars against 26 retained: most are evicted.
+    sliced_equity, sliced_trades = run_engine(data, streaming=False, maxlen=26)
+    streaming_equity, streaming_trades = run_engine(data, streaming=True, maxlen=26)
+
+    assert sliced_trades
+    assert sliced_trades == streaming_trades
+    pd.testing.assert_frame_equal(sliced_equity, streaming_equity)
+
+
+def test_trend_filter_changes_trades():
+    data = generate_ohlcv(3_000)
+    _, filtered = run_engine(data, streaming=True, maxlen=26)
+    unfiltered_config = copy.deepcopy(TREND_CONFIG)
+    del unfiltered_config['signals']['trend_timeframe']
+    engine = BacktestEngine(
+        data=data,
+        broker=PaperBroker(10_000.0, 0.001),
+        risk_manager=RiskManager(unfiltered_config),
+        signal_generator=RuleBasedSignal(unfiltered_config),
+        streaming=True,
+    )
+    engine.run()
+    assert filtered != engine.trades
+
+
+def test_signals_do_not_import_data_layer():
+    code = (
+        "import sys; import src.signals.rule_based; "
+        "sys.exit('src.data.resampler' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, '-c', code], cwd=ROOT).returncode == 0
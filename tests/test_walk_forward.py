@@ -0,0 +1,118 @@
+"""
+Walk-forward tests.
+Covers window boundaries, the carry of broker and RiskManager state
+across chained out-of-sample segments, and what the chained run stores.
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from src.backtest.engine import BacktestEngine
+from src.backtest.walk_forward import make_windows, walk_forward
+from src.execution.paper_broker import PaperBroker
+from src.risk.risk_manager import RiskManager
+from src.signals.rule_based import RuleBasedSignal
+from src.state.results_store import ResultsStore
+
+
+def test_make_windows_boundaries():
+    index = pd.date_range('2020-01-01', '2020-05-20 23:00', freq='1h')
+    windows = make_windows(index, train_period='30D', test_freq='MS')
+
+    assert [w.oos_begin for w in windows] == list(pd.date_range('2020-02-01', '2020-05-01', freq='MS'))
+    assert [w.index for w in windows] == list(range(len(windows)))
+    for w in windows:
+        assert index[w.is_start] == w.oos_begin - pd.Timedelta('30D')
+        assert w.is_stop == w.oos_start
+        assert index[w.oos_start] == w.oos_begin
+        assert index[w.oos_stop - 1] == w.oos_end
+    # Out-of-sample periods tile the rest of the data without gaps.
+    for prev, nxt in zip(windows, windows[1:]):
+        assert prev.oos_stop == nxt.oos_start
+    assert windows[-1].oos_stop == len(index)
+
+
+def test_make_windows_skips_empty_periods_and_rejects_short_data():
+    index = pd.date_range('2020-01-01', '2020-02-29 23:00', freq='1h')
+    # No bars at all during March; April data resumes.
+    index = index.append(pd.date_range('2020-04-01', '2020-04-10', freq='1h'))
+    windows = make_windows(index, train_period='30D', test_freq='MS')
+    assert [w.oos_begin for w in windows] == [pd.Timestamp('2020-02-01'), pd.Timestamp('2020-04-01')]
+    assert windows[0].oos_stop == windows[1].oos_start
+
+    with pytest.raises(ValueError):
+        make_windows(index[:24 * 10], train_period='30D')
+    with pytest.raises(ValueError):
+        make_windows(pd.DatetimeIndex([]))
+
+
+# seed 2 holds positions across window boundaries; seed 1 reaches the
+# drawdown limit, so the halt has to carry into later segments.
+@pytest.mark.parametrize('seed', [1, 2])
+def test_chained_segments_carry_broker_and_risk_state(config, seed):
+    data = generate_ohlcv(24 * 150, seed=seed, freq='1h')
+    ema_fast = config['signals']['ema_fast']
+    result = walk_forward(
+        data, config, {'signals.ema_fast': [ema_fast]},
+        train_period='30D', test_freq='MS', max_workers=1,
+    )
+    assert len(result.windows) >= 3
+
+    # The only candidate is the base config, so the chained segments must
+    # trade exactly like one uninterrupted engine over the same span, as
+    # long as capital, positions and RiskManager state carry over.
+    first, last = result.windows[0].window, result.windows[-1].window
+    risk_manager = RiskManager(config)
+    engine = BacktestEngine(
+        data=data.iloc[first.is_start:last.oos_stop],
+        broker=PaperBroker(config['initial_capital'], config['trading_fee']),
+        risk_manager=risk_manager,
+        signal_generator=RuleBasedSignal(config),
+        trading_fee=config['trading_fee'],
+        streaming=True,
+        warmup_bars=first.oos_start - first.is_start,
+    )
+    equity = engine.run()
+
+    assert result.equity.index.equals(equity.index)
+    pd.testing.assert_series_equal(result.equity['equity'], equity['equity'], rtol=1e-9)
+    assert [(t['timestamp'], t['side']) for t in result.trades] == \
+        [(t['timestamp'], t['side']) for t in engine.trades]
+
+    boundaries = [w.window.oos_begin for w in result.windows[1:]]
+    entries = [t['timestamp'] for t in result.trades if t['side'] == 'buy']
+    exits = [t['timestamp'] for t in result.trades if t['side'] == 'sell']
+    held_across = any(
+        entry < boundary <= exit_
+        for entry, exit_ in zip(entries, exits) for boundary in boundaries
+    )
+    if seed == 1:
+        assert risk_manager.halted
+    else:
+        assert held_across
+
+
+def test_chained_run_stores_per_window_params(config, tmp_path):
+    data = generate_ohlcv(24 * 120, freq='1h')
+    store = ResultsStore(str(tmp_path / 'results'))
+    try:
+        result = walk_forward(
+            data, config, {'signals.ema_fast': [8, 12]},
+            train_period='30D', test_freq='MS', max_workers=1, store=store, label='wf',
+        )
+        chained = store.query(label='wf', limit=None)
+        assert len(chained) == 1
+        params = chained['params'].iloc[0]
+        assert 'ema_fast' not in params['signals']
+        assert params['walk_forward']['windows'] == [
+            {
+                'oos_begin': str(w.window.oos_begin),
+                'oos_end': str(w.window.oos_end),
+                'params': w.params,
+            }
+            for w in result.windows
+        ]
+        assert store.query(params=[('signals.ema_fast', '=', 12)], label='wf').empty
+    finally:
+        store.close()